@@ -12,16 +12,22 @@ import yaml
 import signal
 import sys
 import os
+import time
 from datetime import datetime
 from loguru import logger
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 # Импорты модулей бота
-from bot.data_fetcher import DataManager
+from bot.data_fetcher import DataManager, timeframe_to_timedelta, utc_now
 from bot.indicators import TechnicalIndicators
-from bot.strategy import TradingStrategy, SignalType
+from bot.strategy import TradingStrategy, TradingSignal, SignalType, SignalRecord
 from bot.trading_engine import TradingEngine
 from bot.notifications import NotificationManager
+from bot.scheduler import CandleScheduler
+from bot.latency import LatencyTracker, LoopLagMonitor
+from bot.executors import StageExecutors
+from bot.metrics import REGISTRY, TRADING_SIGNALS
+from bot.status import STATUS_BOARD
 
 
 class AutonomousTradingBot:
@@ -34,11 +40,34 @@ class AutonomousTradingBot:
         Args:
             config_path: Путь к файлу конфигурации
         """
+        # Хронология запуска: (этап, секунды от старта)
+        self._started_at = time.monotonic()
+        self.startup_timeline: List[Tuple[str, float]] = []
+        self._startup_checks_task: Optional[asyncio.Task] = None
+        
         self.config_path = config_path
         self.config = self._load_config()
         self.running = False
         self.last_update = None
         
+        # Последний результат анализа рынка (для /status; запись строится при публикации)
+        self.last_signal: Optional[TradingSignal] = None
+        
+        # Время последней обработанной закрытой свечи по (биржа, символ, таймфрейм)
+        self.last_processed_candles: Dict[tuple, Any] = {}
+        
+        # Планировщик по закрытию свечей и задержка обработки последней свечи по таймфреймам, мс
+        self.scheduler: Optional[CandleScheduler] = None
+        self.signal_latency_ms: Dict[str, float] = {}
+        
+        # Длительность этапов цикла (скользящие гистограммы)
+        monitoring_config = self.config.get('monitoring', {})
+        self.latency = LatencyTracker(monitoring_config.get('latency_window', 1000))
+        self.loop_lag = LoopLagMonitor(self.latency, monitoring_config.get('loop_lag_interval', 0.05))
+        
+        # Пулы для блокирующих этапов цикла (создаются в initialize)
+        self.executors: Optional[StageExecutors] = None
+        
         # Инициализация компонентов
         self.data_manager = None
         self.indicators = None
@@ -53,6 +82,18 @@ class AutonomousTradingBot:
         self._setup_signal_handlers()
         
         logger.info("Автономный торговый бот инициализирован")
+        self._mark_startup("конфигурация")
+    
+    def _mark_startup(self, stage: str):
+        """Отметка этапа запуска"""
+        elapsed = time.monotonic() - self._started_at
+        self.startup_timeline.append((stage, elapsed))
+        logger.debug(f"Запуск: {stage} +{elapsed:.2f} с")
+    
+    def _log_startup_timeline(self):
+        """Вывод хронологии запуска"""
+        timeline = ", ".join(f"{stage} +{elapsed:.2f} с" for stage, elapsed in self.startup_timeline)
+        logger.info(f"Хронология запуска: {timeline}")
     
     def _load_config(self) -> Dict[str, Any]:
         """Загрузка конфигурации из YAML файла с поддержкой переменных окружения"""
@@ -156,9 +197,15 @@ class AutonomousTradingBot:
         try:
             logger.info("Инициализация компонентов бота...")
             
+            # Пулы исполнения блокирующих этапов и контроль задержки цикла событий
+            self.executors = StageExecutors(self.config)
+            self.executors.warm_up()
+            self.loop_lag.start()
+            
             # Инициализация менеджера данных
             self.data_manager = DataManager(self.config)
             logger.info("Менеджер данных инициализирован")
+            self._mark_startup("менеджер данных")
             
             # Инициализация калькулятора индикаторов
             self.indicators = TechnicalIndicators(self.config)
@@ -167,28 +214,103 @@ class AutonomousTradingBot:
             # Инициализация стратегии
             self.strategy = TradingStrategy(self.config, self.indicators)
             logger.info("Стратегия инициализирована")
+            self._mark_startup("стратегия")
             
             # Инициализация торгового движка
             self.trading_engine = TradingEngine(self.config, self.data_manager.fetchers[self.data_manager.default_exchange])
             logger.info("Торговый движок инициализирован")
             
+            # История и статистика сигналов - по сигналам, сохраненным движком
+            history = self.strategy.signal_history
+            history.restore(self.trading_engine.get_signals(history.maxlen))
+            self.strategy.restore_signal_stats(self.trading_engine.iter_signal_stats())
+            self._mark_startup("торговый движок")
+            
             # Инициализация уведомлений
             self.notifications = NotificationManager(self.config)
+            self.notifications.latency = self.latency
+            await self.notifications.initialize()
             logger.info("Менеджер уведомлений инициализирован")
+            self._mark_startup("уведомления")
             
-            # Тестирование Telegram подключения
-            if self.notifications.telegram_enabled:
-                if self.notifications.test_telegram_connection():
-                    await self.notifications.send_test_message()
-                else:
-                    logger.warning("Не удалось подключиться к Telegram")
+            self._register_metrics()
             
+            # Проверки Telegram и бирж не нужны для первого цикла - они выполняются после него
             logger.info("Все компоненты успешно инициализированы")
             
         except Exception as e:
             logger.error(f"Ошибка инициализации: {e}")
             raise
     
+    def _register_metrics(self):
+        """Коллекторы метрик: значения читаются из компонентов бота только при запросе /metrics"""
+        engine = self.trading_engine
+        
+        def candle_syncs():
+            fetchers = list(self.data_manager.fetchers.items()) + \
+                [(f"{name}_async", fetcher) for name, fetcher in self.data_manager.async_fetchers.items()]
+            for name, fetcher in fetchers:
+                for mode in ('full', 'incremental'):
+                    yield 'candle_buffer_syncs_total', {'exchange': name, 'mode': mode}, fetcher.sync_stats[mode]
+        
+        def candle_hit_ratio():
+            for name, fetcher in self.data_manager.async_fetchers.items():
+                stats = fetcher.sync_stats
+                total = stats['full'] + stats['incremental']
+                yield 'candle_buffer_hit_ratio', {'exchange': name}, stats['incremental'] / total if total else 0.0
+        
+        def intermediate_reuse_ratio():
+            stats = self.indicators.get_intermediate_stats()
+            total = stats.get('computed', 0) + stats.get('reused', 0)
+            yield 'indicator_intermediate_reuse_ratio', {}, stats.get('reused', 0) / total if total else 0.0
+        
+        collectors = [
+            ('candle_buffer_syncs_total', 'Синхронизации буфера свечей (incremental - попадание в буфер)',
+             'counter', candle_syncs),
+            ('candle_buffer_hit_ratio', 'Доля инкрементальных синхронизаций буфера свечей', 'gauge', candle_hit_ratio),
+            ('indicator_intermediate_reuse_ratio', 'Доля переиспользованных промежуточных рядов индикаторов',
+             'gauge', intermediate_reuse_ratio),
+            ('trading_open_positions', 'Открытые позиции', 'gauge',
+             lambda: [('trading_open_positions', {}, len(engine.positions))]),
+            ('trading_equity', 'Капитал по закрытым сделкам, USDT', 'gauge',
+             lambda: [('trading_equity', {}, engine.trade_stats.equity)]),
+            ('trading_unrealized_pnl', 'Нереализованный PnL открытых позиций, USDT', 'gauge',
+             lambda: [('trading_unrealized_pnl', {}, engine.positions.total_unrealized_pnl())]),
+            ('trading_trades_total', 'Сделки', 'counter',
+             lambda: [('trading_trades_total', {}, engine.trade_count)]),
+            ('notification_queue_depth', 'Уведомления в очереди отправки', 'gauge',
+             lambda: [('notification_queue_depth', {}, len(self.notifications.queue))]),
+            ('notifications_dropped_total', 'Уведомления, вытесненные из переполненной очереди', 'counter',
+             lambda: [('notifications_dropped_total', {}, self.notifications.queue.dropped)]),
+            ('notifications_sent_total', 'Отправленные уведомления', 'counter',
+             lambda: [('notifications_sent_total', {}, self.notifications.sent_messages)]),
+        ]
+        for name, documentation, kind, collect in collectors:
+            REGISTRY.register_collector(name, documentation, kind, collect)
+    
+    async def _run_startup_checks(self):
+        """Параллельная проверка подключений к Telegram и биржам (после первого цикла)"""
+        try:
+            async def check_telegram():
+                if not self.notifications.telegram_enabled:
+                    return
+                if await self.notifications.check_telegram_connection():
+                    await self.notifications.send_test_message()
+                else:
+                    logger.warning("Не удалось подключиться к Telegram")
+            
+            _, exchanges = await asyncio.gather(check_telegram(), self.data_manager.check_connections())
+            
+            failed = [name for name, connected in exchanges.items() if not connected]
+            if failed:
+                logger.warning(f"Нет подключения к биржам: {', '.join(failed)}")
+            
+            self._mark_startup("проверки подключений")
+            self._log_startup_timeline()
+            
+        except Exception as e:
+            logger.error(f"Ошибка проверки подключений: {e}")
+    
     async def run(self):
         """Основной цикл работы бота"""
         try:
@@ -206,12 +328,27 @@ class AutonomousTradingBot:
             })
             
             # Получаем настройки обновления
-            update_interval = self.config.get('trading', {}).get('update_interval', 900)  # 15 минут по умолчанию
+            trading_config = self.config.get('trading', {})
+            update_interval = trading_config.get('update_interval', 900)  # 15 минут по умолчанию
+            self.scheduler = scheduler = self._create_scheduler()
+            
+            # Первый цикл - сразу по последним закрытым свечам, далее - по расписанию
+            timeframes, candle_close = None, None
             
             while self.running:
                 try:
-                    await self._trading_cycle()
-                    await asyncio.sleep(update_interval)
+                    try:
+                        await self._trading_cycle(timeframes, candle_close)
+                    finally:
+                        if self._startup_checks_task is None:
+                            self._mark_startup("первый цикл")
+                            logger.info(f"Время до первого цикла: {self.startup_timeline[-1][1]:.2f} с")
+                            self._startup_checks_task = asyncio.create_task(self._run_startup_checks())
+                    
+                    if scheduler:
+                        candle_close, timeframes = await scheduler.wait()
+                    else:
+                        await asyncio.sleep(update_interval)
                     
                 except KeyboardInterrupt:
                     logger.info("Получен сигнал прерывания")
@@ -219,7 +356,11 @@ class AutonomousTradingBot:
                 except Exception as e:
                     logger.error(f"Ошибка в торговом цикле: {e}")
                     await self.notifications.send_error_notification(str(e), "Торговый цикл")
-                    await asyncio.sleep(60)  # Пауза перед повтором
+                    if scheduler:
+                        # Повтор - на следующем закрытии свечи
+                        candle_close, timeframes = await scheduler.wait()
+                    else:
+                        await asyncio.sleep(60)  # Пауза перед повтором
             
         except Exception as e:
             logger.error(f"Критическая ошибка: {e}")
@@ -227,64 +368,238 @@ class AutonomousTradingBot:
         finally:
             await self.shutdown()
     
-    async def _trading_cycle(self):
-        """Один цикл торговли"""
+    def _get_timeframes(self) -> List[str]:
+        """Таймфреймы торгового цикла (trading.timeframes или таймфрейм стратегии)"""
+        timeframes = self.config.get('trading', {}).get('timeframes') or [self.strategy.timeframe]
+        return list(dict.fromkeys(timeframes))
+    
+    def _create_scheduler(self) -> Optional[CandleScheduler]:
+        """Планировщик по закрытию свечей (None - режим фиксированного интервала)"""
+        trading_config = self.config.get('trading', {})
+        if trading_config.get('schedule', 'candle_close') != 'candle_close':
+            return None
+        
+        scheduler = CandleScheduler(
+            self._get_timeframes(),
+            delay=trading_config.get('close_delay_ms', 300) / 1000,
+            server_time=self.data_manager.get_server_time_async,
+            sync_interval=trading_config.get('time_sync_interval', 3600)
+        )
+        logger.info(f"Цикл по закрытию свечей: {', '.join(scheduler.timeframes)}, "
+                    f"задержка {scheduler.delay * 1000:.0f} мс")
+        return scheduler
+    
+    async def _trading_cycle(self, timeframes: Optional[List[str]] = None,
+                             candle_close: Optional[int] = None):
+        """
+        Один цикл торговли
+        
+        Args:
+            timeframes: Таймфреймы, свечи которых закрылись (по умолчанию - все)
+            candle_close: Время закрытия свечей по бирже в мс (для расчета задержки)
+        """
+        self.latency.start_cycle()
         try:
             logger.info("Начало торгового цикла")
             
             # Получаем данные
             symbol = self.strategy.symbol
-            timeframe = self.strategy.timeframe
             limit = 100  # Количество свечей для анализа
             
-            logger.info(f"Получение данных: {symbol} {timeframe}")
-            df = self.data_manager.get_data(symbol, timeframe, limit)
-            
-            if df.empty:
-                logger.warning("Получены пустые данные")
-                return
-            
-            # Рассчитываем индикаторы
-            logger.info("Расчет индикаторов")
-            df_with_indicators = self.indicators.calculate_all_indicators(df)
-            
-            # Анализируем рынок
-            logger.info("Анализ рынка")
-            signal = self.strategy.analyze_market(df_with_indicators)
+            timeframes = timeframes or self._get_timeframes()
             
-            # Отправляем уведомление о сигнале
-            if signal.signal_type != SignalType.HOLD:
-                await self.notifications.send_signal_notification(signal)
+            # Свечи всех закрывшихся таймфреймов запрашиваются параллельно
+            with self.latency.span('fetch'):
+                frames = await asyncio.gather(*(self._get_just_closed_candles(symbol, timeframe, limit, candle_close)
+                                                for timeframe in timeframes))
             
-            # Исполняем сигнал
-            if signal.signal_type != SignalType.HOLD:
-                logger.info(f"Исполнение сигнала: {signal.signal_type.value}")
-                success = self.trading_engine.execute_signal(signal)
+            for timeframe, df in zip(timeframes, frames):
+                if df is None:
+                    continue
                 
-                if success:
-                    # Получаем последнюю сделку
-                    trades = self.trading_engine.get_trades(limit=1)
-                    if trades:
-                        await self.notifications.send_trade_notification(trades[-1])
-                else:
-                    logger.error("Не удалось исполнить сигнал")
+                await self._analyze_and_execute(df, symbol, timeframe)
+                key = (self.data_manager.default_exchange, symbol, timeframe)
+                self.last_processed_candles[key] = df.index[-1]
+                
+                if candle_close is not None and self.scheduler:
+                    latency = self.scheduler.now_ms() - candle_close
+                    self.signal_latency_ms[timeframe] = latency
+                    logger.info(f"Свеча {symbol} {timeframe} обработана через {latency:.0f} мс после закрытия")
             
-            # Обновляем позиции
-            self.trading_engine.update_positions()
+            # Обновляем позиции (запросы тикеров - в потоке движка)
+            with self.latency.span('positions'):
+                await self.executors.run_engine(self.trading_engine.update_positions, stage='positions')
             
             # Обновляем время последнего обновления
             self.last_update = datetime.now()
             
             # Логируем статистику
-            self._log_statistics()
+            await self._log_statistics()
             
             logger.info("Торговый цикл завершен")
             
         except Exception as e:
             logger.error(f"Ошибка в торговом цикле: {e}")
             raise
+        finally:
+            self.latency.end_cycle()
+            await asyncio.sleep(0)  # просроченный замер задержки успевает выполниться
+            self.latency.cycle['loop_lag_max'] = self.loop_lag.take_max()
+            logger.info(f"Тайминги цикла, мс: {self.latency.format_cycle()}")
+            self._publish_status()
     
-    def _log_statistics(self):
+    async def _get_just_closed_candles(self, symbol: str, timeframe: str, limit: int,
+                                       candle_close: Optional[int] = None):
+        """
+        Получение свечей после закрытия по расписанию
+        
+        Биржа может отдать только что закрытую свечу с небольшой задержкой:
+        если ее еще нет, запрос повторяется (trading.close_retries раз).
+        """
+        df = await self._get_new_closed_candles(symbol, timeframe, limit)
+        if candle_close is None:
+            return df
+        
+        trading_config = self.config.get('trading', {})
+        retries = trading_config.get('close_retries', 3)
+        retry_delay = trading_config.get('close_retry_delay', 1.0)
+        for _ in range(retries):
+            if df is not None:
+                break
+            await asyncio.sleep(retry_delay)
+            df = await self._get_new_closed_candles(symbol, timeframe, limit)
+        return df
+    
+    async def _get_new_closed_candles(self, symbol: str, timeframe: str, limit: int):
+        """
+        Получение закрытых свечей, если появилась новая закрытая свеча
+        
+        Формирующаяся свеча в анализ не попадает. Если с прошлого цикла
+        новая свеча не закрылась, ни индикаторы, ни стратегия не вызываются.
+        
+        Returns:
+            DataFrame закрытых свечей или None, если анализировать нечего
+        """
+        key = (self.data_manager.default_exchange, symbol, timeframe)
+        last_processed = self.last_processed_candles.get(key)
+        
+        # Следующая свеча после обработанной еще не закрылась - не обращаемся к бирже
+        if last_processed is not None:
+            next_close = last_processed + 2 * timeframe_to_timedelta(timeframe)
+            if utc_now() < next_close:
+                logger.info(f"Новая свеча {symbol} {timeframe} еще не закрыта "
+                            f"(закрытие в {next_close}), анализ пропущен")
+                return None
+        
+        logger.info(f"Получение данных: {symbol} {timeframe}")
+        df = await self.data_manager.get_closed_data_async(symbol, timeframe, limit)
+        
+        if df.empty:
+            logger.warning("Получены пустые данные")
+            return None
+        
+        last_closed = df.index[-1]
+        if last_processed is not None and last_closed <= last_processed:
+            logger.info(f"Свеча {last_closed} уже обработана, анализ пропущен")
+            return None
+        
+        return df
+    
+    async def _analyze_and_execute(self, df, symbol: str, timeframe: str):
+        """Расчет индикаторов, анализ рынка и исполнение сигнала по закрытым свечам"""
+        # Рассчитываем индикаторы
+        logger.info("Расчет индикаторов")
+        with self.latency.span('indicators'):
+            if self.config.get('strategy', {}).get('incremental_indicators', False):
+                # Состояние потоковых индикаторов хранится в этом процессе - расчет в пуле потоков
+                stream_key = f"{self.data_manager.default_exchange}:{symbol}:{timeframe}"
+                df_with_indicators = await self.executors.run_io(
+                    self.indicators.calculate_incremental, df, stream_key, stage='indicators')
+            else:
+                df_with_indicators = await self.executors.calculate_indicators(self.indicators, df)
+        
+        # Анализируем рынок
+        logger.info("Анализ рынка")
+        with self.latency.span('strategy'):
+            signal = self.strategy.analyze_market(df_with_indicators)
+        TRADING_SIGNALS.labels(signal.signal_type.value).inc()
+        self.last_signal = signal
+        
+        # Отправляем уведомление о сигнале
+        if signal.signal_type != SignalType.HOLD:
+            with self.latency.span('notifications'):
+                await self.notifications.send_signal_notification(signal)
+        
+        # Исполняем сигнал
+        if signal.signal_type != SignalType.HOLD:
+            logger.info(f"Исполнение сигнала: {signal.signal_type.value}")
+            self.strategy.record_signal(signal)
+            with self.latency.span('execute'):
+                try:
+                    success = await self.executors.run_engine(self.trading_engine.execute_signal, signal,
+                                                              stage='execute')
+                except asyncio.TimeoutError:
+                    # Ордер мог быть исполнен: поток дорабатывает в фоне, результат будет в истории сделок
+                    logger.error("Исполнение сигнала не завершилось вовремя, результат неизвестен")
+                    success = False
+            
+            if success:
+                # Получаем последнюю сделку
+                trades = await self.executors.run_engine(self.trading_engine.get_trades, 1, stage='positions')
+                if trades:
+                    with self.latency.span('notifications'):
+                        await self.notifications.send_trade_notification(trades[-1])
+            else:
+                logger.error("Не удалось исполнить сигнал")
+    
+    def _last_signal_snapshot(self) -> Optional[Dict]:
+        """Последний сигнал для /status (у HOLD без индикаторов, чтобы не строить отложенный снимок)"""
+        if self.last_signal is None:
+            return None
+        with_indicators = self.last_signal.signal_type != SignalType.HOLD
+        return SignalRecord.from_signal(self.last_signal, with_indicators=with_indicators).to_dict()
+    
+    def _publish_status(self):
+        """Публикация снимка состояния для /status (только данные в памяти, без запросов к бирже)"""
+        try:
+            engine = self.trading_engine
+            now = utc_now()
+            exchange = self.data_manager.default_exchange
+            symbol = self.strategy.symbol
+            
+            last_candles = {}
+            data_age = {}
+            for timeframe in self._get_timeframes():
+                last_open = self.last_processed_candles.get((exchange, symbol, timeframe))
+                if last_open is None:
+                    continue
+                close_time = last_open + timeframe_to_timedelta(timeframe)
+                last_candles[timeframe] = close_time.isoformat()
+                data_age[timeframe] = (now - close_time).total_seconds()
+            
+            STATUS_BOARD.publish({
+                "status": "running" if self.running else "stopped",
+                "service": "autonomous_trading_bot",
+                "version": "2.0",
+                "updated_at": datetime.now().isoformat(),
+                "mode": "simulation" if engine.simulation_mode else "real",
+                "exchange": exchange,
+                "symbol": symbol,
+                "positions": [position.to_dict() for position in engine.positions.values()],
+                "balance": engine.get_cached_balance(),
+                "balance_updated_at": None if engine.simulation_mode or engine.last_balance_at is None
+                else engine.last_balance_at.isoformat(),
+                "last_signal": self._last_signal_snapshot(),
+                "last_candle_close": last_candles,
+                "data_age_seconds": data_age,
+                "signal_latency_ms": dict(self.signal_latency_ms),
+                "last_cycle_ms": dict(self.latency.cycle),
+                "trading_stats": engine.get_trading_stats(),
+            })
+        except Exception as e:
+            logger.error(f"Ошибка публикации состояния: {e}")
+    
+    async def _log_statistics(self):
         """Логирование статистики"""
         try:
             # Статистика стратегии
@@ -298,7 +613,7 @@ class AutonomousTradingBot:
                        f"PnL: {trading_stats['total_pnl']:.4f} USDT")
             
             # Баланс
-            balance = self.trading_engine.get_balance()
+            balance = await self.executors.run_engine(self.trading_engine.get_balance, stage='balance')
             usdt_balance = balance.get('USDT', 0)
             logger.info(f"Баланс USDT: {usdt_balance:.4f}")
             
@@ -311,7 +626,7 @@ class AutonomousTradingBot:
             stats = {
                 'trading_stats': self.trading_engine.get_trading_stats(),
                 'strategy_stats': self.strategy.get_strategy_stats(),
-                'balance': self.trading_engine.get_balance()
+                'balance': await self.executors.run_engine(self.trading_engine.get_balance, stage='balance')
             }
             
             await self.notifications.send_daily_report(stats)
@@ -329,6 +644,10 @@ class AutonomousTradingBot:
         try:
             logger.info("Завершение работы бота...")
             
+            # Прерываем незавершенные проверки подключений
+            if self._startup_checks_task and not self._startup_checks_task.done():
+                self._startup_checks_task.cancel()
+            
             # Отправляем уведомление о завершении
             if self.notifications:
                 await self.notifications.send_status_notification({
@@ -336,9 +655,32 @@ class AutonomousTradingBot:
                     "Время работы": f"{self.last_update.strftime('%Y-%m-%d %H:%M:%S') if self.last_update else 'Неизвестно'}"
                 })
             
-            # Сохраняем историю сделок
+            # Снимок состояния с отметкой об остановке
             if self.trading_engine:
-                self.trading_engine._save_trade_history()
+                self._publish_status()
+            
+            # Закрываем журнал сделок и базу данных (в потоке движка - после его незавершенных вызовов)
+            if self.trading_engine:
+                try:
+                    if self.executors:
+                        await self.executors.run_engine(self.trading_engine.close, stage='execute')
+                    else:
+                        self.trading_engine.close()
+                except asyncio.TimeoutError:
+                    pass  # ошибка уже в логе, продолжаем завершение
+            
+            # Останавливаем контроль задержки и пулы исполнения
+            self.loop_lag.stop()
+            if self.executors:
+                self.executors.shutdown()
+            
+            # Закрываем HTTP сессию уведомлений
+            if self.notifications:
+                await self.notifications.close()
+            
+            # Закрываем асинхронные клиенты бирж
+            if self.data_manager:
+                await self.data_manager.close()
             
             logger.info("Бот завершил работу")
             
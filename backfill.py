@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Скрипт загрузки исторических свечей в локальное хранилище
+Диапазон по умолчанию - backtest.start_date / backtest.end_date из config.yaml
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import yaml
+
+# Добавляем текущую директорию в путь
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bot.backfill import Backfill
+from bot.candle_store import CandleStore
+from bot.data_fetcher import DataFetcher
+from bot.exchange_pool import EXCHANGES
+
+
+def parse_args(config):
+    """Разбор аргументов командной строки"""
+    trading = config.get('trading', {})
+    backtest = config.get('backtest', {})
+    default_exchange = trading.get('default_exchange', 'binance')
+    if str(default_exchange).startswith('${'):
+        default_exchange = 'binance'
+
+    parser = argparse.ArgumentParser(description="Загрузка истории свечей")
+    parser.add_argument('--exchange', default=default_exchange)
+    parser.add_argument('--symbol', action='append', dest='symbols',
+                        help="Торговая пара (можно указать несколько раз)")
+    parser.add_argument('--timeframe', default=trading.get('timeframe', '15m'))
+    parser.add_argument('--start', default=backtest.get('start_date', '2023-01-01'))
+    parser.add_argument('--end', default=backtest.get('end_date'))
+    parser.add_argument('--store', default=config.get('candle_store', {}).get('path', 'data/candles'))
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    if not args.symbols:
+        args.symbols = [trading.get('symbol', 'BTC/USDT')]
+    return args
+
+
+def main():
+    """Главная функция загрузки"""
+    config_path = "config.yaml"
+    if not os.path.exists(config_path):
+        print(f"❌ Файл конфигурации {config_path} не найден!")
+        sys.exit(1)
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+
+    args = parse_args(config)
+
+    # Для истории достаточно публичного API; лимиты запросов - из config.yaml
+    EXCHANGES.configure(config.get('exchanges', {}))
+    fetcher = DataFetcher(args.exchange)
+    store = CandleStore(args.store)
+    backfill = Backfill(fetcher.exchange, fetcher.exchange_name, store,
+                        chunk_size=args.chunk_size, max_workers=args.workers,
+                        limiter=fetcher.limiter)
+
+    for symbol in args.symbols:
+        print(f"📥 {symbol} {args.timeframe}: {args.start} - {args.end or 'сейчас'}")
+        try:
+            saved = backfill.run(symbol, args.timeframe, args.start, args.end)
+            gaps = store.find_gaps(fetcher.exchange_name, symbol, args.timeframe)
+            print(f"✅ Сохранено {saved} свечей, всего {store.count(fetcher.exchange_name, symbol, args.timeframe)}, "
+                  f"пропусков {len(gaps)}")
+        except KeyboardInterrupt:
+            print("\n👋 Загрузка прервана, прогресс сохранен в контрольной точке")
+            sys.exit(1)
+        except Exception as e:
+            print(f"❌ Ошибка загрузки {symbol}: {e}")
+
+    print(f"Запросов к бирже: {backfill.stats['requests']}")
+
+
+if __name__ == "__main__":
+    main()
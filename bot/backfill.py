@@ -0,0 +1,243 @@
+"""
+Загрузка исторических свечей в локальное хранилище
+Параллельная постраничная загрузка fetch_ohlcv(since=) с возобновлением по контрольной точке
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import pandas as pd
+from loguru import logger
+
+from .candle_store import CandleStore
+from .data_fetcher import drop_forming_candle, ohlcv_to_frame, timeframe_to_timedelta, utc_now
+from .exchange_pool import EXCHANGES, WeightLimiter, call_exchange
+
+
+def _to_ms(value) -> int:
+    """Перевод времени в миллисекунды UTC"""
+    return int((pd.Timestamp(value) - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1))
+
+
+@dataclass
+class BackfillProgress:
+    """Состояние загрузки одной серии"""
+    start: int  # мс, включительно
+    end: int  # мс, не включительно
+    chunk_ms: int
+    done: List[int] = field(default_factory=list)  # начала загруженных и сохраненных участков
+
+    def chunks(self) -> List[int]:
+        return list(range(self.start, self.end, self.chunk_ms))
+
+    def pending(self) -> List[int]:
+        done = set(self.done)
+        return [chunk for chunk in self.chunks() if chunk not in done]
+
+
+class Backfill:
+    """
+    Загрузчик истории свечей
+
+    Диапазон делится на участки по chunk_size свечей, участки загружаются
+    параллельно (постранично через since=) и сохраняются в CandleStore.
+    После сохранения участка он отмечается в файле контрольной точки,
+    поэтому прерванная загрузка продолжается с незагруженных участков.
+    Запросы идут через лимитер веса реестра бирж (общий бюджет с ботом,
+    резерв для ордеров сохраняется).
+    """
+
+    def __init__(self, exchange, exchange_name: str, store: CandleStore,
+                 checkpoint_path: Optional[str] = None, chunk_size: int = 1000,
+                 max_workers: int = 4, flush_rows: int = 100000,
+                 limiter: Optional[WeightLimiter] = None):
+        """
+        Инициализация загрузчика
+
+        Args:
+            exchange: Клиент биржи ccxt (или объект с fetch_ohlcv и last_response_headers)
+            exchange_name: Название биржи в хранилище
+            store: Хранилище свечей
+            checkpoint_path: Файл контрольной точки (по умолчанию в каталоге хранилища)
+            chunk_size: Свечей в одном запросе
+            max_workers: Количество параллельных загрузок
+            flush_rows: Минимум свечей для записи в хранилище при объединении с данными
+            limiter: Лимитер веса запросов (по умолчанию - публичный лимитер биржи из реестра)
+        """
+        self.exchange = exchange
+        self.exchange_name = exchange_name
+        self.store = store
+        self.checkpoint_path = checkpoint_path or os.path.join(store.root, 'backfill_checkpoint.json')
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.flush_rows = flush_rows
+
+        self.limiter = limiter or EXCHANGES.limiter(exchange_name)
+        self._checkpoint = self._load_checkpoint()
+        self._checkpoint_lock = threading.Lock()
+
+        self.stats = {'requests': 0, 'candles': 0, 'chunks': 0}
+
+    def _load_checkpoint(self) -> Dict[str, Dict]:
+        """Загрузка контрольной точки"""
+        if not os.path.exists(self.checkpoint_path):
+            return {}
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Не удалось прочитать контрольную точку {self.checkpoint_path}: {e}")
+            return {}
+
+    def _save_checkpoint(self):
+        """Атомарное сохранение контрольной точки"""
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._checkpoint, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _series_key(self, symbol: str, timeframe: str) -> str:
+        return f"{self.exchange_name}|{symbol}|{timeframe}"
+
+    def _progress(self, symbol: str, timeframe: str, start: int, end: int) -> BackfillProgress:
+        """
+        Состояние загрузки серии
+
+        Контрольная точка используется, если совпадают начало и размер участка:
+        конец диапазона по умолчанию - текущее время, он меняется при каждом
+        запуске. Сохраняются загруженные участки, целиком покрывающие свою часть
+        нового диапазона; последний участок прошлого диапазона, обрезанный его
+        концом, при продлении загружается заново.
+        """
+        chunk_ms = self.chunk_size * int(timeframe_to_timedelta(timeframe).total_seconds() * 1000)
+        progress = BackfillProgress(start=start, end=end, chunk_ms=chunk_ms)
+        saved = self._checkpoint.get(self._series_key(symbol, timeframe))
+        if saved and saved['start'] == start and saved['chunk_ms'] == chunk_ms:
+            progress.done = [chunk for chunk in saved['done']
+                             if chunk < end and min(chunk + chunk_ms, saved['end']) >= min(chunk + chunk_ms, end)]
+        return progress
+
+    def _fetch_chunk(self, symbol: str, timeframe: str, chunk_start: int,
+                     chunk_end: int) -> pd.DataFrame:
+        """Загрузка одного участка (несколько страниц, если биржа отдает меньше chunk_size)"""
+        step = int(timeframe_to_timedelta(timeframe).total_seconds() * 1000)
+        rows = []
+        since = chunk_start
+
+        while since < chunk_end:
+            ohlcv = call_exchange(self.exchange, self.limiter, 'fetch_ohlcv', symbol, timeframe,
+                                  since=since, limit=self.chunk_size)
+            self.stats['requests'] += 1
+
+            page = [row for row in ohlcv if since <= row[0] < chunk_end]
+            if not page:
+                break
+            rows.extend(page)
+            since = page[-1][0] + step
+
+        return ohlcv_to_frame(rows)
+
+    def run(self, symbol: str, timeframe: str, start, end=None) -> int:
+        """
+        Загрузка диапазона свечей одной серии
+
+        Args:
+            symbol: Торговая пара
+            timeframe: Таймфрейм
+            start: Начало диапазона (дата или Timestamp)
+            end: Конец диапазона (по умолчанию - текущее время)
+
+        Returns:
+            Количество сохраненных свечей
+        """
+        end = end if end is not None else utc_now()
+        progress = self._progress(symbol, timeframe, _to_ms(start), _to_ms(end))
+        key = self._series_key(symbol, timeframe)
+
+        pending = progress.pending()
+        if not pending:
+            logger.info(f"История {symbol} {timeframe} уже загружена")
+            return 0
+
+        logger.info(f"Загрузка истории {symbol} {timeframe}: {len(pending)} участков, "
+                    f"{self.max_workers} потоков")
+
+        saved = 0
+        ready: Dict[int, pd.DataFrame] = {}
+        next_index = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._fetch_chunk, symbol, timeframe, chunk,
+                                min(chunk + progress.chunk_ms, progress.end)): chunk
+                for chunk in pending
+            }
+
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    ready[chunk] = future.result()
+                except Exception as e:
+                    # Участок останется незагруженным и будет запрошен при следующем запуске
+                    logger.error(f"Ошибка загрузки {symbol} {timeframe} с {pd.Timestamp(chunk, unit='ms')}: {e}")
+                    continue
+
+                # Сохраняем участки по порядку: в пустое хранилище данные только дописываются
+                contiguous = []
+                while next_index < len(pending) and pending[next_index] in ready:
+                    contiguous.append(pending[next_index])
+                    next_index += 1
+                ready_rows = sum(len(ready[chunk]) for chunk in contiguous)
+
+                if contiguous and (ready_rows >= self.flush_rows or next_index == len(pending)
+                                   or self._appends_only(symbol, timeframe, contiguous[0])):
+                    saved += self._flush(symbol, timeframe, key, progress,
+                                         [(chunk, ready.pop(chunk)) for chunk in contiguous])
+                else:
+                    next_index -= len(contiguous)
+
+            # Участки после неудачного остаются в памяти - сохраняем их тоже
+            remaining = sorted(chunk for chunk in ready)
+            if remaining:
+                saved += self._flush(symbol, timeframe, key, progress,
+                                     [(chunk, ready.pop(chunk)) for chunk in remaining])
+
+        logger.info(f"История {symbol} {timeframe}: сохранено {saved} свечей, "
+                    f"осталось участков {len(progress.pending())}")
+        return saved
+
+    def _appends_only(self, symbol: str, timeframe: str, chunk: int) -> bool:
+        """Участок новее всех сохраненных свечей (запись без перезаписи серии)"""
+        last = self.store.last_timestamp(self.exchange_name, symbol, timeframe)
+        return last is None or chunk > _to_ms(last)
+
+    def _chunk_close(self, progress: BackfillProgress, chunk: int, timeframe: str) -> int:
+        """Время закрытия последней свечи участка, мс"""
+        step = int(timeframe_to_timedelta(timeframe).total_seconds() * 1000)
+        chunk_end = min(chunk + progress.chunk_ms, progress.end)
+        return chunk + -(-(chunk_end - chunk) // step) * step
+
+    def _flush(self, symbol: str, timeframe: str, key: str, progress: BackfillProgress,
+               chunks: List[tuple]) -> int:
+        """Запись участков в хранилище и обновление контрольной точки"""
+        frames = [df for _, df in chunks if not df.empty]
+        saved = 0
+        if frames:
+            df = drop_forming_candle(pd.concat(frames), timeframe)
+            saved = self.store.write(self.exchange_name, symbol, timeframe, df)
+
+        with self._checkpoint_lock:
+            # Участок с незакрытой свечой может дополниться - его не отмечаем
+            now = _to_ms(utc_now())
+            progress.done.extend(chunk for chunk, _ in chunks
+                                 if self._chunk_close(progress, chunk, timeframe) <= now)
+            self._checkpoint[key] = progress.__dict__
+            self._save_checkpoint()
+
+        self.stats['chunks'] += len(chunks)
+        self.stats['candles'] += saved
+        return saved
@@ -0,0 +1,216 @@
+"""
+Векторизованный бэктестинг стратегии
+Индикаторы считаются один раз по всей истории, правила TradingStrategy - массивами по барам
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from .candle_store import CandleStore
+from .indicators import TechnicalIndicators
+from .strategy import (MIN_BARS, MIN_BUY_CONFIDENCE, MIN_SELL_CONFIDENCE,
+                       buy_confidence, sell_confidence)
+from .trading_engine import Trade
+
+
+@dataclass
+class BacktestResult:
+    """Результат бэктеста"""
+    trades: List[Trade]
+    equity: pd.Series  # Стоимость портфеля (USDT + позиция по close) на каждом баре
+    initial_capital: float
+    stats: Dict[str, float] = field(default_factory=dict)
+
+
+class Backtester:
+    """
+    Векторизованный бэктестер
+
+    Сигналы BUY/SELL вычисляются для всех баров сразу по тем же правилам,
+    что TradingStrategy.analyze_market (пересечение EMA + уверенность по
+    фильтрам), после чего последовательно проходятся только бары с
+    сигналами: так моделируется длинная позиция TradingEngine в режиме
+    симуляции (одна позиция, вход по close, выход всей позицией).
+    """
+
+    def __init__(self, config: Dict, indicators: Optional[TechnicalIndicators] = None):
+        """
+        Инициализация бэктестера
+
+        Args:
+            config: Конфигурация из config.yaml
+            indicators: Калькулятор индикаторов (по умолчанию создается из config)
+        """
+        self.config = config
+        self.indicators = indicators or TechnicalIndicators(config)
+
+        trading_config = config.get('trading', {})
+        backtest_config = config.get('backtest', {})
+        self.symbol = config.get('strategy', {}).get('symbol', 'BTC/USDT')
+        self.trade_amount = trading_config.get('trade_amount', 5)
+        self.trade_amount_type = trading_config.get('trade_amount_type', 'fixed')
+        self.initial_capital = backtest_config.get('initial_capital',
+                                                   trading_config.get('initial_capital', 1000))
+        self.start_date = backtest_config.get('start_date')
+        self.end_date = backtest_config.get('end_date')
+        self.exchange = trading_config.get('default_exchange', 'binance')
+
+    def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Сигналы стратегии для всех баров
+
+        Args:
+            df: DataFrame с OHLCV данными и индикаторами
+
+        Returns:
+            DataFrame с колонками buy, sell (bool), buy_confidence, sell_confidence
+        """
+        cross_up, cross_down = self.indicators.get_ema_cross_arrays(df)
+        filters = self.indicators.get_filter_signal_arrays(df)
+
+        # Порядок и состав фильтров как в TradingStrategy._analyze_buy_signal
+        enabled_filters = [name for name, config in self.indicators.indicators_config.items()
+                           if config.enabled and name != 'ema']
+        passed = np.zeros(len(df), dtype=int)
+        for name in enabled_filters:
+            passed += filters[name]
+
+        buy_conf = np.broadcast_to(buy_confidence(passed, len(enabled_filters)), len(df))
+        sell_conf = np.broadcast_to(sell_confidence(passed, len(enabled_filters)), len(df))
+
+        # analyze_market не анализирует окно короче MIN_BARS свечей
+        enough_data = np.arange(len(df)) >= MIN_BARS - 1
+
+        return pd.DataFrame({
+            'buy': cross_up & (buy_conf >= MIN_BUY_CONFIDENCE) & enough_data,
+            'sell': cross_down & (sell_conf >= MIN_SELL_CONFIDENCE) & enough_data,
+            'buy_confidence': buy_conf,
+            'sell_confidence': sell_conf,
+        }, index=df.index)
+
+    def _trade_amount(self, price: float, usdt: float) -> float:
+        """Количество для покупки (как TradingEngine._calculate_trade_amount)"""
+        if self.trade_amount_type == 'fixed':
+            return self.trade_amount / price
+        elif self.trade_amount_type == 'percentage':
+            return usdt * (self.trade_amount / 100) / price
+        elif self.trade_amount_type == 'coins':
+            return self.trade_amount
+        return 0
+
+    def run(self, df: pd.DataFrame, with_indicators: bool = False) -> BacktestResult:
+        """
+        Запуск бэктеста
+
+        Args:
+            df: DataFrame с OHLCV данными
+            with_indicators: Индикаторы уже рассчитаны
+
+        Returns:
+            BacktestResult со сделками, кривой капитала и статистикой
+        """
+        data = df if with_indicators else self.indicators.calculate_all_indicators(df)
+        signals = self.generate_signals(data)
+
+        close = data['close'].to_numpy(dtype=float)
+        buy = signals['buy'].to_numpy()
+        sell = signals['sell'].to_numpy()
+
+        usdt = float(self.initial_capital)
+        amount = 0.0
+        entry_price = None
+        trades: List[Trade] = []
+
+        # Состояние счета меняется только на барах со сделками
+        change_bars = [0]
+        usdt_path = [usdt]
+        amount_path = [0.0]
+
+        for i in np.flatnonzero(buy | sell):
+            price = float(close[i])
+            timestamp = data.index[i]
+
+            if buy[i] and entry_price is None:
+                trade_amount = self._trade_amount(price, usdt)
+                required_usdt = trade_amount * price
+                if trade_amount <= 0 or usdt < required_usdt:
+                    continue
+                usdt -= required_usdt
+                amount = trade_amount
+                entry_price = price
+                trades.append(Trade(id=f"bt_buy_{i}", symbol=self.symbol, side='buy',
+                                    amount=trade_amount, price=price, timestamp=timestamp,
+                                    exchange=self.exchange))
+
+            elif sell[i] and entry_price is not None:
+                pnl = (price - entry_price) * amount
+                usdt += amount * price
+                trades.append(Trade(id=f"bt_sell_{i}", symbol=self.symbol, side='sell',
+                                    amount=amount, price=price, timestamp=timestamp,
+                                    exchange=self.exchange, pnl=pnl))
+                amount = 0.0
+                entry_price = None
+            else:
+                continue
+
+            change_bars.append(i)
+            usdt_path.append(usdt)
+            amount_path.append(amount)
+
+        # Разворачиваем состояние счета на все бары
+        positions = np.searchsorted(np.array(change_bars), np.arange(len(close)), side='right') - 1
+        equity = np.array(usdt_path)[positions] + np.array(amount_path)[positions] * close
+
+        result = BacktestResult(trades=trades, equity=pd.Series(equity, index=data.index),
+                                initial_capital=float(self.initial_capital))
+        result.stats = self._calculate_stats(result)
+
+        logger.info(f"Бэктест {self.symbol}: {len(data)} свечей, {len(trades)} сделок, "
+                    f"PnL {result.stats['total_pnl']:.4f}")
+        return result
+
+    def run_from_store(self, store: CandleStore, symbol: str, timeframe: str,
+                       exchange: Optional[str] = None) -> BacktestResult:
+        """
+        Бэктест на истории из хранилища свечей за период backtest.start_date - end_date
+
+        Args:
+            store: Хранилище свечей
+            symbol: Торговая пара
+            timeframe: Таймфрейм
+            exchange: Биржа (по умолчанию trading.default_exchange)
+
+        Returns:
+            BacktestResult
+        """
+        df = store.read(exchange or self.exchange, symbol, timeframe,
+                        start=self.start_date, end=self.end_date)
+        if df.empty:
+            raise ValueError(f"Нет сохраненных свечей {symbol} {timeframe}")
+        return self.run(df)
+
+    def _calculate_stats(self, result: BacktestResult) -> Dict[str, float]:
+        """Статистика в формате TradingEngine.get_trading_stats"""
+        closed_trades = [t for t in result.trades if t.side == 'sell' and t.pnl is not None]
+        total_trades = len(closed_trades)
+        total_pnl = sum(t.pnl for t in closed_trades)
+        winning_trades = len([t for t in closed_trades if t.pnl > 0])
+
+        equity = result.equity.to_numpy()
+        final_equity = float(equity[-1]) if len(equity) else result.initial_capital
+        peak = np.maximum.accumulate(equity) if len(equity) else equity
+        drawdown = float(np.max((peak - equity) / peak) * 100) if len(equity) else 0.0
+
+        return {
+            'total_trades': total_trades,
+            'total_pnl': total_pnl,
+            'win_rate': (winning_trades / total_trades * 100) if total_trades > 0 else 0,
+            'avg_trade': total_pnl / total_trades if total_trades > 0 else 0,
+            'final_equity': final_equity,
+            'return_percent': (final_equity / result.initial_capital - 1) * 100,
+            'max_drawdown_percent': drawdown,
+        }
@@ -0,0 +1,335 @@
+"""
+Локальное хранилище свечей
+Колоночные бинарные файлы по (биржа, символ, таймфрейм) с индексом по времени
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import ccxt
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+
+# Колонки и их типы в файлах (little-endian, фиксированный размер записи)
+COLUMNS: Dict[str, str] = {
+    'timestamp': '<i8',  # время открытия свечи, мс UTC
+    'open': '<f8',
+    'high': '<f8',
+    'low': '<f8',
+    'close': '<f8',
+    'volume': '<f8',
+}
+
+# Описание серии (исходный символ и текущее поколение файлов колонок)
+META_FILE = 'meta.json'
+
+
+def _to_ms(index: pd.DatetimeIndex) -> np.ndarray:
+    """Перевод индекса времени в миллисекунды UTC"""
+    return ((index - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)).to_numpy(dtype='int64')
+
+
+def _to_ms_scalar(value) -> int:
+    """Перевод времени (Timestamp, строка или мс) в миллисекунды UTC"""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int((pd.Timestamp(value) - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1))
+
+
+class CandleStore:
+    """
+    Хранилище свечей на диске
+
+    Каждая серия (биржа, символ, таймфрейм) хранится в отдельном каталоге,
+    каждая колонка - в отдельном файле с массивом фиксированного типа.
+    Файлы читаются через memory map, поэтому чтение диапазона не требует
+    загрузки всей истории: границы находятся бинарным поиском по timestamp.
+
+    При перезаписи серии колонки пишутся в файлы нового поколения, а
+    переключение на них - одна замена meta.json: после сбоя серия целиком
+    остается в старом или в новом состоянии.
+    """
+
+    def __init__(self, root: str = 'data/candles'):
+        """
+        Инициализация хранилища
+
+        Args:
+            root: Корневой каталог хранилища
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _series_dir(self, exchange: str, symbol: str, timeframe: str) -> str:
+        """Каталог серии"""
+        safe_symbol = symbol.replace('/', '_').replace(':', '_')
+        return os.path.join(self.root, exchange, safe_symbol, timeframe)
+
+    def _path(self, series_dir: str, column: str, generation: int = 0) -> str:
+        if generation == 0:
+            return os.path.join(series_dir, f"{column}.bin")
+        return os.path.join(series_dir, f"{column}.{generation}.bin")
+
+    def _read_meta(self, series_dir: str) -> Dict:
+        """Описание серии (пустое для серий, созданных до появления meta.json)"""
+        try:
+            with open(os.path.join(series_dir, META_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write_meta(self, series_dir: str, meta: Dict):
+        """Атомарная замена описания серии"""
+        path = os.path.join(series_dir, META_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _paths(self, series_dir: str) -> Dict[str, str]:
+        """Файлы колонок текущего поколения серии"""
+        generation = self._read_meta(series_dir).get('generation', 0)
+        return {column: self._path(series_dir, column, generation) for column in COLUMNS}
+
+    def _length(self, paths: Dict[str, str]) -> int:
+        """
+        Количество целых строк серии
+
+        После сбоя во время дописывания колонки могут иметь разную длину:
+        учитываются только строки, полностью записанные во все колонки.
+        """
+        lengths = []
+        for column, dtype in COLUMNS.items():
+            path = paths[column]
+            if not os.path.exists(path):
+                return 0
+            lengths.append(os.path.getsize(path) // np.dtype(dtype).itemsize)
+        return min(lengths)
+
+    def _repair(self, paths: Dict[str, str]) -> int:
+        """Обрезка недописанных строк после сбоя"""
+        length = self._length(paths)
+        for column, dtype in COLUMNS.items():
+            path = paths[column]
+            size = length * np.dtype(dtype).itemsize
+            if os.path.exists(path) and os.path.getsize(path) != size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+                logger.warning(f"Хранилище свечей: колонка {path} обрезана до {length} строк")
+        return length
+
+    def _memmap(self, paths: Dict[str, str], column: str, length: int) -> np.ndarray:
+        if length == 0:
+            return np.empty(0, dtype=COLUMNS[column])
+        return np.memmap(paths[column], dtype=COLUMNS[column], mode='r', shape=(length,))
+
+    def count(self, exchange: str, symbol: str, timeframe: str) -> int:
+        """Количество свечей в серии"""
+        return self._length(self._paths(self._series_dir(exchange, symbol, timeframe)))
+
+    def last_timestamp(self, exchange: str, symbol: str, timeframe: str) -> Optional[pd.Timestamp]:
+        """Время последней сохраненной свечи"""
+        paths = self._paths(self._series_dir(exchange, symbol, timeframe))
+        length = self._length(paths)
+        if length == 0:
+            return None
+        timestamps = self._memmap(paths, 'timestamp', length)
+        return pd.Timestamp(int(timestamps[-1]), unit='ms')
+
+    def first_timestamp(self, exchange: str, symbol: str, timeframe: str) -> Optional[pd.Timestamp]:
+        """Время первой сохраненной свечи"""
+        paths = self._paths(self._series_dir(exchange, symbol, timeframe))
+        length = self._length(paths)
+        if length == 0:
+            return None
+        timestamps = self._memmap(paths, 'timestamp', length)
+        return pd.Timestamp(int(timestamps[0]), unit='ms')
+
+    def read_arrays(self, exchange: str, symbol: str, timeframe: str,
+                    start=None, end=None) -> Dict[str, np.ndarray]:
+        """
+        Чтение диапазона свечей без копирования (срезы memory map)
+
+        Args:
+            exchange: Биржа
+            symbol: Торговая пара
+            timeframe: Таймфрейм
+            start: Начало диапазона включительно (Timestamp, строка или мс)
+            end: Конец диапазона включительно
+
+        Returns:
+            Словарь {колонка: массив}
+        """
+        paths = self._paths(self._series_dir(exchange, symbol, timeframe))
+        length = self._length(paths)
+        timestamps = self._memmap(paths, 'timestamp', length)
+
+        lo = 0 if start is None else int(np.searchsorted(timestamps, _to_ms_scalar(start), 'left'))
+        hi = length if end is None else int(np.searchsorted(timestamps, _to_ms_scalar(end), 'right'))
+
+        return {column: self._memmap(paths, column, length)[lo:hi] for column in COLUMNS}
+
+    def read(self, exchange: str, symbol: str, timeframe: str,
+             start=None, end=None) -> pd.DataFrame:
+        """
+        Чтение диапазона свечей в DataFrame
+
+        Returns:
+            DataFrame в формате DataFetcher.get_ohlcv
+        """
+        arrays = self.read_arrays(exchange, symbol, timeframe, start, end)
+        index = pd.DatetimeIndex(pd.to_datetime(np.asarray(arrays['timestamp']), unit='ms'),
+                                 name='timestamp')
+        return pd.DataFrame({column: np.array(values, dtype=float)
+                             for column, values in arrays.items() if column != 'timestamp'},
+                            index=index)
+
+    def tail(self, exchange: str, symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+        """Последние limit свечей серии"""
+        paths = self._paths(self._series_dir(exchange, symbol, timeframe))
+        length = self._length(paths)
+        if length == 0:
+            return self.read(exchange, symbol, timeframe)
+        timestamps = self._memmap(paths, 'timestamp', length)
+        return self.read(exchange, symbol, timeframe, start=int(timestamps[max(0, length - limit)]))
+
+    def write(self, exchange: str, symbol: str, timeframe: str, df: pd.DataFrame) -> int:
+        """
+        Сохранение свечей
+
+        Свечи новее последней сохраненной дописываются в конец файлов.
+        Если среди них есть более старые (например, при загрузке истории),
+        серия объединяется и перезаписывается целиком.
+
+        Args:
+            exchange: Биржа
+            symbol: Торговая пара
+            timeframe: Таймфрейм
+            df: DataFrame с OHLCV данными (индекс - время открытия свечи)
+
+        Returns:
+            Количество новых свечей
+        """
+        if df.empty:
+            return 0
+
+        series_dir = self._series_dir(exchange, symbol, timeframe)
+        os.makedirs(series_dir, exist_ok=True)
+        meta = self._read_meta(series_dir)
+        if meta.get('symbol') != symbol:
+            # Имя каталога не обратимо (BTC/USDT:USDT -> BTC_USDT_USDT) - символ хранится явно
+            meta = {**meta, 'symbol': symbol}
+            self._write_meta(series_dir, meta)
+        paths = self._paths(series_dir)
+        length = self._repair(paths)
+
+        df = df[~df.index.duplicated(keep='last')].sort_index()
+        timestamps = _to_ms(df.index)
+
+        last = int(self._memmap(paths, 'timestamp', length)[-1]) if length else None
+        split = 0 if last is None else int(np.searchsorted(timestamps, last, 'right'))
+
+        # Перекрытие с уже сохраненными свечами (обычно при since=) не требует перезаписи
+        if split == 0 or self._contains_all(paths, length, timestamps[:split]):
+            if split < len(df):
+                self._append(paths, timestamps[split:], df.iloc[split:])
+            return len(df) - split
+
+        return self._merge(series_dir, meta, paths, length, timestamps, df)
+
+    def _append(self, paths: Dict[str, str], timestamps: np.ndarray, df: pd.DataFrame):
+        """Дописывание строк в конец колонок"""
+        for column, dtype in COLUMNS.items():
+            values = timestamps if column == 'timestamp' else df[column].to_numpy()
+            with open(paths[column], 'ab') as f:
+                np.ascontiguousarray(values, dtype=dtype).tofile(f)
+
+    def _write_column(self, path: str, values: np.ndarray, dtype: str):
+        """Запись колонки целиком с fsync"""
+        with open(path, 'wb') as f:
+            np.ascontiguousarray(values, dtype=dtype).tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _contains_all(self, paths: Dict[str, str], length: int, timestamps: np.ndarray) -> bool:
+        stored = self._memmap(paths, 'timestamp', length)
+        positions = np.searchsorted(stored, timestamps)
+        positions = np.minimum(positions, length - 1)
+        return bool(np.all(stored[positions] == timestamps))
+
+    def _merge(self, series_dir: str, meta: Dict, paths: Dict[str, str], length: int,
+               timestamps: np.ndarray, df: pd.DataFrame) -> int:
+        """
+        Объединение с сохраненными данными и атомарная перезапись серии
+
+        Колонки пишутся в файлы следующего поколения, точка фиксации - замена
+        meta.json. До нее читатели и сбой видят старые файлы, после - новые;
+        файлы старого и недописанных поколений затем удаляются.
+        """
+        stored = {column: np.array(self._memmap(paths, column, length))
+                  for column in COLUMNS}
+        incoming = {column: (timestamps if column == 'timestamp' else df[column].to_numpy())
+                    for column in COLUMNS}
+
+        all_timestamps = np.concatenate([stored['timestamp'], incoming['timestamp']])
+        # Новые данные имеют приоритет над сохраненными при совпадении времени
+        order = np.argsort(all_timestamps, kind='stable')[::-1]
+        _, first = np.unique(all_timestamps[order], return_index=True)
+        keep = order[first]  # позиции уникальных свечей по возрастанию времени
+
+        added = len(keep) - length
+        generation = meta.get('generation', 0) + 1
+        new_paths = {column: self._path(series_dir, column, generation) for column in COLUMNS}
+        for column, dtype in COLUMNS.items():
+            merged = np.concatenate([stored[column], incoming[column]])[keep]
+            self._write_column(new_paths[column], merged, dtype)
+        self._write_meta(series_dir, {**meta, 'generation': generation})
+
+        current = set(new_paths.values())
+        for name in os.listdir(series_dir):
+            path = os.path.join(series_dir, name)
+            if name.endswith('.bin') and path not in current:
+                os.remove(path)
+
+        logger.debug(f"Хранилище свечей: серия {series_dir} объединена, новых свечей {added}")
+        return added
+
+    def find_gaps(self, exchange: str, symbol: str, timeframe: str,
+                  start=None, end=None) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Поиск пропусков в серии
+
+        Returns:
+            Список (первая пропущенная свеча, последняя пропущенная свеча)
+        """
+        step = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        timestamps = np.asarray(self.read_arrays(exchange, symbol, timeframe, start, end)['timestamp'])
+        if len(timestamps) < 2:
+            return []
+
+        diffs = np.diff(timestamps)
+        positions = np.nonzero(diffs > step)[0]
+        return [(pd.Timestamp(int(timestamps[i]) + step, unit='ms'),
+                 pd.Timestamp(int(timestamps[i + 1]) - step, unit='ms'))
+                for i in positions]
+
+    def series(self) -> List[Tuple[str, str, str]]:
+        """Список сохраненных серий (биржа, символ, таймфрейм)"""
+        result = []
+        for exchange in sorted(os.listdir(self.root)):
+            exchange_dir = os.path.join(self.root, exchange)
+            if not os.path.isdir(exchange_dir):
+                continue
+            for safe_symbol in sorted(os.listdir(exchange_dir)):
+                symbol_dir = os.path.join(exchange_dir, safe_symbol)
+                for timeframe in sorted(os.listdir(symbol_dir)):
+                    meta = self._read_meta(os.path.join(symbol_dir, timeframe))
+                    # Серии без meta.json: восстановление по имени каталога (верно для BASE/QUOTE)
+                    symbol = meta.get('symbol') or safe_symbol.replace('_', '/', 1)
+                    result.append((exchange, symbol, timeframe))
+        return result
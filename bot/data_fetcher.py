@@ -3,19 +3,185 @@
 Поддерживает Binance и Bybit
 """
 
+import asyncio
+import functools
+import threading
 import ccxt
 import pandas as pd
 from loguru import logger
-from typing import Dict, List
+from typing import Dict, List, Optional
 import time
 from datetime import datetime
 
+from .candle_store import CandleStore
+from .exchange_pool import EXCHANGES, call_exchange, call_exchange_async, str_to_bool
+
+
+def timeframe_to_timedelta(timeframe: str) -> pd.Timedelta:
+    """Длительность свечи для таймфрейма ccxt ('1m', '15m', '1h', ...)"""
+    return pd.Timedelta(seconds=ccxt.Exchange.parse_timeframe(timeframe))
+
+
+def utc_now() -> pd.Timestamp:
+    """Текущее время UTC без часового пояса (как индекс OHLCV данных)"""
+    return pd.Timestamp.now(tz='UTC').tz_localize(None)
+
+
+def drop_forming_candle(df: pd.DataFrame, timeframe: str,
+                        now: pd.Timestamp = None) -> pd.DataFrame:
+    """
+    Удаление еще не закрытой (формирующейся) свечи
+    
+    Args:
+        df: DataFrame с OHLCV данными (индекс - время открытия свечи)
+        timeframe: Таймфрейм
+        now: Текущее время UTC (по умолчанию - системное)
+        
+    Returns:
+        DataFrame только с закрытыми свечами
+    """
+    if df.empty:
+        return df
+    
+    now = now if now is not None else utc_now()
+    close_times = df.index + timeframe_to_timedelta(timeframe)
+    return df[close_times <= now]
+
+
+def ohlcv_to_frame(ohlcv: List[list]) -> pd.DataFrame:
+    """Преобразование ответа fetch_ohlcv в DataFrame"""
+    df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    df.set_index('timestamp', inplace=True)
+    return df
+
+
+def format_ticker(symbol: str, ticker: Dict) -> Dict:
+    """Приведение тикера ccxt к формату бота"""
+    return {
+        'symbol': symbol,
+        'last': ticker['last'],
+        'bid': ticker['bid'],
+        'ask': ticker['ask'],
+        'high': ticker['high'],
+        'low': ticker['low'],
+        'volume': ticker['baseVolume'],
+        'timestamp': datetime.now()
+    }
+
+
+class CandleBuffer:
+    """
+    Буферы свечей по (символ, таймфрейм) для инкрементальной синхронизации
+    
+    Если буфер уже содержит limit свечей, с биржи запрашиваются только
+    свечи начиная с последней сохраненной (since=): она перезаписывается
+    (могла еще формироваться), более новые добавляются в конец.
+    
+    При наличии хранилища пустой буфер заполняется из него, а закрытые
+    свечи сохраняются в хранилище после каждой синхронизации. Методы
+    потокобезопасны: асинхронный загрузчик вызывает их в пуле потоков,
+    чтобы чтение и запись хранилища не блокировали цикл событий.
+    """
+    
+    def __init__(self, store: Optional[CandleStore] = None, exchange_name: str = ""):
+        self._frames: Dict[tuple, pd.DataFrame] = {}
+        self._lock = threading.RLock()
+        self.store = store
+        self.exchange_name = exchange_name
+        self.stats = {'full': 0, 'incremental': 0, 'rows_fetched': 0, 'rows_from_store': 0}
+    
+    def since(self, key: tuple, limit: int) -> Optional[int]:
+        """
+        Время (мс) последней сохраненной свечи, если буфер можно дополнить
+        
+        Returns:
+            Значение since для fetch_ohlcv или None, если нужна полная загрузка
+        """
+        with self._lock:
+            if key not in self._frames and self.store is not None:
+                self._load_from_store(key, limit)
+            
+            buffer = self._frames.get(key)
+        if buffer is None or len(buffer) < limit:
+            return None
+        return int((buffer.index[-1] - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1))
+    
+    def append(self, key: tuple, ohlcv: List[list], limit: int) -> Optional[pd.DataFrame]:
+        """
+        Дополнение буфера свечами, полученными с since=
+        
+        Returns:
+            Последние limit свечей или None, если хвост не стыкуется с буфером
+        """
+        new = ohlcv_to_frame(ohlcv)
+        with self._lock:
+            buffer = self._frames[key]
+            
+            # Полный ответ или разрыв - хвост мог не поместиться, перезагружаем окно
+            if len(new) >= limit or (not new.empty and new.index[0] > buffer.index[-1]):
+                return None
+            
+            size = max(limit, len(buffer))
+            if not new.empty:
+                buffer = pd.concat([buffer[buffer.index < new.index[0]], new])
+            buffer = buffer.iloc[-size:]
+            
+            self._frames[key] = buffer
+            self.stats['incremental'] += 1
+            self.stats['rows_fetched'] += len(new)
+            self._persist(key, new)
+        logger.debug(f"Синхронизировано {len(new)} свечей {key[0]} {key[1]}")
+        return buffer.iloc[-limit:].copy()
+    
+    def reset(self, key: tuple, ohlcv: List[list], limit: int) -> pd.DataFrame:
+        """Полная замена буфера"""
+        buffer = ohlcv_to_frame(ohlcv)
+        with self._lock:
+            self._frames[key] = buffer
+            self.stats['full'] += 1
+            self.stats['rows_fetched'] += len(buffer)
+            self._persist(key, buffer)
+        return buffer.iloc[-limit:].copy()
+    
+    def _load_from_store(self, key: tuple, limit: int):
+        """Заполнение буфера последними свечами из хранилища"""
+        symbol, timeframe = key
+        try:
+            stored = self.store.tail(self.exchange_name, symbol, timeframe, limit)
+        except Exception as e:
+            logger.warning(f"Ошибка чтения хранилища свечей {symbol} {timeframe}: {e}")
+            return
+        
+        if not stored.empty:
+            self._frames[key] = stored
+            self.stats['rows_from_store'] += len(stored)
+            logger.debug(f"Загружено {len(stored)} свечей {symbol} {timeframe} из хранилища")
+    
+    def _persist(self, key: tuple, df: pd.DataFrame):
+        """Сохранение закрытых свечей в хранилище"""
+        if self.store is None or df.empty:
+            return
+        
+        symbol, timeframe = key
+        try:
+            self.store.write(self.exchange_name, symbol, timeframe,
+                             drop_forming_candle(df, timeframe))
+        except Exception as e:
+            logger.warning(f"Ошибка записи в хранилище свечей {symbol} {timeframe}: {e}")
+    
+    def clear(self):
+        """Очистка всех буферов"""
+        with self._lock:
+            self._frames.clear()
+
 
 class DataFetcher:
     """Класс для получения рыночных данных с бирж"""
     
     def __init__(self, exchange_name: str, api_key: str = "", secret: str = "", 
-                 testnet: bool = False, sandbox: bool = False):
+                 testnet: bool = False, sandbox: bool = False,
+                 store: Optional[CandleStore] = None, verify_connection: bool = True):
         """
         Инициализация DataFetcher
         
@@ -25,6 +191,9 @@ class DataFetcher:
             secret: Секретный ключ
             testnet: Использовать тестовую сеть
             sandbox: Использовать песочницу
+            store: Локальное хранилище свечей (необязательно)
+            verify_connection: Проверить подключение сразу (иначе клиент биржи
+                создается при первом обращении, проверка - через check_connection)
         """
         self.exchange_name = exchange_name.lower()
         self.api_key = api_key
@@ -32,78 +201,64 @@ class DataFetcher:
         self.testnet = testnet
         self.sandbox = sandbox
         
-        # Инициализация биржи
-        self.exchange = self._init_exchange()
+        if not hasattr(ccxt, self.exchange_name):
+            raise ValueError(f"Неподдерживаемая биржа: {self.exchange_name}")
+        
+        # Клиент биржи из общего реестра (создается при первом обращении)
+        self._exchange: Optional[ccxt.Exchange] = None
+        self.limiter = EXCHANGES.limiter(self.exchange_name, api_key, testnet)
         
         # Кэш для данных
         self._cache = {}
         self._cache_timeout = 60  # секунд
         
+        # Буферы свечей для инкрементальной синхронизации
+        self.store = store
+        self._candles = CandleBuffer(store, self.exchange_name)
+        self.sync_stats = self._candles.stats
+        
+        if verify_connection:
+            self._exchange = self._init_exchange()
+            self.check_connection()
+    
+    @property
+    def exchange(self) -> ccxt.Exchange:
+        """Клиент биржи"""
+        if self._exchange is None:
+            self._exchange = self._init_exchange()
+        return self._exchange
+        
     def _init_exchange(self) -> ccxt.Exchange:
-        """Инициализация объекта биржи"""
+        """Инициализация объекта биржи (общий клиент аккаунта из реестра)"""
         try:
-            if self.exchange_name == "binance":
-                exchange_class = ccxt.binance
-            elif self.exchange_name == "bybit":
-                exchange_class = ccxt.bybit
-            else:
-                raise ValueError(f"Неподдерживаемая биржа: {self.exchange_name}")
-            
-            # Настройки для биржи
-            config = {
-                'apiKey': self.api_key,
-                'secret': self.secret,
-                'timeout': 30000,
-                'enableRateLimit': True,
-                'options': {
-                    'defaultType': 'spot',  # Spot trading
-                }
-            }
-            
-            # Настройки для тестовой сети
-            if DataFetcher._str_to_bool(self.testnet):
-                if self.exchange_name == "binance":
-                    config['sandbox'] = True
-                    config['urls'] = {
-                        'api': {
-                            'public': 'https://testnet.binance.vision/api',
-                            'private': 'https://testnet.binance.vision/api',
-                        }
-                    }
-                elif self.exchange_name == "bybit":
-                    config['urls'] = {
-                        'api': {
-                            'public': 'https://api-testnet.bybit.com',
-                            'private': 'https://api-testnet.bybit.com',
-                        }
-                    }
-            
-            exchange = exchange_class(config)
-            
-            # Проверка подключения
-            if self.api_key and self.secret:
-                try:
-                    exchange.fetch_balance()
-                    logger.info(f"Успешное подключение к {self.exchange_name}")
-                except Exception as e:
-                    logger.warning(f"Не удалось получить баланс с {self.exchange_name}: {e}")
-            else:
-                logger.info(f"Подключение к {self.exchange_name} в режиме только чтения")
-            
-            return exchange
+            return EXCHANGES.client(self.exchange_name, self.api_key, self.secret, self.testnet)
             
         except Exception as e:
             logger.error(f"Ошибка инициализации биржи {self.exchange_name}: {e}")
             raise
     
+    def check_connection(self) -> bool:
+        """Проверка подключения (запрос баланса при наличии ключей)"""
+        if not (self.api_key and self.secret):
+            logger.info(f"Подключение к {self.exchange_name} в режиме только чтения")
+            return True
+        
+        try:
+            self._call('fetch_balance')
+            logger.info(f"Успешное подключение к {self.exchange_name}")
+            return True
+        except Exception as e:
+            logger.warning(f"Не удалось получить баланс с {self.exchange_name}: {e}")
+            return False
+    
+    def _call(self, method: str, *args, **kwargs):
+        """Вызов метода биржи через общий лимитер веса с учетом в метриках"""
+        return call_exchange(self.exchange, self.limiter, method, *args, **kwargs)
+    
     @staticmethod
     def _str_to_bool(value) -> bool:
         """Преобразование строки в булево значение"""
-        if isinstance(value, bool):
-            return value
-        if isinstance(value, str):
-            return value.lower() in ('true', '1', 'yes', 'on')
-        return bool(value)
+        return str_to_bool(value)
     
     def get_ohlcv(self, symbol: str, timeframe: str = '15m', 
                   limit: int = 100) -> pd.DataFrame:
@@ -131,13 +286,8 @@ class DataFetcher:
         try:
             logger.info(f"Получение данных {symbol} {timeframe} с {self.exchange_name}")
             
-            # Получаем данные
-            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
-            
-            # Преобразуем в DataFrame
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
+            # Получаем данные (только новые свечи, если буфер уже заполнен)
+            df = self._sync_candles(symbol, timeframe, limit)
             
             # Кэшируем данные
             self._cache[cache_key] = (df.copy(), current_time)
@@ -149,6 +299,32 @@ class DataFetcher:
             logger.error(f"Ошибка получения данных {symbol}: {e}")
             raise
     
+    def _sync_candles(self, symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+        """
+        Синхронизация буфера свечей с биржей
+        
+        Args:
+            symbol: Торговая пара
+            timeframe: Таймфрейм
+            limit: Количество свечей
+            
+        Returns:
+            DataFrame с последними limit свечами
+        """
+        key = (symbol, timeframe)
+        df = None
+        
+        since = self._candles.since(key, limit)
+        if since is not None:
+            ohlcv = self._call('fetch_ohlcv', symbol, timeframe, since=since, limit=limit)
+            df = self._candles.append(key, ohlcv, limit)
+        
+        if df is None:
+            ohlcv = self._call('fetch_ohlcv', symbol, timeframe, limit=limit)
+            df = self._candles.reset(key, ohlcv, limit)
+        
+        return df
+    
     def get_ticker(self, symbol: str) -> Dict:
         """
         Получение текущей цены
@@ -160,21 +336,36 @@ class DataFetcher:
             Словарь с информацией о тикере
         """
         try:
-            ticker = self.exchange.fetch_ticker(symbol)
-            return {
-                'symbol': symbol,
-                'last': ticker['last'],
-                'bid': ticker['bid'],
-                'ask': ticker['ask'],
-                'high': ticker['high'],
-                'low': ticker['low'],
-                'volume': ticker['baseVolume'],
-                'timestamp': datetime.now()
-            }
+            ticker = self._call('fetch_ticker', symbol)
+            return format_ticker(symbol, ticker)
         except Exception as e:
             logger.error(f"Ошибка получения тикера {symbol}: {e}")
             raise
     
+    def get_tickers(self, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        Получение тикеров набора символов одним запросом
+        
+        Если биржа не поддерживает fetch_tickers, тикеры запрашиваются по одному.
+        
+        Args:
+            symbols: Список торговых пар
+            
+        Returns:
+            Словарь {символ: тикер}; символы без тикера пропускаются
+        """
+        if not symbols:
+            return {}
+        
+        try:
+            if self.exchange.has.get('fetchTickers'):
+                tickers = self._call('fetch_tickers', symbols)
+                return {symbol: format_ticker(symbol, tickers[symbol]) for symbol in symbols if symbol in tickers}
+            return {symbol: self.get_ticker(symbol) for symbol in symbols}
+        except Exception as e:
+            logger.error(f"Ошибка получения тикеров {len(symbols)} символов: {e}")
+            raise
+    
     def get_balance(self, currency: str = None) -> Dict:
         """
         Получение баланса
@@ -190,7 +381,7 @@ class DataFetcher:
             return {}
         
         try:
-            balance = self.exchange.fetch_balance()
+            balance = self._call('fetch_balance')
             
             if currency:
                 return {
@@ -217,7 +408,7 @@ class DataFetcher:
             Словарь с данными стакана
         """
         try:
-            orderbook = self.exchange.fetch_order_book(symbol, limit)
+            orderbook = self._call('fetch_order_book', symbol, limit)
             return {
                 'bids': orderbook['bids'],
                 'asks': orderbook['asks'],
@@ -239,7 +430,7 @@ class DataFetcher:
             Список последних сделок
         """
         try:
-            trades = self.exchange.fetch_trades(symbol, limit=limit)
+            trades = self._call('fetch_trades', symbol, limit=limit)
             return trades
         except Exception as e:
             logger.error(f"Ошибка получения сделок {symbol}: {e}")
@@ -256,7 +447,7 @@ class DataFetcher:
             True если рынок открыт
         """
         try:
-            markets = self.exchange.load_markets()
+            markets = self._call('load_markets')
             market = markets.get(symbol)
             if market:
                 return market.get('active', True)
@@ -276,7 +467,7 @@ class DataFetcher:
             Словарь с информацией о рынке
         """
         try:
-            markets = self.exchange.load_markets()
+            markets = self._call('load_markets')
             market = markets.get(symbol)
             
             if not market:
@@ -298,9 +489,150 @@ class DataFetcher:
     def clear_cache(self):
         """Очистка кэша"""
         self._cache.clear()
+        self._candles.clear()
         logger.debug("Кэш данных очищен")
 
 
+class AsyncDataFetcher:
+    """
+    Асинхронное получение рыночных данных через ccxt.async_support
+    
+    Запросы не блокируют цикл событий. Все запросы к бирже идут через один
+    клиент ccxt и лимитер веса, общий с синхронным клиентом аккаунта
+    (DataFetcher, TradingEngine), а семафор ограничивает число одновременных
+    запросов.
+    """
+    
+    def __init__(self, exchange_name: str, api_key: str = "", secret: str = "",
+                 testnet: bool = False, max_concurrency: int = 10,
+                 store: Optional[CandleStore] = None):
+        """
+        Инициализация AsyncDataFetcher
+        
+        Args:
+            exchange_name: Название биржи (binance, bybit)
+            api_key: API ключ
+            secret: Секретный ключ
+            testnet: Использовать тестовую сеть
+            max_concurrency: Максимум одновременных запросов к бирже
+            store: Локальное хранилище свечей (необязательно)
+        """
+        self.exchange_name = exchange_name.lower()
+        self.api_key = api_key
+        self.secret = secret
+        self.testnet = testnet
+        
+        # Клиент и лимитер веса - общие для аккаунта (см. ExchangeRegistry)
+        self.exchange = EXCHANGES.async_client(self.exchange_name, api_key, secret, testnet)
+        self.limiter = EXCHANGES.limiter(self.exchange_name, api_key, testnet)
+        
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.store = store
+        self._candles = CandleBuffer(store, self.exchange_name)
+        self.sync_stats = self._candles.stats
+        self._markets = None
+    
+    async def _call(self, method: str, *args, **kwargs):
+        """Вызов метода биржи с ограничением параллельности"""
+        async with self._semaphore:
+            return await call_exchange_async(self.exchange, self.limiter, method, *args, **kwargs)
+    
+    async def _buffer(self, fn, *args):
+        """Операция с буфером свечей (с хранилищем - в пуле потоков, вне цикла событий)"""
+        if self.store is None:
+            return fn(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(fn, *args))
+    
+    async def get_ohlcv(self, symbol: str, timeframe: str = '15m',
+                        limit: int = 100) -> pd.DataFrame:
+        """
+        Получение OHLCV данных (с инкрементальной синхронизацией буфера)
+        
+        Args:
+            symbol: Торговая пара
+            timeframe: Таймфрейм
+            limit: Количество свечей
+            
+        Returns:
+            DataFrame с колонками: open, high, low, close, volume
+        """
+        key = (symbol, timeframe)
+        df = None
+        
+        try:
+            since = await self._buffer(self._candles.since, key, limit)
+            if since is not None:
+                ohlcv = await self._call('fetch_ohlcv', symbol, timeframe, since=since, limit=limit)
+                df = await self._buffer(self._candles.append, key, ohlcv, limit)
+            
+            if df is None:
+                ohlcv = await self._call('fetch_ohlcv', symbol, timeframe, limit=limit)
+                df = await self._buffer(self._candles.reset, key, ohlcv, limit)
+            
+            logger.debug(f"Получено {len(df)} свечей для {symbol} {timeframe}")
+            return df
+            
+        except Exception as e:
+            logger.error(f"Ошибка получения данных {symbol}: {e}")
+            raise
+    
+    async def get_ticker(self, symbol: str) -> Dict:
+        """Получение текущей цены"""
+        try:
+            ticker = await self._call('fetch_ticker', symbol)
+            return format_ticker(symbol, ticker)
+        except Exception as e:
+            logger.error(f"Ошибка получения тикера {symbol}: {e}")
+            raise
+    
+    async def get_orderbook(self, symbol: str, limit: int = 20) -> Dict:
+        """Получение стакана заявок"""
+        try:
+            orderbook = await self._call('fetch_order_book', symbol, limit)
+            return {
+                'bids': orderbook['bids'],
+                'asks': orderbook['asks'],
+                'timestamp': orderbook['timestamp']
+            }
+        except Exception as e:
+            logger.error(f"Ошибка получения стакана {symbol}: {e}")
+            raise
+    
+    async def get_server_time(self) -> int:
+        """Время сервера биржи в миллисекундах"""
+        return await self._call('fetch_time')
+    
+    async def check_connection(self) -> bool:
+        """Проверка подключения (запрос баланса при наличии ключей)"""
+        if not (self.api_key and self.secret):
+            logger.info(f"Подключение к {self.exchange_name} в режиме только чтения")
+            return True
+        
+        try:
+            await self._call('fetch_balance')
+            logger.info(f"Успешное подключение к {self.exchange_name}")
+            return True
+        except Exception as e:
+            logger.warning(f"Не удалось получить баланс с {self.exchange_name}: {e}")
+            return False
+    
+    async def load_markets(self) -> Dict:
+        """Загрузка информации о рынках (кэшируется клиентом ccxt)"""
+        if self._markets is None:
+            self._markets = await self._call('load_markets')
+            EXCHANGES.share_markets(self.exchange_name, self.api_key, self.testnet)
+        return self._markets
+    
+    def clear_cache(self):
+        """Очистка буферов свечей"""
+        self._candles.clear()
+    
+    async def close(self):
+        """Закрытие HTTP сессии клиента"""
+        await EXCHANGES.close_async(self.exchange_name, self.api_key, self.testnet)
+
+
 class DataManager:
     """Менеджер для работы с несколькими источниками данных"""
     
@@ -313,11 +645,33 @@ class DataManager:
         """
         self.config = config
         self.fetchers = {}
+        self.async_fetchers: Dict[str, AsyncDataFetcher] = {}
         self.default_exchange = config.get('trading', {}).get('default_exchange', 'binance')
+        self.max_concurrent_requests = config.get('trading', {}).get('max_concurrent_requests', 10)
+        
+        # Локальное хранилище свечей
+        self.store = self._init_store()
+        
+        # Лимиты запросов общего пула клиентов бирж
+        EXCHANGES.configure(config.get('exchanges', {}))
         
         # Инициализируем биржи
         self._init_exchanges()
     
+    def _init_store(self) -> Optional[CandleStore]:
+        """Инициализация хранилища свечей из конфигурации"""
+        store_config = self.config.get('candle_store', {})
+        if not str_to_bool(store_config.get('enabled', False)):
+            return None
+        
+        try:
+            store = CandleStore(store_config.get('path', 'data/candles'))
+            logger.info(f"Хранилище свечей: {store.root}")
+            return store
+        except Exception as e:
+            logger.error(f"Ошибка инициализации хранилища свечей: {e}")
+            return None
+    
     def _init_exchanges(self):
         """Инициализация бирж из конфигурации"""
         exchanges_config = self.config.get('exchanges', {})
@@ -329,7 +683,9 @@ class DataManager:
                         exchange_name=exchange_name,
                         api_key=exchange_config.get('api_key', ''),
                         secret=exchange_config.get('secret_key', ''),
-                        testnet=exchange_config.get('testnet', False)
+                        testnet=exchange_config.get('testnet', False),
+                        store=self.store,
+                        verify_connection=False  # проверка - асинхронно в check_connections
                     )
                     self.fetchers[exchange_name] = fetcher
                     logger.info(f"Инициализирована биржа: {exchange_name}")
@@ -358,6 +714,119 @@ class DataManager:
         
         return self.fetchers[exchange].get_ohlcv(symbol, timeframe, limit)
     
+    def get_closed_data(self, symbol: str, timeframe: str = '15m',
+                        limit: int = 100, exchange: str = None) -> pd.DataFrame:
+        """
+        Получение только закрытых свечей
+        
+        Последняя свеча биржи обычно еще формируется: она отбрасывается,
+        чтобы анализ не срабатывал повторно на меняющемся баре.
+        
+        Args:
+            symbol: Торговая пара
+            timeframe: Таймфрейм
+            limit: Количество закрытых свечей
+            exchange: Название биржи (если None, используется дефолтная)
+            
+        Returns:
+            DataFrame с OHLCV данными закрытых свечей
+        """
+        df = self.get_data(symbol, timeframe, limit + 1, exchange)
+        df = drop_forming_candle(df, timeframe)
+        return df.iloc[-limit:]
+    
+    def _get_async_fetcher(self, exchange: str = None) -> AsyncDataFetcher:
+        """Асинхронный клиент биржи (создается при первом обращении)"""
+        if exchange is None:
+            exchange = self.default_exchange
+        
+        if exchange not in self.fetchers:
+            raise ValueError(f"Биржа {exchange} не инициализирована")
+        
+        if exchange not in self.async_fetchers:
+            exchange_config = self.config.get('exchanges', {}).get(exchange, {})
+            self.async_fetchers[exchange] = AsyncDataFetcher(
+                exchange_name=exchange,
+                api_key=exchange_config.get('api_key', ''),
+                secret=exchange_config.get('secret_key', ''),
+                testnet=exchange_config.get('testnet', False),
+                max_concurrency=self.max_concurrent_requests,
+                store=self.store
+            )
+        return self.async_fetchers[exchange]
+    
+    async def get_data_async(self, symbol: str, timeframe: str = '15m',
+                             limit: int = 100, exchange: str = None) -> pd.DataFrame:
+        """Асинхронное получение данных (не блокирует цикл событий)"""
+        fetcher = self._get_async_fetcher(exchange)
+        return await fetcher.get_ohlcv(symbol, timeframe, limit)
+    
+    async def get_closed_data_async(self, symbol: str, timeframe: str = '15m',
+                                    limit: int = 100, exchange: str = None) -> pd.DataFrame:
+        """Асинхронное получение только закрытых свечей"""
+        df = await self.get_data_async(symbol, timeframe, limit + 1, exchange)
+        df = drop_forming_candle(df, timeframe)
+        return df.iloc[-limit:]
+    
+    async def get_data_many(self, requests: List[tuple], limit: int = 100,
+                            closed_only: bool = False) -> Dict[tuple, pd.DataFrame]:
+        """
+        Параллельное получение данных для набора серий
+        
+        Args:
+            requests: Список (symbol, timeframe) или (symbol, timeframe, exchange)
+            limit: Количество свечей
+            closed_only: Отбрасывать формирующуюся свечу
+            
+        Returns:
+            Словарь {запрос: DataFrame}; серии с ошибкой в результат не попадают
+        """
+        get = self.get_closed_data_async if closed_only else self.get_data_async
+        
+        async def fetch(request: tuple) -> pd.DataFrame:
+            symbol, timeframe, *rest = request
+            exchange = rest[0] if rest else None
+            return await get(symbol, timeframe, limit, exchange)
+        
+        results = await asyncio.gather(*(fetch(request) for request in requests),
+                                       return_exceptions=True)
+        
+        data = {}
+        for request, result in zip(requests, results):
+            if isinstance(result, Exception):
+                logger.error(f"Ошибка получения данных {request}: {result}")
+            else:
+                data[tuple(request)] = result
+        
+        logger.info(f"Получены данные для {len(data)}/{len(requests)} серий")
+        return data
+    
+    async def get_ticker_async(self, symbol: str, exchange: str = None) -> Dict:
+        """Асинхронное получение тикера"""
+        return await self._get_async_fetcher(exchange).get_ticker(symbol)
+    
+    async def get_server_time_async(self, exchange: str = None) -> int:
+        """Время сервера биржи в миллисекундах"""
+        return await self._get_async_fetcher(exchange).get_server_time()
+    
+    async def check_connections(self) -> Dict[str, bool]:
+        """
+        Параллельная проверка подключения ко всем биржам
+        
+        Returns:
+            Словарь {биржа: подключение успешно}
+        """
+        names = list(self.fetchers)
+        results = await asyncio.gather(*(self._get_async_fetcher(name).check_connection() for name in names),
+                                       return_exceptions=True)
+        return {name: result is True for name, result in zip(names, results)}
+    
+    async def close(self):
+        """Закрытие асинхронных клиентов бирж"""
+        for fetcher in self.async_fetchers.values():
+            await fetcher.close()
+        self.async_fetchers.clear()
+    
     def get_ticker(self, symbol: str, exchange: str = None) -> Dict:
         """Получение тикера"""
         if exchange is None:
@@ -368,6 +837,16 @@ class DataManager:
         
         return self.fetchers[exchange].get_ticker(symbol)
     
+    def get_tickers(self, symbols: List[str], exchange: str = None) -> Dict[str, Dict]:
+        """Получение тикеров набора символов одним запросом"""
+        if exchange is None:
+            exchange = self.default_exchange
+        
+        if exchange not in self.fetchers:
+            raise ValueError(f"Биржа {exchange} не инициализирована")
+        
+        return self.fetchers[exchange].get_tickers(symbols)
+    
     def get_balance(self, currency: str = None, exchange: str = None) -> Dict:
         """Получение баланса"""
         if exchange is None:
@@ -386,3 +865,5 @@ class DataManager:
         """Очистка кэша всех бирж"""
         for fetcher in self.fetchers.values():
             fetcher.clear_cache()
+        for fetcher in self.async_fetchers.values():
+            fetcher.clear_cache()
@@ -0,0 +1,213 @@
+"""
+База данных сделок, позиций и сигналов (SQLite)
+Используется TradingEngine при database.type: sqlite
+"""
+
+import json
+import sqlite3
+from typing import Dict, Iterable, Iterator, List
+
+from loguru import logger
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id TEXT PRIMARY KEY,
+    symbol TEXT NOT NULL,
+    side TEXT NOT NULL,
+    amount REAL NOT NULL,
+    price REAL NOT NULL,
+    timestamp TEXT NOT NULL,
+    exchange TEXT NOT NULL,
+    order_id TEXT,
+    status TEXT NOT NULL DEFAULT 'filled',
+    fee REAL NOT NULL DEFAULT 0,
+    pnl REAL
+);
+CREATE INDEX IF NOT EXISTS idx_trades_symbol_timestamp ON trades (symbol, timestamp);
+CREATE INDEX IF NOT EXISTS idx_trades_side_pnl ON trades (side, pnl);
+
+CREATE TABLE IF NOT EXISTS positions (
+    symbol TEXT PRIMARY KEY,
+    side TEXT NOT NULL,
+    amount REAL NOT NULL,
+    entry_price REAL NOT NULL,
+    entry_time TEXT NOT NULL,
+    current_price REAL NOT NULL,
+    unrealized_pnl REAL NOT NULL,
+    exchange TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS signals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol TEXT NOT NULL,
+    signal_type TEXT NOT NULL,
+    price REAL NOT NULL,
+    timestamp TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    reason TEXT,
+    filters_passed TEXT,
+    indicators_data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_signals_symbol_timestamp ON signals (symbol, timestamp);
+"""
+
+TRADE_COLUMNS = ('id', 'symbol', 'side', 'amount', 'price', 'timestamp', 'exchange',
+                 'order_id', 'status', 'fee', 'pnl')
+POSITION_COLUMNS = ('symbol', 'side', 'amount', 'entry_price', 'entry_time',
+                    'current_price', 'unrealized_pnl', 'exchange')
+SIGNAL_COLUMNS = ('symbol', 'signal_type', 'price', 'timestamp', 'confidence', 'reason',
+                  'filters_passed', 'indicators_data')
+
+# Запросы с параметрами: текст запроса постоянный, sqlite3 кэширует подготовленные выражения
+INSERT_TRADE = (f"INSERT OR REPLACE INTO trades ({', '.join(TRADE_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(TRADE_COLUMNS))})")
+SELECT_RECENT_TRADES = (f"SELECT {', '.join(TRADE_COLUMNS)} FROM trades "
+                        f"ORDER BY rowid DESC LIMIT ?")
+SELECT_TRADE_COUNT = "SELECT COUNT(*) FROM trades"
+SELECT_TRADE_PNL = "SELECT side, pnl FROM trades ORDER BY rowid"
+UPSERT_POSITION = (f"INSERT OR REPLACE INTO positions ({', '.join(POSITION_COLUMNS)}) "
+                   f"VALUES ({', '.join('?' * len(POSITION_COLUMNS))})")
+DELETE_POSITION = "DELETE FROM positions WHERE symbol = ?"
+SELECT_POSITIONS = f"SELECT {', '.join(POSITION_COLUMNS)} FROM positions"
+INSERT_SIGNAL = (f"INSERT INTO signals ({', '.join(SIGNAL_COLUMNS)}) "
+                 f"VALUES ({', '.join('?' * len(SIGNAL_COLUMNS))})")
+SELECT_SIGNAL_STATS = "SELECT signal_type, confidence FROM signals ORDER BY id"
+SELECT_RECENT_SIGNALS = (f"SELECT {', '.join(SIGNAL_COLUMNS)} FROM signals "
+                         f"ORDER BY id DESC LIMIT ?")
+
+
+class TradeDatabase:
+    """
+    Хранилище сделок, позиций и сигналов в SQLite
+
+    Сделки и сигналы копятся в буфере и записываются пачками
+    (executemany в одной транзакции) по batch_size записей; перед любым
+    чтением буфер сбрасывается. Статистика и последние сделки
+    запрашиваются из базы, история целиком в память не загружается.
+    """
+
+    def __init__(self, path: str = 'trades.db', batch_size: int = 1):
+        """
+        Инициализация базы данных
+
+        Args:
+            path: Путь к файлу SQLite
+            batch_size: Размер пачки записи (1 - каждая сделка фиксируется сразу)
+        """
+        self.path = path
+        self.batch_size = max(1, batch_size)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+        self._pending_trades: List[tuple] = []
+        self._pending_signals: List[tuple] = []
+
+        logger.info(f"База данных сделок: {path}")
+
+    # Сделки
+
+    def add_trade(self, trade: Dict):
+        """Добавление сделки (словарь в формате Trade.to_dict)"""
+        self._pending_trades.append(tuple(trade.get(column) for column in TRADE_COLUMNS))
+        if len(self._pending_trades) >= self.batch_size:
+            self.flush()
+
+    def add_trades(self, trades: Iterable[Dict]):
+        """Пакетная запись сделок (например, результатов бэктеста)"""
+        rows = (tuple(trade.get(column) for column in TRADE_COLUMNS) for trade in trades)
+        with self._conn:
+            self._conn.executemany(INSERT_TRADE, rows)
+
+    def get_trades(self, limit: int = 50) -> List[Dict]:
+        """
+        Последние сделки
+
+        Args:
+            limit: Количество сделок (0 - все)
+
+        Returns:
+            Список словарей сделок в хронологическом порядке
+        """
+        self.flush()
+        rows = self._conn.execute(SELECT_RECENT_TRADES, (limit if limit > 0 else -1,)).fetchall()
+        return [dict(zip(TRADE_COLUMNS, row)) for row in reversed(rows)]
+
+    def count_trades(self) -> int:
+        """Количество сделок"""
+        self.flush()
+        return self._conn.execute(SELECT_TRADE_COUNT).fetchone()[0]
+
+    def iter_trade_pnl(self) -> Iterator[tuple]:
+        """Потоковое чтение (side, pnl) всех сделок в порядке записи"""
+        self.flush()
+        yield from self._conn.execute(SELECT_TRADE_PNL)
+
+    # Позиции
+
+    def save_position(self, position: Dict):
+        """Сохранение (замена) позиции по символу"""
+        with self._conn:
+            self._conn.execute(UPSERT_POSITION, tuple(position.get(column) for column in POSITION_COLUMNS))
+
+    def delete_position(self, symbol: str):
+        """Удаление закрытой позиции"""
+        with self._conn:
+            self._conn.execute(DELETE_POSITION, (symbol,))
+
+    def load_positions(self) -> List[Dict]:
+        """Открытые позиции"""
+        return [dict(zip(POSITION_COLUMNS, row)) for row in self._conn.execute(SELECT_POSITIONS)]
+
+    # Сигналы
+
+    def add_signal(self, signal: Dict):
+        """Добавление сигнала (filters_passed и indicators_data сохраняются как JSON)"""
+        row = dict(signal)
+        row['filters_passed'] = json.dumps(row.get('filters_passed') or {})
+        row['indicators_data'] = json.dumps(row.get('indicators_data') or {})
+        self._pending_signals.append(tuple(row.get(column) for column in SIGNAL_COLUMNS))
+        if len(self._pending_signals) >= self.batch_size:
+            self.flush()
+
+    def get_signals(self, limit: int = 50) -> List[Dict]:
+        """Последние сигналы в хронологическом порядке"""
+        self.flush()
+        rows = self._conn.execute(SELECT_RECENT_SIGNALS, (limit if limit > 0 else -1,)).fetchall()
+        signals = []
+        for row in reversed(rows):
+            signal = dict(zip(SIGNAL_COLUMNS, row))
+            signal['filters_passed'] = json.loads(signal['filters_passed'] or '{}')
+            signal['indicators_data'] = json.loads(signal['indicators_data'] or '{}')
+            signals.append(signal)
+        return signals
+
+    def iter_signal_stats(self) -> Iterator[tuple]:
+        """Потоковое чтение (signal_type, confidence) всех сигналов в порядке записи"""
+        self.flush()
+        yield from self._conn.execute(SELECT_SIGNAL_STATS)
+
+    # Общее
+
+    def flush(self):
+        """Запись накопленных сделок и сигналов одной транзакцией"""
+        if not self._pending_trades and not self._pending_signals:
+            return
+        with self._conn:
+            if self._pending_trades:
+                self._conn.executemany(INSERT_TRADE, self._pending_trades)
+            if self._pending_signals:
+                self._conn.executemany(INSERT_SIGNAL, self._pending_signals)
+        self._pending_trades.clear()
+        self._pending_signals.clear()
+
+    def close(self):
+        """Запись буфера и закрытие соединения"""
+        try:
+            self.flush()
+        finally:
+            self._conn.close()
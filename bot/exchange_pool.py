@@ -0,0 +1,391 @@
+"""
+Общий пул клиентов бирж
+Один клиент ccxt на биржу и аккаунт для получения данных и торговли, общий лимитер веса запросов
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import ccxt
+import ccxt.async_support as ccxt_async
+from loguru import logger
+
+from .metrics import (EXCHANGE_RATE_LIMIT_WAIT_SECONDS, EXCHANGE_REQUEST_ERRORS,
+                      EXCHANGE_REQUEST_SECONDS, REGISTRY)
+
+
+# Методы ccxt, размещающие или изменяющие ордера (приоритетные запросы)
+ORDER_METHOD_PREFIXES = ('create_', 'cancel_', 'edit_')
+
+# Лимиты по умолчанию (переопределяются в exchanges.<биржа>.rate_limit)
+DEFAULT_RATE_LIMITS = {
+    'binance': {
+        'weight_limit': 6000,  # вес запросов за окно
+        'window': 60,  # секунды
+        'weight_header': 'x-mbx-used-weight-1m',  # израсходованный вес по данным биржи
+        'weights': {
+            'fetch_ohlcv': 2,
+            'fetch_ticker': 2,
+            'fetch_tickers': 80,
+            'fetch_order_book': 5,
+            'fetch_trades': 25,
+            'fetch_balance': 20,
+            'load_markets': 20,
+        },
+    },
+    'bybit': {
+        'weight_limit': 600,
+        'window': 5,
+        'weights': {},
+    },
+}
+
+# Ключ клиента: (биржа, API ключ, тестовая сеть)
+ClientKey = Tuple[str, str, bool]
+
+
+def str_to_bool(value) -> bool:
+    """Преобразование строки в булево значение"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value.lower() in ('true', '1', 'yes', 'on')
+    return bool(value)
+
+
+def build_exchange_config(exchange_name: str, api_key: str = "", secret: str = "",
+                          testnet=False) -> Dict:
+    """
+    Настройки ccxt для биржи (общие для синхронного и асинхронного клиента)
+
+    Встроенный троттлинг ccxt отключен: частоту запросов ограничивает
+    общий WeightLimiter реестра (call_exchange).
+
+    Args:
+        exchange_name: Название биржи (binance, bybit)
+        api_key: API ключ
+        secret: Секретный ключ
+        testnet: Использовать тестовую сеть
+
+    Returns:
+        Словарь настроек для конструктора биржи ccxt
+    """
+    if exchange_name not in ('binance', 'bybit'):
+        raise ValueError(f"Неподдерживаемая биржа: {exchange_name}")
+
+    # Настройки для биржи
+    config = {
+        'apiKey': api_key,
+        'secret': secret,
+        'timeout': 30000,
+        'enableRateLimit': False,  # лимит - WeightLimiter
+        'options': {
+            'defaultType': 'spot',  # Spot trading
+        }
+    }
+
+    # Настройки для тестовой сети
+    if str_to_bool(testnet):
+        if exchange_name == "binance":
+            config['sandbox'] = True
+            config['urls'] = {
+                'api': {
+                    'public': 'https://testnet.binance.vision/api',
+                    'private': 'https://testnet.binance.vision/api',
+                }
+            }
+        elif exchange_name == "bybit":
+            config['urls'] = {
+                'api': {
+                    'public': 'https://api-testnet.bybit.com',
+                    'private': 'https://api-testnet.bybit.com',
+                }
+            }
+
+    return config
+
+
+def is_order_method(method: str) -> bool:
+    """Метод размещает или изменяет ордер"""
+    return method.startswith(ORDER_METHOD_PREFIXES)
+
+
+class WeightLimiter:
+    """
+    Лимитер веса запросов к бирже (token bucket)
+
+    Бюджет weight_limit восстанавливается равномерно за window секунд.
+    Запросы данных оставляют резерв order_reserve для ордеров и ждут, пока
+    ждет хотя бы один ордер; ордерам достаточно собственного веса. Если
+    биржа сообщает израсходованный вес в заголовке ответа, доступный бюджет
+    уменьшается до него (учитываются и запросы других процессов с того же IP).
+    Лимитер потокобезопасен: им пользуются и пул потоков, и цикл событий.
+    """
+
+    def __init__(self, name: str, weight_limit: float = 1200, window: float = 60,
+                 order_reserve: float = 0.1, weights: Optional[Dict[str, float]] = None,
+                 weight_header: Optional[str] = None):
+        """
+        Инициализация лимитера
+
+        Args:
+            name: Название биржи (для метрик)
+            weight_limit: Вес запросов за окно
+            window: Окно, секунды
+            order_reserve: Доля веса, недоступная запросам данных
+            weights: Вес методов ccxt (по умолчанию - 1)
+            weight_header: Заголовок ответа с израсходованным весом
+        """
+        self.name = name
+        self.capacity = float(weight_limit)
+        self.rate = self.capacity / window
+        self.reserve = self.capacity * order_reserve
+        self.weights = weights or {}
+        self.weight_header = weight_header
+
+        self._available = self.capacity
+        self._updated = time.monotonic()
+        self._orders_waiting = 0
+        self._lock = threading.Lock()
+
+    def weight(self, method: str) -> float:
+        """Вес запроса"""
+        return min(float(self.weights.get(method, 1)), self.capacity)
+
+    @property
+    def available(self) -> float:
+        """Доступный вес"""
+        with self._lock:
+            self._refill()
+            return self._available
+
+    def _refill(self):
+        now = time.monotonic()
+        self._available = min(self.capacity, self._available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _try_acquire(self, method: str, order: bool) -> float:
+        """Списание веса; 0 - успешно, иначе время ожидания, секунды"""
+        cost = self.weight(method)
+        with self._lock:
+            self._refill()
+            if order:
+                need = cost
+            elif self._orders_waiting:
+                return cost / self.rate
+            else:
+                need = min(cost + self.reserve, self.capacity)
+
+            if self._available >= need:
+                self._available -= cost
+                return 0.0
+            return (need - self._available) / self.rate
+
+    def _set_waiting(self, order: bool, delta: int):
+        if order:
+            with self._lock:
+                self._orders_waiting += delta
+
+    def acquire(self, method: str):
+        """Ожидание веса для запроса (блокирует поток)"""
+        order = is_order_method(method)
+        delay = self._try_acquire(method, order)
+        if not delay:
+            return
+
+        started = time.perf_counter()
+        self._set_waiting(order, 1)
+        try:
+            while delay:
+                time.sleep(min(delay, 1.0))
+                delay = self._try_acquire(method, order)
+        finally:
+            self._set_waiting(order, -1)
+            self._record_wait(order, time.perf_counter() - started)
+
+    async def acquire_async(self, method: str):
+        """Ожидание веса для запроса (не блокирует цикл событий)"""
+        order = is_order_method(method)
+        delay = self._try_acquire(method, order)
+        if not delay:
+            return
+
+        started = time.perf_counter()
+        self._set_waiting(order, 1)
+        try:
+            while delay:
+                await asyncio.sleep(min(delay, 1.0))
+                delay = self._try_acquire(method, order)
+        finally:
+            self._set_waiting(order, -1)
+            self._record_wait(order, time.perf_counter() - started)
+
+    def _record_wait(self, order: bool, seconds: float):
+        kind = 'order' if order else 'data'
+        EXCHANGE_RATE_LIMIT_WAIT_SECONDS.labels(self.name, kind).inc(seconds)
+        if seconds >= 1:
+            logger.warning(f"Лимит запросов {self.name}: {kind}-запрос ждал {seconds:.1f} с")
+
+    def observe_headers(self, headers: Optional[Dict]):
+        """Учет израсходованного веса из заголовков последнего ответа биржи"""
+        if not self.weight_header or not headers:
+            return
+
+        try:
+            used = float(headers.get(self.weight_header))
+        except (TypeError, ValueError):
+            return
+
+        with self._lock:
+            self._refill()
+            self._available = min(self._available, self.capacity - used)
+
+
+def call_exchange(client: ccxt.Exchange, limiter: WeightLimiter, method: str, *args, **kwargs):
+    """Вызов метода синхронного клиента через лимитер с учетом длительности и ошибок в метриках"""
+    limiter.acquire(method)
+    started = time.perf_counter()
+    try:
+        return getattr(client, method)(*args, **kwargs)
+    except Exception:
+        EXCHANGE_REQUEST_ERRORS.labels(limiter.name, method).inc()
+        raise
+    finally:
+        EXCHANGE_REQUEST_SECONDS.labels(limiter.name, method).observe(time.perf_counter() - started)
+        limiter.observe_headers(client.last_response_headers)
+
+
+async def call_exchange_async(client: Any, limiter: WeightLimiter, method: str, *args, **kwargs):
+    """Вызов метода асинхронного клиента через лимитер с учетом длительности и ошибок в метриках"""
+    await limiter.acquire_async(method)
+    started = time.perf_counter()
+    try:
+        return await getattr(client, method)(*args, **kwargs)
+    except Exception:
+        EXCHANGE_REQUEST_ERRORS.labels(limiter.name, method).inc()
+        raise
+    finally:
+        EXCHANGE_REQUEST_SECONDS.labels(limiter.name, method).observe(time.perf_counter() - started)
+        limiter.observe_headers(client.last_response_headers)
+
+
+class ExchangeRegistry:
+    """
+    Реестр клиентов бирж
+
+    На каждую пару (биржа, аккаунт) создается один синхронный клиент
+    (общий для DataFetcher и TradingEngine - одна HTTP сессия и одно
+    соединение), один асинхронный клиент для AsyncDataFetcher и один
+    лимитер веса на оба клиента. Загруженные рынки передаются между
+    клиентами, повторный load_markets не нужен.
+    """
+
+    def __init__(self):
+        self._clients: Dict[ClientKey, ccxt.Exchange] = {}
+        self._async_clients: Dict[ClientKey, Any] = {}
+        self._limiters: Dict[ClientKey, WeightLimiter] = {}
+        self._settings: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+        REGISTRY.register_collector('exchange_weight_available', 'Доступный вес запросов к бирже',
+                                    'gauge', self._collect_weight)
+
+    @staticmethod
+    def key(exchange_name: str, api_key: str = "", testnet=False) -> ClientKey:
+        """Ключ клиента"""
+        return exchange_name.lower(), api_key or "", str_to_bool(testnet)
+
+    def configure(self, exchanges_config: Dict):
+        """
+        Настройки лимитов из конфигурации (до создания лимитеров)
+
+        Args:
+            exchanges_config: Секция exchanges из config.yaml
+        """
+        for exchange_name, exchange_config in exchanges_config.items():
+            self._settings[exchange_name.lower()] = exchange_config.get('rate_limit') or {}
+
+    def client(self, exchange_name: str, api_key: str = "", secret: str = "",
+               testnet=False) -> ccxt.Exchange:
+        """Синхронный клиент биржи (создается при первом обращении)"""
+        key = self.key(exchange_name, api_key, testnet)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                config = build_exchange_config(key[0], api_key, secret, testnet)
+                client = self._clients[key] = getattr(ccxt, key[0])(config)
+                self._share_markets(self._async_clients.get(key), client)
+                logger.debug(f"Создан клиент {key[0]}{' (testnet)' if key[2] else ''}")
+        return client
+
+    def async_client(self, exchange_name: str, api_key: str = "", secret: str = "",
+                     testnet=False) -> Any:
+        """Асинхронный клиент биржи (создается при первом обращении)"""
+        key = self.key(exchange_name, api_key, testnet)
+        with self._lock:
+            client = self._async_clients.get(key)
+            if client is None:
+                config = build_exchange_config(key[0], api_key, secret, testnet)
+                client = self._async_clients[key] = getattr(ccxt_async, key[0])(config)
+                self._share_markets(self._clients.get(key), client)
+                logger.debug(f"Создан асинхронный клиент {key[0]}{' (testnet)' if key[2] else ''}")
+        return client
+
+    def limiter(self, exchange_name: str, api_key: str = "", testnet=False) -> WeightLimiter:
+        """Лимитер веса запросов (общий для клиентов одного аккаунта)"""
+        key = self.key(exchange_name, api_key, testnet)
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                settings = {**DEFAULT_RATE_LIMITS.get(key[0], {}), **self._settings.get(key[0], {})}
+                weights = {**DEFAULT_RATE_LIMITS.get(key[0], {}).get('weights', {}),
+                           **(self._settings.get(key[0], {}).get('weights') or {})}
+                limiter = self._limiters[key] = WeightLimiter(
+                    name=key[0],
+                    weight_limit=settings.get('weight_limit', 1200),
+                    window=settings.get('window', 60),
+                    order_reserve=settings.get('order_reserve', 0.1),
+                    weights=weights,
+                    weight_header=settings.get('weight_header'),
+                )
+        return limiter
+
+    def share_markets(self, exchange_name: str, api_key: str = "", testnet=False):
+        """Передача загруженных рынков между синхронным и асинхронным клиентом"""
+        key = self.key(exchange_name, api_key, testnet)
+        sync_client, async_client = self._clients.get(key), self._async_clients.get(key)
+        self._share_markets(sync_client, async_client)
+        self._share_markets(async_client, sync_client)
+
+    @staticmethod
+    def _share_markets(source: Any, target: Any):
+        if source is None or target is None or not source.markets or target.markets:
+            return
+        try:
+            target.set_markets(source.markets, source.currencies)
+        except Exception as e:
+            logger.warning(f"Не удалось передать рынки {source.id}: {e}")
+
+    async def close_async(self, exchange_name: str, api_key: str = "", testnet=False):
+        """Закрытие HTTP сессии асинхронного клиента"""
+        key = self.key(exchange_name, api_key, testnet)
+        with self._lock:
+            client = self._async_clients.pop(key, None)
+        if client is None:
+            return
+
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning(f"Ошибка закрытия клиента {key[0]}: {e}")
+
+    def _collect_weight(self):
+        for (exchange_name, _, testnet), limiter in list(self._limiters.items()):
+            yield 'exchange_weight_available', {'exchange': exchange_name,
+                                                'testnet': str(testnet).lower()}, limiter.available
+
+
+# Общий реестр клиентов процесса
+EXCHANGES = ExchangeRegistry()
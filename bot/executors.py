@@ -0,0 +1,169 @@
+"""
+Пулы исполнения блокирующих этапов торгового цикла
+Запросы к бирже и базе данных - в пул потоков, расчет индикаторов - в пул процессов
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+from loguru import logger
+
+from .indicators import TechnicalIndicators
+
+
+# Калькулятор индикаторов процесса-воркера (создается в инициализаторе)
+_worker_indicators: Optional[TechnicalIndicators] = None
+
+
+def _init_cpu_worker(config: Dict):
+    """Инициализация воркера: калькулятор индикаторов создается один раз на процесс"""
+    global _worker_indicators
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    _worker_indicators = TechnicalIndicators(config)
+
+
+def _warm_up() -> bool:
+    """Пустая задача для запуска воркеров заранее"""
+    return True
+
+
+def _calculate_indicators(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """Расчет индикаторов в воркере (результат и статистика промежуточных величин)"""
+    result = _worker_indicators.calculate_all_indicators(df)
+    return result, _worker_indicators.get_intermediate_stats()
+
+
+class StageExecutors:
+    """
+    Исполнители этапов цикла с таймаутами
+
+    run_io выполняет функцию в пуле потоков, run_cpu - в пуле процессов
+    (при cpu_workers: 0 - тоже в пуле потоков), run_engine - в отдельном
+    потоке торгового движка. Цикл событий при этом продолжает обслуживать
+    health server и отправку уведомлений. По таймауту ожидание прерывается
+    с asyncio.TimeoutError; задача, еще не начавшая выполняться, отменяется,
+    а уже запущенная в потоке дорабатывает в фоне (потоки Python нельзя
+    прервать принудительно).
+    """
+
+    def __init__(self, config: Dict):
+        """
+        Инициализация исполнителей
+
+        Args:
+            config: Конфигурация из config.yaml (секция executors)
+        """
+        self.config = config
+        executors_config = config.get('executors', {})
+        self.io_workers = executors_config.get('io_workers', 4)
+        self.cpu_workers = executors_config.get('cpu_workers', 0)
+        self.timeouts = executors_config.get('timeouts', {})
+        self.default_timeout = executors_config.get('default_timeout', 60)
+
+        self.io = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix='bot-io')
+        # Один поток: вызовы движка (позиции, база данных) не выполняются одновременно,
+        # в том числе когда этап, прерванный по таймауту, еще дорабатывает
+        self.engine = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bot-engine')
+        self._cpu: Optional[ProcessPoolExecutor] = None
+
+        logger.info(f"Пулы исполнения: {self.io_workers} потоков, "
+                    f"{self.cpu_workers or 'без'} процессов для расчетов")
+
+    @property
+    def cpu(self) -> ProcessPoolExecutor:
+        """Пул процессов (создается при первом обращении)"""
+        if self._cpu is None:
+            # spawn: процесс не наследует потоки и соединения бота
+            self._cpu = ProcessPoolExecutor(max_workers=self.cpu_workers,
+                                            mp_context=multiprocessing.get_context('spawn'),
+                                            initializer=_init_cpu_worker,
+                                            initargs=(self.config,))
+        return self._cpu
+
+    def warm_up(self):
+        """Запуск процессов-воркеров в фоне (импорт модулей не задерживает первый цикл)"""
+        if self.cpu_workers > 0:
+            for _ in range(self.cpu_workers):
+                self.cpu.submit(_warm_up)
+
+    def _timeout(self, stage: Optional[str], timeout: Optional[float]) -> Optional[float]:
+        if timeout is not None:
+            return timeout
+        return self.timeouts.get(stage, self.default_timeout) if stage else self.default_timeout
+
+    async def _run(self, executor, stage: Optional[str], timeout: Optional[float],
+                   fn: Callable, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+        timeout = self._timeout(stage, timeout)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Этап {stage or getattr(fn, '__name__', fn)} не завершился за {timeout} с")
+            raise
+
+    async def run_io(self, fn: Callable, *args, stage: Optional[str] = None,
+                     timeout: Optional[float] = None, **kwargs):
+        """
+        Выполнение блокирующей функции (запросы к бирже, база данных) в пуле потоков
+
+        Args:
+            fn: Функция
+            stage: Этап цикла (для таймаута из executors.timeouts)
+            timeout: Таймаут, секунды (по умолчанию - из конфигурации)
+        """
+        return await self._run(self.io, stage, timeout, fn, *args, **kwargs)
+
+    async def run_engine(self, fn: Callable, *args, stage: Optional[str] = None,
+                         timeout: Optional[float] = None, **kwargs):
+        """
+        Выполнение метода торгового движка в его отдельном потоке (вызовы выполняются по очереди)
+
+        Args:
+            fn: Функция
+            stage: Этап цикла (для таймаута из executors.timeouts)
+            timeout: Таймаут, секунды (по умолчанию - из конфигурации)
+        """
+        return await self._run(self.engine, stage, timeout, fn, *args, **kwargs)
+
+    async def run_cpu(self, fn: Callable, *args, stage: Optional[str] = None,
+                      timeout: Optional[float] = None, **kwargs):
+        """
+        Выполнение вычислений в пуле процессов (аргументы и результат должны сериализоваться pickle)
+
+        Args:
+            fn: Функция уровня модуля
+            stage: Этап цикла (для таймаута из executors.timeouts)
+            timeout: Таймаут, секунды (по умолчанию - из конфигурации)
+        """
+        executor = self.cpu if self.cpu_workers > 0 else self.io
+        return await self._run(executor, stage, timeout, fn, *args, **kwargs)
+
+    async def calculate_indicators(self, indicators: TechnicalIndicators, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Полный расчет индикаторов вне цикла событий
+
+        В пуле процессов расчет выполняет калькулятор воркера, статистика
+        промежуточных величин переносится в indicators.
+        """
+        if self.cpu_workers <= 0:
+            return await self.run_io(indicators.calculate_all_indicators, df, stage='indicators')
+
+        result, stats = await self.run_cpu(_calculate_indicators, df, stage='indicators')
+        indicators.last_intermediate_stats = stats
+        return result
+
+    def shutdown(self):
+        """Остановка пулов (ожидающие задачи отменяются)"""
+        self.io.shutdown(wait=False, cancel_futures=True)
+        self.engine.shutdown(wait=False, cancel_futures=True)
+        if self._cpu is not None:
+            self._cpu.shutdown(wait=False, cancel_futures=True)
+            self._cpu = None
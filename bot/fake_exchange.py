@@ -0,0 +1,83 @@
+"""
+Локальная биржа для тестов загрузки истории
+Синтетические свечи по fetch_ohlcv(since=) с внедряемыми ошибками, без сети
+"""
+
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import ccxt
+
+
+class FakeExchange:
+    """
+    Имитация клиента ccxt для fetch_ohlcv
+
+    Свечи детерминированы временем открытия (одинаковы при любом разбиении
+    на страницы), страница не длиннее page_limit свечей, свечи позже now_ms
+    не отдаются. fail(since) заставляет запрос с этим since завершиться
+    ошибкой ccxt.NetworkError заданное число раз. Все запросы
+    записываются в requests.
+    """
+
+    id = 'fake'
+    last_response_headers = None
+
+    def __init__(self, now_ms: Optional[int] = None, page_limit: int = 1000):
+        """
+        Инициализация биржи
+
+        Args:
+            now_ms: Текущее время биржи в мс (по умолчанию - без ограничения)
+            page_limit: Максимум свечей в ответе
+        """
+        self.now_ms = now_ms
+        self.page_limit = page_limit
+        self.requests: List[Tuple[str, str, int, int]] = []
+        self._failures: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def parse_timeframe(timeframe: str) -> int:
+        return ccxt.Exchange.parse_timeframe(timeframe)
+
+    @staticmethod
+    def candle(timestamp: int) -> list:
+        """Синтетическая свеча [время, open, high, low, close, volume]"""
+        phase = timestamp / 3_600_000
+        open_ = 100 + 10 * math.sin(phase / 24)
+        close = 100 + 10 * math.sin((phase + 1) / 24)
+        return [timestamp, open_, max(open_, close) + 0.5, min(open_, close) - 0.5, close,
+                1000 + (timestamp // 60_000) % 500]
+
+    def fail(self, since: int, times: int = 1):
+        """Ошибка для следующих times запросов с данным since"""
+        with self._lock:
+            self._failures[since] = self._failures.get(since, 0) + times
+
+    def reset_requests(self):
+        with self._lock:
+            self.requests.clear()
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = '1m', since: Optional[int] = None,
+                    limit: Optional[int] = None, params: Optional[Dict] = None) -> List[list]:
+        """Страница свечей начиная с since (выровненного по таймфрейму)"""
+        step = self.parse_timeframe(timeframe) * 1000
+        limit = min(limit or self.page_limit, self.page_limit)
+
+        with self._lock:
+            self.requests.append((symbol, timeframe, since, limit))
+            if self._failures.get(since):
+                self._failures[since] -= 1
+                raise ccxt.NetworkError(f"fake: ошибка запроса since={since}")
+
+        if since is None:
+            since = (self.now_ms or 0) - limit * step
+        first = -(-since // step) * step
+        candles = []
+        for timestamp in range(first, first + limit * step, step):
+            if self.now_ms is not None and timestamp > self.now_ms:
+                break
+            candles.append(self.candle(timestamp))
+        return candles
@@ -0,0 +1,207 @@
+"""
+Панель индикаторов для нескольких символов
+Все индикаторы рассчитываются сразу для всего набора символов (symbols × bars)
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .indicators import IndicatorConfig
+
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+class IndicatorPanel:
+    """
+    Результат расчета индикаторов для набора символов
+
+    Каждая колонка (open, close, EMA_9, ADX, ...) хранится как DataFrame
+    bars × symbols. Имена колонок совпадают с calculate_all_indicators,
+    поэтому frame(symbol) можно передавать в get_filter_signals и
+    TradingStrategy.analyze_market без изменений.
+    """
+
+    def __init__(self, columns: Dict[str, pd.DataFrame],
+                 indicators_config: Dict[str, IndicatorConfig]):
+        """
+        Инициализация панели
+
+        Args:
+            columns: Словарь {колонка: DataFrame bars × symbols}
+            indicators_config: Конфигурация индикаторов
+        """
+        self.columns = columns
+        self.indicators_config = indicators_config
+
+        close = columns['close']
+        self.index = close.index
+        self.symbols: List[str] = list(close.columns)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __getitem__(self, column: str) -> pd.DataFrame:
+        return self.columns[column]
+
+    def column_names(self) -> List[str]:
+        """Список колонок в порядке calculate_all_indicators"""
+        return list(self.columns.keys())
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """
+        DataFrame одного символа в формате calculate_all_indicators
+
+        Args:
+            symbol: Торговая пара
+
+        Returns:
+            DataFrame с OHLCV и индикаторами
+        """
+        data = {name: values[symbol] for name, values in self.columns.items()}
+        return pd.DataFrame(data, index=self.index)
+
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        """DataFrame для каждого символа"""
+        return {symbol: self.frame(symbol) for symbol in self.symbols}
+
+    def values_at(self, index: int = -1) -> pd.DataFrame:
+        """
+        Значения всех колонок на одном баре
+
+        Args:
+            index: Индекс бара (-1 для последнего)
+
+        Returns:
+            DataFrame symbols × колонки
+        """
+        data = {name: values.iloc[index] for name, values in self.columns.items()}
+        return pd.DataFrame(data, index=self.symbols)
+
+    def get_ema_cross_signals(self, index: int = -1) -> pd.Series:
+        """
+        Сигналы пересечения EMA для всех символов
+
+        Args:
+            index: Индекс бара
+
+        Returns:
+            Series symbol -> 'BUY' / 'SELL' / 'HOLD'
+        """
+        config = self.indicators_config['ema']
+        fast = self.columns[f"EMA_{config.params['fast']}"].to_numpy()
+        slow = self.columns[f"EMA_{config.params['slow']}"].to_numpy()
+
+        signals = np.full(len(self.symbols), 'HOLD', dtype=object)
+        if len(self.index) < 2:
+            return pd.Series(signals, index=self.symbols)
+
+        current_fast, current_slow = fast[index], slow[index]
+        prev_fast, prev_slow = fast[index - 1], slow[index - 1]
+
+        # Быстрая EMA пересекает медленную снизу вверх / сверху вниз
+        buy = (prev_fast <= prev_slow) & (current_fast > current_slow)
+        sell = (prev_fast >= prev_slow) & (current_fast < current_slow)
+        signals[buy] = 'BUY'
+        signals[sell & ~buy] = 'SELL'
+
+        return pd.Series(signals, index=self.symbols)
+
+    def get_filter_signals(self, index: int = -1) -> pd.DataFrame:
+        """
+        Сигналы фильтров для всех символов (аналог get_filter_signals)
+
+        Args:
+            index: Индекс бара
+
+        Returns:
+            DataFrame symbols × фильтры с булевыми значениями
+        """
+        def last(column: str) -> np.ndarray:
+            return self.columns[column].to_numpy()[index]
+
+        signals = {}
+        config = self.indicators_config
+
+        # Сравнения с NaN дают False, как и проверки на None в get_filter_signals
+        if config['adx'].enabled:
+            signals['adx'] = last('ADX') > config['adx'].params['min_threshold']
+
+        if config['macd'].enabled:
+            signals['macd'] = last('MACD') > last('MACD_SIGNAL')
+
+        if config['rsi'].enabled:
+            rsi = last('RSI')
+            signals['rsi'] = ((config['rsi'].params['oversold'] < rsi) &
+                              (rsi < config['rsi'].params['overbought']))
+
+        if config['tsi'].enabled:
+            signals['tsi'] = last('TSI') > 0
+
+        if config['kdj'].enabled:
+            signals['kdj'] = last('KDJ_K') > last('KDJ_D')
+
+        if config['vwap'].enabled:
+            signals['vwap'] = last('close') > last('VWAP')
+
+        if config['atr'].enabled:
+            signals['atr'] = last('ATR') < last('close') * 0.05
+
+        return pd.DataFrame(signals, index=self.symbols, dtype=bool)
+
+
+def build_panel_input(symbols: Sequence[str], open_: np.ndarray, high: np.ndarray,
+                      low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+                      index: Optional[Sequence] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Подготовка входных данных панели из массивов symbols × bars
+
+    Args:
+        symbols: Список символов (строки массивов)
+        open_, high, low, close, volume: Массивы формы (symbols, bars)
+        index: Метки времени баров (необязательно)
+
+    Returns:
+        Словарь {колонка: DataFrame bars × symbols}
+    """
+    arrays = [open_, high, low, close, volume]
+    shape = np.shape(close)
+    if len(shape) != 2 or shape[0] != len(symbols):
+        raise ValueError(f"Ожидается массив формы (symbols, bars), получено {shape}")
+
+    panel = {}
+    for name, values in zip(OHLCV_COLUMNS, arrays):
+        values = np.asarray(values, dtype=float)
+        if values.shape != shape:
+            raise ValueError(f"Неверная форма массива {name}: {values.shape} != {shape}")
+        panel[name] = pd.DataFrame(values.T, index=index, columns=list(symbols))
+    return panel
+
+
+def build_panel_from_frames(frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    Подготовка входных данных панели из OHLCV DataFrame по символам
+
+    Все DataFrame должны иметь одинаковый индекс времени.
+
+    Args:
+        frames: Словарь {symbol: DataFrame с OHLCV}
+
+    Returns:
+        Словарь {колонка: DataFrame bars × symbols}
+    """
+    if not frames:
+        raise ValueError("Нет данных для построения панели")
+
+    index = next(iter(frames.values())).index
+    for symbol, df in frames.items():
+        if not df.index.equals(index):
+            raise ValueError(f"Индекс времени {symbol} не совпадает с остальными символами")
+
+    return {
+        name: pd.DataFrame({symbol: df[name].to_numpy(dtype=float)
+                            for symbol, df in frames.items()}, index=index)
+        for name in OHLCV_COLUMNS
+    }
@@ -6,7 +6,7 @@
 import pandas as pd
 import numpy as np
 from loguru import logger
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 
@@ -18,6 +18,111 @@ class IndicatorConfig:
     params: Dict
 
 
+@dataclass
+class IndicatorSpec:
+    """Описание индикатора в реестре"""
+    name: str
+    method: str  # Метод TechnicalIndicators, рассчитывающий индикатор
+    requires: List[str]  # Используемые промежуточные величины
+
+
+# Реестр индикаторов: порядок совпадает с порядком колонок результата
+INDICATOR_REGISTRY: Dict[str, IndicatorSpec] = {
+    'ema': IndicatorSpec('ema', '_calculate_ema', ['ema']),
+    'adx': IndicatorSpec('adx', '_calculate_adx', ['high_low', 'true_range_mean']),
+    'macd': IndicatorSpec('macd', '_calculate_macd', ['ema']),
+    'rsi': IndicatorSpec('rsi', '_calculate_rsi', ['price_change']),
+    'tsi': IndicatorSpec('tsi', '_calculate_tsi', ['price_change']),
+    'kdj': IndicatorSpec('kdj', '_calculate_kdj', []),
+    'vwap': IndicatorSpec('vwap', '_calculate_vwap', ['typical_price']),
+    'atr': IndicatorSpec('atr', '_calculate_atr', ['true_range_mean']),
+}
+
+
+class IntermediateCache:
+    """
+    Промежуточные величины одного расчета индикаторов
+    
+    Каждая величина рассчитывается один раз и переиспользуется всеми
+    индикаторами. Зависимости между величинами задаются в GRAPH и
+    разрешаются перед расчетом самой величины.
+    """
+    
+    # Граф зависимостей: величина -> величины, от которых она зависит
+    GRAPH: Dict[str, List[str]] = {
+        'prev_close': [],
+        'price_change': [],
+        'high_low': [],
+        'true_range': ['high_low', 'prev_close'],
+        'true_range_mean': ['true_range'],  # параметр: длина окна
+        'typical_price': [],
+        'ema': [],  # параметр: период EMA по close
+    }
+    
+    def __init__(self, data):
+        """
+        Args:
+            data: DataFrame или словарь колонок с OHLCV данными
+        """
+        self.data = data
+        self._values = {}
+        self.computed = 0
+        self.reused = 0
+    
+    def get(self, name: str, *params):
+        """
+        Получение промежуточной величины
+        
+        Args:
+            name: Название величины из GRAPH
+            params: Параметры величины (например, период EMA)
+            
+        Returns:
+            Series (или DataFrame для панели) со значениями
+        """
+        key = (name,) + params
+        if key in self._values:
+            self.reused += 1
+            return self._values[key]
+        
+        if name not in self.GRAPH:
+            raise KeyError(f"Неизвестная промежуточная величина: {name}")
+        
+        value = getattr(self, f"_compute_{name}")(*params)
+        self._values[key] = value
+        self.computed += 1
+        return value
+    
+    def _compute_prev_close(self):
+        return self.data['close'].shift()
+    
+    def _compute_price_change(self):
+        return self.data['close'].diff()
+    
+    def _compute_high_low(self):
+        return self.data['high'] - self.data['low']
+    
+    def _compute_true_range(self):
+        high_low = self.get('high_low')
+        prev_close = self.get('prev_close')
+        high_close = np.abs(self.data['high'] - prev_close)
+        low_close = np.abs(self.data['low'] - prev_close)
+        return np.maximum(high_low, np.maximum(high_close, low_close))
+    
+    def _compute_true_range_mean(self, length: int):
+        return self.get('true_range').rolling(window=length).mean()
+    
+    def _compute_typical_price(self):
+        return (self.data['high'] + self.data['low'] + self.data['close']) / 3
+    
+    def _compute_ema(self, span: int):
+        return self.data['close'].ewm(span=span).mean()
+    
+    def stats(self) -> Dict[str, int]:
+        """Статистика использования промежуточных величин"""
+        return {'computed': self.computed, 'reused': self.reused}
+
+
 class TechnicalIndicators:
     """Класс для расчета технических индикаторов"""
     
@@ -31,6 +136,12 @@ class TechnicalIndicators:
         self.config = config
         self.indicators_config = self._parse_indicators_config()
         
+        # Потоковые калькуляторы по ключу серии (биржа/символ/таймфрейм)
+        self._streams = {}
+        
+        # Статистика промежуточных величин последнего расчета
+        self.last_intermediate_stats = {'computed': 0, 'reused': 0}
+        
     def _parse_indicators_config(self) -> Dict[str, IndicatorConfig]:
         """Парсинг конфигурации индикаторов"""
         indicators = {}
@@ -131,67 +242,166 @@ class TechnicalIndicators:
         Returns:
             DataFrame с добавленными индикаторами
         """
-        result_df = df.copy()
-        
         try:
-            # EMA (всегда рассчитывается)
-            result_df = self._calculate_ema(result_df)
-            
-            # Остальные индикаторы (если включены)
-            for indicator_name, config in self.indicators_config.items():
-                if indicator_name == 'ema':
-                    continue  # EMA уже рассчитан
-                    
-                if config.enabled:
-                    try:
-                        if indicator_name == 'adx':
-                            result_df = self._calculate_adx(result_df)
-                        elif indicator_name == 'macd':
-                            result_df = self._calculate_macd(result_df)
-                        elif indicator_name == 'rsi':
-                            result_df = self._calculate_rsi(result_df)
-                        elif indicator_name == 'tsi':
-                            result_df = self._calculate_tsi(result_df)
-                        elif indicator_name == 'kdj':
-                            result_df = self._calculate_kdj(result_df)
-                        elif indicator_name == 'vwap':
-                            result_df = self._calculate_vwap(result_df)
-                        elif indicator_name == 'atr':
-                            result_df = self._calculate_atr(result_df)
-                            
-                        logger.debug(f"Рассчитан индикатор: {indicator_name}")
-                    except Exception as e:
-                        logger.error(f"Ошибка расчета индикатора {indicator_name}: {e}")
-            
-            return result_df
+            return self._apply_indicators(df.copy())
             
         except Exception as e:
             logger.error(f"Ошибка расчета индикаторов: {e}")
             return df
     
-    def _calculate_ema(self, df: pd.DataFrame) -> pd.DataFrame:
+    def calculate_panel(self, symbols: List[str], open_: np.ndarray, high: np.ndarray,
+                        low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+                        index=None):
+        """
+        Расчет всех включенных индикаторов сразу для набора символов
+        
+        Args:
+            symbols: Список символов
+            open_, high, low, close, volume: Массивы формы (symbols, bars)
+            index: Метки времени баров (необязательно)
+            
+        Returns:
+            IndicatorPanel с колонками calculate_all_indicators для каждого символа
+        """
+        from .indicator_panel import IndicatorPanel, build_panel_input
+        
+        panel = build_panel_input(symbols, open_, high, low, close, volume, index)
+        return IndicatorPanel(self._apply_indicators(panel), self.indicators_config)
+    
+    def calculate_panel_from_frames(self, frames: Dict[str, pd.DataFrame]):
+        """
+        Расчет индикаторов для набора символов из OHLCV DataFrame
+        
+        Args:
+            frames: Словарь {symbol: DataFrame с OHLCV}, индексы должны совпадать
+            
+        Returns:
+            IndicatorPanel объект
+        """
+        from .indicator_panel import IndicatorPanel, build_panel_from_frames
+        
+        panel = build_panel_from_frames(frames)
+        return IndicatorPanel(self._apply_indicators(panel), self.indicators_config)
+    
+    def _apply_indicators(self, data):
+        """
+        Последовательный расчет EMA и включенных индикаторов
+        
+        Колонки в data могут быть как Series (один символ), так и
+        DataFrame bars × symbols (панель): операции pandas в методах
+        _calculate_* работают одинаково в обоих случаях.
+        """
+        cache = IntermediateCache(data)
+        
+        # EMA (всегда рассчитывается)
+        data = self._calculate_ema(data, cache)
+        
+        # Остальные индикаторы (если включены)
+        for indicator_name, config in self.indicators_config.items():
+            if indicator_name == 'ema':
+                continue  # EMA уже рассчитан
+                
+            if config.enabled:
+                try:
+                    spec = INDICATOR_REGISTRY[indicator_name]
+                    data = getattr(self, spec.method)(data, cache)
+                    logger.debug(f"Рассчитан индикатор: {indicator_name}")
+                except Exception as e:
+                    logger.error(f"Ошибка расчета индикатора {indicator_name}: {e}")
+        
+        self.last_intermediate_stats = cache.stats()
+        logger.debug(f"Промежуточные величины: рассчитано {cache.computed}, "
+                     f"переиспользовано {cache.reused}")
+        
+        return data
+    
+    def create_stream(self, history: int = 200):
+        """
+        Создание потокового калькулятора с текущей конфигурацией
+        
+        Args:
+            history: Сколько последних строк хранить для DataFrame
+            
+        Returns:
+            StreamingIndicators объект
+        """
+        from .streaming_indicators import StreamingIndicators
+        return StreamingIndicators(self.indicators_config, history)
+    
+    def calculate_incremental(self, df: pd.DataFrame, stream_key: str) -> pd.DataFrame:
+        """
+        Инкрементальный расчет индикаторов по закрытым свечам
+        
+        В поток добавляются только свечи новее последней обработанной,
+        поэтому на каждый цикл приходится O(1) работы на новую свечу.
+        Если новые данные не стыкуются с потоком (нет последней обработанной
+        свечи или ее OHLCV изменились - биржа пересчитала свечу), поток
+        строится заново.
+        
+        Рекуррентные EMA (EMA, MACD, TSI) начинаются с первой свечи потока,
+        а не с первой свечи окна df, как в calculate_all_indicators: значения
+        отличаются на затухающую поправку начального значения (заметную
+        только для первых нескольких периодов после перезапуска потока).
+        
+        Args:
+            df: DataFrame с OHLCV данными закрытых свечей
+            stream_key: Ключ серии (например, 'binance:BTC/USDT:15m')
+            
+        Returns:
+            DataFrame с индикаторами (последние строки потока)
+        """
+        if df.empty:
+            return df
+        
+        try:
+            stream = self._streams.get(stream_key)
+            if stream is None or not self._stream_matches(stream, df):
+                stream = self.create_stream(history=max(len(df), 200))
+                self._streams[stream_key] = stream
+            
+            stream.update_from_frame(df)
+            return stream.to_frame()
+            
+        except Exception as e:
+            logger.error(f"Ошибка инкрементального расчета индикаторов: {e}")
+            self._streams.pop(stream_key, None)
+            return self.calculate_all_indicators(df)
+    
+    @staticmethod
+    def _stream_matches(stream, df: pd.DataFrame) -> bool:
+        """Стыковка данных с потоком: последняя свеча потока есть в df и не изменилась"""
+        last_timestamp = stream.last_timestamp
+        if last_timestamp is None or last_timestamp not in df.index:
+            return False
+        
+        bar = df.loc[last_timestamp, stream.OHLCV_COLUMNS]
+        if isinstance(bar, pd.DataFrame):  # дубликаты времени свечи
+            return False
+        return np.allclose(bar.to_numpy(dtype=float), stream.last_ohlcv, rtol=1e-12, atol=0.0, equal_nan=True)
+    
+    def _calculate_ema(self, df: pd.DataFrame,
+                       cache: Optional[IntermediateCache] = None) -> pd.DataFrame:
         """Расчет EMA"""
+        cache = cache or IntermediateCache(df)
         config = self.indicators_config['ema']
         fast = config.params['fast']
         slow = config.params['slow']
         
-        df[f'EMA_{fast}'] = df['close'].ewm(span=fast).mean()
-        df[f'EMA_{slow}'] = df['close'].ewm(span=slow).mean()
+        df[f'EMA_{fast}'] = cache.get('ema', fast)
+        df[f'EMA_{slow}'] = cache.get('ema', slow)
         
         return df
     
-    def _calculate_adx(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _calculate_adx(self, df: pd.DataFrame,
+                       cache: Optional[IntermediateCache] = None) -> pd.DataFrame:
         """Расчет ADX (упрощенная версия)"""
+        cache = cache or IntermediateCache(df)
         config = self.indicators_config['adx']
         length = config.params['length']
         
         # Упрощенный расчет ADX
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
-        
-        true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-        atr = true_range.rolling(window=length).mean()
+        high_low = cache.get('high_low')
+        atr = cache.get('true_range_mean', length)
         
         # Простой ADX как отношение волатильности к ATR
         df['ADX'] = (high_low.rolling(window=length).std() / atr) * 100
@@ -200,15 +410,17 @@ class TechnicalIndicators:
         
         return df
     
-    def _calculate_macd(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _calculate_macd(self, df: pd.DataFrame,
+                        cache: Optional[IntermediateCache] = None) -> pd.DataFrame:
         """Расчет MACD"""
+        cache = cache or IntermediateCache(df)
         config = self.indicators_config['macd']
         fast = config.params['fast']
         slow = config.params['slow']
         signal = config.params['signal']
         
-        ema_fast = df['close'].ewm(span=fast).mean()
-        ema_slow = df['close'].ewm(span=slow).mean()
+        ema_fast = cache.get('ema', fast)
+        ema_slow = cache.get('ema', slow)
         
         df['MACD'] = ema_fast - ema_slow
         df['MACD_SIGNAL'] = df['MACD'].ewm(span=signal).mean()
@@ -216,12 +428,14 @@ class TechnicalIndicators:
         
         return df
     
-    def _calculate_rsi(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _calculate_rsi(self, df: pd.DataFrame,
+                       cache: Optional[IntermediateCache] = None) -> pd.DataFrame:
         """Расчет RSI"""
+        cache = cache or IntermediateCache(df)
         config = self.indicators_config['rsi']
         length = config.params['length']
         
-        delta = df['close'].diff()
+        delta = cache.get('price_change')
         gain = (delta.where(delta > 0, 0)).rolling(window=length).mean()
         loss = (-delta.where(delta < 0, 0)).rolling(window=length).mean()
         
@@ -230,14 +444,16 @@ class TechnicalIndicators:
         
         return df
     
-    def _calculate_tsi(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _calculate_tsi(self, df: pd.DataFrame,
+                       cache: Optional[IntermediateCache] = None) -> pd.DataFrame:
         """Расчет TSI (True Strength Index)"""
+        cache = cache or IntermediateCache(df)
         config = self.indicators_config['tsi']
         long = config.params['long']
         short = config.params['short']
         
         # TSI = 100 * (EMA(EMA(price_change, short), long) / EMA(EMA(abs(price_change), short), long))
-        price_change = df['close'].diff()
+        price_change = cache.get('price_change')
         ema1 = price_change.ewm(span=short).mean()
         ema2 = ema1.ewm(span=long).mean()
         ema3 = np.abs(price_change).ewm(span=short).mean()
@@ -247,7 +463,8 @@ class TechnicalIndicators:
         
         return df
     
-    def _calculate_kdj(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _calculate_kdj(self, df: pd.DataFrame,
+                       cache: Optional[IntermediateCache] = None) -> pd.DataFrame:
         """Расчет KDJ"""
         config = self.indicators_config['kdj']
         period = config.params['period']
@@ -265,29 +482,28 @@ class TechnicalIndicators:
         
         return df
     
-    def _calculate_vwap(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _calculate_vwap(self, df: pd.DataFrame,
+                        cache: Optional[IntermediateCache] = None) -> pd.DataFrame:
         """Расчет VWAP"""
+        cache = cache or IntermediateCache(df)
         config = self.indicators_config['vwap']
         period = config.params['period']
         
         # VWAP = Σ(Price * Volume) / Σ(Volume) для заданного периода
-        typical_price = (df['high'] + df['low'] + df['close']) / 3
+        typical_price = cache.get('typical_price')
         df['VWAP'] = (typical_price * df['volume']).rolling(window=period).sum() / df['volume'].rolling(window=period).sum()
         
         return df
     
-    def _calculate_atr(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _calculate_atr(self, df: pd.DataFrame,
+                       cache: Optional[IntermediateCache] = None) -> pd.DataFrame:
         """Расчет ATR"""
+        cache = cache or IntermediateCache(df)
         config = self.indicators_config['atr']
         length = config.params['length']
         multiplier = config.params['multiplier']
         
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
-        
-        true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-        df['ATR'] = true_range.rolling(window=length).mean()
+        df['ATR'] = cache.get('true_range_mean', length)
         df['ATR_UPPER'] = df['close'] + (df['ATR'] * multiplier)
         df['ATR_LOWER'] = df['close'] - (df['ATR'] * multiplier)
         
@@ -415,6 +631,75 @@ class TechnicalIndicators:
         
         return signals
     
+    def get_ema_cross_arrays(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Сигналы пересечения EMA для всех баров (аналог get_ema_cross_signal)
+        
+        Args:
+            df: DataFrame с EMA
+            
+        Returns:
+            Булевы массивы (BUY, SELL) по барам; на первом баре сигнала нет
+        """
+        config = self.indicators_config['ema']
+        fast = df[f"EMA_{config.params['fast']}"].to_numpy(dtype=float)
+        slow = df[f"EMA_{config.params['slow']}"].to_numpy(dtype=float)
+        
+        buy = np.zeros(len(df), dtype=bool)
+        sell = np.zeros(len(df), dtype=bool)
+        
+        # Сравнения с NaN дают False, как и в get_ema_cross_signal
+        buy[1:] = (fast[:-1] <= slow[:-1]) & (fast[1:] > slow[1:])
+        sell[1:] = (fast[:-1] >= slow[:-1]) & (fast[1:] < slow[1:])
+        return buy, sell
+    
+    def get_filter_signal_arrays(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Сигналы фильтров для всех баров (аналог get_filter_signals)
+        
+        Args:
+            df: DataFrame с индикаторами
+            
+        Returns:
+            Словарь {фильтр: булев массив по барам}
+        """
+        def column(name: str) -> np.ndarray:
+            if name in df.columns:
+                return df[name].to_numpy(dtype=float)
+            return np.full(len(df), np.nan)
+        
+        signals = {}
+        config = self.indicators_config
+        
+        if config['adx'].enabled:
+            signals['adx'] = column('ADX') > config['adx'].params['min_threshold']
+        
+        if config['macd'].enabled:
+            signals['macd'] = column('MACD') > column('MACD_SIGNAL')
+        
+        if config['rsi'].enabled:
+            rsi = column('RSI')
+            signals['rsi'] = ((config['rsi'].params['oversold'] < rsi) &
+                              (rsi < config['rsi'].params['overbought']))
+        
+        if config['tsi'].enabled:
+            signals['tsi'] = column('TSI') > 0
+        
+        if config['kdj'].enabled:
+            signals['kdj'] = column('KDJ_K') > column('KDJ_D')
+        
+        if config['vwap'].enabled:
+            signals['vwap'] = column('close') > column('VWAP')
+        
+        if config['atr'].enabled:
+            signals['atr'] = column('ATR') < column('close') * 0.05
+        
+        return signals
+    
+    def get_intermediate_stats(self) -> Dict[str, int]:
+        """Сколько промежуточных величин рассчитано и переиспользовано в последнем расчете"""
+        return dict(self.last_intermediate_stats)
+    
     def get_enabled_indicators(self) -> List[str]:
         """Получение списка включенных индикаторов"""
         return [name for name, config in self.indicators_config.items() 
@@ -424,4 +709,5 @@ class TechnicalIndicators:
         """Обновление конфигурации индикаторов"""
         self.config = new_config
         self.indicators_config = self._parse_indicators_config()
+        self._streams.clear()
         logger.info("Конфигурация индикаторов обновлена")
@@ -0,0 +1,176 @@
+"""
+Замеры длительности этапов торгового цикла
+Скользящие гистограммы по этапам (p50/p95/p99) и тайминги текущего цикла
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Sequence
+
+import numpy as np
+
+from .metrics import CYCLE_STAGE_SECONDS
+
+
+# Этапы цикла в порядке выполнения (для вывода в лог)
+CYCLE_STAGES = ('fetch', 'indicators', 'strategy', 'execute', 'positions', 'notifications')
+PERCENTILES = (50, 95, 99)
+
+
+class RollingHistogram:
+    """Последние window замеров (мс) с расчетом перцентилей"""
+
+    __slots__ = ('_values', 'count', 'total')
+
+    def __init__(self, window: int = 1000):
+        self._values = deque(maxlen=window)
+        self.count = 0  # замеров за все время
+        self.total = 0.0
+
+    def add(self, value: float):
+        self._values.append(value)
+        self.count += 1
+        self.total += value
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def percentiles(self, ps: Sequence[float] = PERCENTILES) -> Dict[str, float]:
+        """Перцентили по окну ({'p50': ..., 'p95': ..., 'p99': ...})"""
+        if not self._values:
+            return {f"p{p:g}": 0.0 for p in ps}
+        values = np.percentile(np.fromiter(self._values, dtype=np.float64, count=len(self._values)), ps)
+        return {f"p{p:g}": float(value) for p, value in zip(ps, values)}
+
+    def summary(self) -> Dict[str, float]:
+        """Количество, среднее, максимум и перцентили"""
+        window_max = max(self._values) if self._values else 0.0
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': window_max,
+            **self.percentiles(),
+        }
+
+
+class LatencyTracker:
+    """
+    Тайминги этапов торгового цикла
+
+    span(stage) замеряет блок кода и добавляет длительность в гистограмму
+    этапа и в тайминги текущего цикла (повторные замеры этапа за цикл,
+    например для нескольких таймфреймов, суммируются). Замеры фоновых
+    задач (observe) попадают только в гистограммы.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self.histograms: Dict[str, RollingHistogram] = {}
+        self.cycle: Dict[str, float] = {}
+        self._cycle_start: Optional[float] = None
+
+    def _histogram(self, stage: str) -> RollingHistogram:
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = RollingHistogram(self.window)
+        return histogram
+
+    def _add(self, stage: str, ms: float):
+        self._histogram(stage).add(ms)
+        CYCLE_STAGE_SECONDS.labels(stage).observe(ms / 1000)
+
+    def observe(self, stage: str, ms: float):
+        """Добавление замера вне цикла (только в гистограмму), мс"""
+        self._add(stage, ms)
+
+    def record(self, stage: str, ms: float):
+        """Добавление замера этапа цикла, мс"""
+        self._add(stage, ms)
+        if self._cycle_start is not None:
+            self.cycle[stage] = self.cycle.get(stage, 0.0) + ms
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """Замер длительности блока"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - start) * 1000)
+
+    def start_cycle(self):
+        """Начало цикла"""
+        self.cycle = {}
+        self._cycle_start = time.perf_counter()
+
+    def end_cycle(self) -> Dict[str, float]:
+        """
+        Завершение цикла
+
+        Returns:
+            Тайминги этапов цикла в мс (включая 'total')
+        """
+        if self._cycle_start is None:
+            return {}
+        total = (time.perf_counter() - self._cycle_start) * 1000
+        self._cycle_start = None
+        self._add('total', total)
+        self.cycle['total'] = total
+        return self.cycle
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Статистика по всем этапам {этап: {'count', 'mean', 'max', 'p50', 'p95', 'p99'}}"""
+        return {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+
+    def format_cycle(self, cycle: Optional[Dict[str, float]] = None) -> str:
+        """Строка лога цикла: тайминги этапов и p50/p95/p99 полного цикла"""
+        cycle = self.cycle if cycle is None else cycle
+        stages = ['total'] + [stage for stage in CYCLE_STAGES if stage in cycle]
+        stages += sorted(stage for stage in cycle if stage not in stages)
+        parts = [f"{stage}={cycle[stage]:.1f}" for stage in stages if stage in cycle]
+
+        total = self.histograms.get('total')
+        if total is not None and len(total):
+            p = total.percentiles()
+            parts.append(f"total_p50={p['p50']:.1f} total_p95={p['p95']:.1f} total_p99={p['p99']:.1f}")
+        return " ".join(parts)
+
+
+class LoopLagMonitor:
+    """
+    Задержка цикла событий
+
+    Фоновая задача засыпает на interval и измеряет, насколько позже она
+    просыпается: задержка показывает, как долго цикл событий был занят
+    блокирующим кодом. Замеры добавляются в гистограмму 'loop_lag'.
+    """
+
+    def __init__(self, tracker: LatencyTracker, interval: float = 0.05):
+        self.tracker = tracker
+        self.interval = interval
+        self.max_lag_ms = 0.0  # максимум с последнего take_max
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def take_max(self) -> float:
+        """Максимальная задержка с прошлого вызова, мс"""
+        max_lag, self.max_lag_ms = self.max_lag_ms, 0.0
+        return max_lag
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, (time.perf_counter() - started - self.interval) * 1000)
+            self.tracker.observe('loop_lag', lag)
+            self.max_lag_ms = max(self.max_lag_ms, lag)
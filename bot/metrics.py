@@ -0,0 +1,261 @@
+"""
+Метрики бота в формате Prometheus
+Общий реестр процесса: бот обновляет метрики, health server отдает их на /metrics
+"""
+
+import bisect
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from loguru import logger
+
+
+# Content-Type текстового формата Prometheus (как prometheus_client.CONTENT_TYPE_LATEST)
+CONTENT_TYPE_LATEST = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Границы гистограмм длительности, секунды
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Сэмпл коллектора: (имя метрики, метки, значение)
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+class _Metric:
+    """Базовый класс метрики с метками"""
+
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[tuple, object] = {}
+        self._lock = threading.Lock()  # общий для дочерних метрик
+
+    def labels(self, *values):
+        """Дочерняя метрика для набора значений меток (кэшируется)"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"Метрика {self.name} ожидает метки {self.labelnames}")
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _default(self):
+        """Метрика без меток"""
+        return self.labels()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, values))
+            lines.extend(child.render(self.name, labels))
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self, lock: threading.Lock):
+        self.value = 0.0
+        self._lock = lock
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def render(self, name: str, labels: Dict[str, str]) -> List[str]:
+        return [f"{name}{_format_labels(labels)} {_format_value(self.value)}"]
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def set(self, value: float):
+        self.value = value
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+
+class _HistogramChild:
+    __slots__ = ('buckets', 'counts', 'sum', 'count', '_lock')
+
+    def __init__(self, buckets: Sequence[float], lock: threading.Lock):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # последняя корзина - +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = lock
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def render(self, name: str, labels: Dict[str, str]) -> List[str]:
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(list(self.buckets) + [math.inf], counts):
+            cumulative += bucket_count
+            lines.append(f"{name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class Counter(_Metric):
+    """Монотонно растущий счетчик"""
+
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild(self._lock)
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    """Текущее значение"""
+
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild(self._lock)
+
+    def set(self, value: float):
+        self._default().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+
+class Histogram(_Metric):
+    """Распределение значений по корзинам"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets, self._lock)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+
+class MetricsRegistry:
+    """
+    Реестр метрик
+
+    Обновление метрики - поиск дочерней метрики в словаре и сложение под
+    блокировкой метрики: запросы к бирже (call_exchange) учитываются из
+    потоков пулов исполнения, остальные метрики - из цикла событий.
+    Значения, которые уже есть в объектах бота (глубина очереди, счетчики
+    кэшей), не дублируются: их отдают коллекторы, вызываемые только при
+    чтении /metrics.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Tuple[str, str, str, Callable[[], Iterable[Sample]]]] = []
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"Метрика {name} уже зарегистрирована как {metric.kind}")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def register_collector(self, name: str, documentation: str, kind: str,
+                           collect: Callable[[], Iterable[Sample]]):
+        """
+        Регистрация коллектора (вызывается при чтении метрик)
+
+        Args:
+            name: Имя метрики (для HELP/TYPE)
+            documentation: Описание
+            kind: Тип метрики ('gauge' или 'counter')
+            collect: Функция, возвращающая сэмплы (имя, метки, значение)
+        """
+        self._collectors = [entry for entry in self._collectors if entry[0] != name]
+        self._collectors.append((name, documentation, kind, collect))
+
+    def render(self) -> str:
+        """Метрики в текстовом формате Prometheus"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+
+        for name, documentation, kind, collect in self._collectors:
+            try:
+                samples = list(collect())
+            except Exception as e:
+                logger.warning(f"Ошибка коллектора метрик {name}: {e}")
+                continue
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Общий реестр процесса
+REGISTRY = MetricsRegistry()
+
+CYCLE_STAGE_SECONDS = REGISTRY.histogram(
+    'trading_cycle_stage_seconds', 'Длительность этапа торгового цикла', ('stage',))
+TRADING_SIGNALS = REGISTRY.counter(
+    'trading_signals_total', 'Результаты анализа рынка (сигналы стратегии)', ('type',))
+EXCHANGE_REQUEST_SECONDS = REGISTRY.histogram(
+    'exchange_request_seconds', 'Длительность запроса к бирже', ('exchange', 'endpoint'))
+EXCHANGE_REQUEST_ERRORS = REGISTRY.counter(
+    'exchange_request_errors_total', 'Ошибки запросов к бирже', ('exchange', 'endpoint'))
+EXCHANGE_RATE_LIMIT_WAIT_SECONDS = REGISTRY.counter(
+    'exchange_rate_limit_wait_seconds_total', 'Ожидание лимита веса запросов к бирже', ('exchange', 'kind'))
@@ -3,15 +3,141 @@
 Поддерживает Telegram уведомления
 """
 
+import asyncio
+import itertools
+import time
 import aiohttp
 from loguru import logger
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass
 from datetime import datetime
 
 from .strategy import TradingSignal, SignalType
 from .trading_engine import Trade, Position
 
 
+# Приоритеты уведомлений: при переполнении очереди первыми вытесняются низкоприоритетные
+PRIORITY_LOW = 0      # статус, обновления позиций
+PRIORITY_NORMAL = 1   # сигналы, отчеты
+PRIORITY_HIGH = 2     # сделки, ошибки
+
+# Ограничение длины сообщения Telegram
+TELEGRAM_MAX_LENGTH = 4096
+MESSAGE_SEPARATOR = "\n\n"
+
+
+@dataclass
+class QueuedMessage:
+    """Сообщение в очереди отправки"""
+    seq: int
+    priority: int
+    text: str
+    key: Optional[str] = None  # сообщения с одинаковым ключом заменяют друг друга
+    requeues: int = 0  # возвратов в очередь после неудачной отправки
+
+
+class NotificationQueue:
+    """
+    Ограниченная очередь уведомлений
+    
+    Добавление никогда не ждет: при переполнении вытесняется самое старое
+    сообщение с наименьшим приоритетом (или отбрасывается новое, если его
+    приоритет ниже всех в очереди). Сообщение с ключом заменяет ожидающее
+    сообщение с тем же ключом (например, устаревший статус).
+    """
+    
+    def __init__(self, maxsize: int = 100):
+        self.maxsize = max(1, maxsize)
+        self._items: List[QueuedMessage] = []
+        self._seq = itertools.count()
+        self._event = asyncio.Event()
+        self.dropped = 0
+        self.replaced = 0
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def put(self, text: str, priority: int = PRIORITY_NORMAL, key: Optional[str] = None) -> bool:
+        """
+        Добавление сообщения без ожидания
+        
+        Returns:
+            True, если сообщение поставлено в очередь
+        """
+        item = QueuedMessage(next(self._seq), priority, text, key)
+        
+        if key is not None:
+            for i, queued in enumerate(self._items):
+                if queued.key == key:
+                    del self._items[i]
+                    self.replaced += 1
+                    break
+        
+        if len(self._items) >= self.maxsize:
+            victim = self._victim()
+            if victim.priority > priority:
+                self.dropped += 1
+                logger.warning("Очередь уведомлений переполнена, сообщение отброшено")
+                return False
+            self._items.remove(victim)
+            self.dropped += 1
+            logger.warning("Очередь уведомлений переполнена, вытеснено старое сообщение")
+        
+        self._items.append(item)
+        self._event.set()
+        return True
+    
+    def _victim(self) -> QueuedMessage:
+        """Сообщение для вытеснения: самое старое с наименьшим приоритетом"""
+        return min(self._items, key=lambda queued: (queued.priority, queued.seq))
+    
+    async def wait(self):
+        """Ожидание непустой очереди"""
+        while not self._items:
+            self._event.clear()
+            await self._event.wait()
+    
+    def take_batch(self, max_length: int = TELEGRAM_MAX_LENGTH) -> List[QueuedMessage]:
+        """Извлечение ожидающих сообщений в порядке поступления, суммарно не длиннее max_length"""
+        batch = []
+        length = 0
+        while self._items:
+            added = len(self._items[0].text) + (len(MESSAGE_SEPARATOR) if batch else 0)
+            if batch and length + added > max_length:
+                break
+            batch.append(self._items.pop(0))
+            length += added
+        return batch
+    
+    def requeue(self, batch: List[QueuedMessage]) -> int:
+        """
+        Возврат неотправленных сообщений в начало очереди
+        
+        Сообщения сохраняют приоритет и порядок; сообщение с ключом не
+        возвращается, если в очереди уже есть более новое с тем же ключом.
+        При переполнении вытесняются сообщения по правилу put (самые
+        старые с наименьшим приоритетом).
+        
+        Returns:
+            Количество возвращенных сообщений
+        """
+        pending_keys = {queued.key for queued in self._items if queued.key is not None}
+        restored = [item for item in batch if item.key is None or item.key not in pending_keys]
+        self._items[:0] = restored
+        
+        while len(self._items) > self.maxsize:
+            victim = self._victim()
+            self._items.remove(victim)
+            self.dropped += 1
+            if victim in restored:
+                restored.remove(victim)
+            logger.warning("Очередь уведомлений переполнена, вытеснено старое сообщение")
+        
+        if restored:
+            self._event.set()
+        return len(restored)
+
+
 class NotificationManager:
     """Менеджер уведомлений"""
     
@@ -35,6 +161,31 @@ class NotificationManager:
         self.notify_trades = self.notifications_config.get('notify_trades', True)
         self.notify_errors = self.notifications_config.get('notify_errors', True)
         
+        # Параметры HTTP соединения с Telegram API
+        self.connection_limit = self.notifications_config.get('connection_limit', 4)
+        self.dns_cache_ttl = self.notifications_config.get('dns_cache_ttl', 300)
+        self.keepalive_timeout = self.notifications_config.get('keepalive_timeout', 60)
+        self.request_timeout = self.notifications_config.get('request_timeout', 10)
+        
+        # Постоянная сессия: соединение с api.telegram.org переиспользуется между сообщениями
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Фоновая отправка: торговый цикл только ставит сообщения в очередь
+        self.min_interval = self.notifications_config.get('min_interval', 1.0)  # лимит Telegram на чат
+        self.drain_timeout = self.notifications_config.get('drain_timeout', 5)
+        self.max_retries = self.notifications_config.get('max_retries', 3)
+        self.max_requeues = self.notifications_config.get('max_requeues', 10)
+        self.max_backoff = self.notifications_config.get('max_backoff', 60)
+        self._failed_batches = 0  # неудачных пачек подряд (для паузы перед повтором)
+        self.queue = NotificationQueue(self.notifications_config.get('queue_size', 100))
+        self._worker: Optional[asyncio.Task] = None
+        self._next_send_at = 0.0
+        self._sending = False
+        self.sent_messages = 0
+        
+        # Замеры отправки в Telegram (LatencyTracker, задается ботом)
+        self.latency = None
+        
         # URL для Telegram API
         if self.telegram_enabled and self.telegram_token:
             self.telegram_url = f"https://api.telegram.org/bot{self.telegram_token}/sendMessage"
@@ -43,6 +194,48 @@ class NotificationManager:
         
         logger.info(f"Менеджер уведомлений инициализирован: Telegram {'включен' if self.telegram_enabled else 'отключен'}")
     
+    async def initialize(self):
+        """Открытие HTTP сессии для Telegram API и запуск фоновой отправки"""
+        if not self.telegram_url:
+            return
+        
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._worker_loop())
+        
+        if self._session is not None and not self._session.closed:
+            return
+        
+        connector = aiohttp.TCPConnector(
+            limit=self.connection_limit,
+            ttl_dns_cache=self.dns_cache_ttl,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+        )
+        logger.debug("HTTP сессия Telegram открыта")
+    
+    async def close(self):
+        """Отправка оставшихся сообщений (не дольше drain_timeout) и закрытие HTTP сессии"""
+        if self._worker is not None:
+            worker, self._worker = self._worker, None
+            deadline = time.monotonic() + self.drain_timeout
+            while (len(self.queue) or self._sending) and not worker.done() and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            worker.cancel()
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+            if len(self.queue):
+                logger.warning(f"Не отправлено уведомлений при завершении: {len(self.queue)}")
+        
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            logger.debug("HTTP сессия Telegram закрыта")
+    
     async def send_signal_notification(self, signal: TradingSignal):
         """Отправка уведомления о торговом сигнале"""
         if not self.notify_signals or not self.telegram_enabled:
@@ -75,7 +268,7 @@ class NotificationManager:
                     if value is not None:
                         message += f"• {indicator}: {value:.4f}\n"
             
-            await self._send_telegram_message(message)
+            await self._submit(message, PRIORITY_NORMAL)
             
         except Exception as e:
             logger.error(f"Ошибка отправки уведомления о сигнале: {e}")
@@ -108,7 +301,7 @@ class NotificationManager:
             if trade.fee > 0:
                 message += f"💳 *Комиссия:* {trade.fee:.4f}\n"
             
-            await self._send_telegram_message(message)
+            await self._submit(message, PRIORITY_HIGH)
             
         except Exception as e:
             logger.error(f"Ошибка отправки уведомления о сделке: {e}")
@@ -125,7 +318,7 @@ class NotificationManager:
                 message += f"📍 *Контекст:* {context}\n"
             message += f"⏰ *Время:* {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
             
-            await self._send_telegram_message(message)
+            await self._submit(message, PRIORITY_HIGH)
             
         except Exception as e:
             logger.error(f"Ошибка отправки уведомления об ошибке: {e}")
@@ -151,7 +344,7 @@ class NotificationManager:
                 else:
                     message += f"📋 *{key}:* {value}\n"
             
-            await self._send_telegram_message(message)
+            await self._submit(message, PRIORITY_LOW, key='status')
             
         except Exception as e:
             logger.error(f"Ошибка отправки уведомления о статусе: {e}")
@@ -191,7 +384,7 @@ class NotificationManager:
                     if amount > 0:
                         message += f"• {currency}: {amount:.4f}\n"
             
-            await self._send_telegram_message(message)
+            await self._submit(message, PRIORITY_NORMAL)
             
         except Exception as e:
             logger.error(f"Ошибка отправки ежедневного отчета: {e}")
@@ -213,15 +406,74 @@ class NotificationManager:
             message += f"{pnl_emoji} *Нереализованный PnL:* {position.unrealized_pnl:.4f} USDT\n"
             message += f"⏰ *Время входа:* {position.entry_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
             
-            await self._send_telegram_message(message)
+            await self._submit(message, PRIORITY_LOW, key=f'position:{position.symbol}')
             
         except Exception as e:
             logger.error(f"Ошибка отправки уведомления о позиции: {e}")
     
-    async def _send_telegram_message(self, message: str):
+    async def _submit(self, message: str, priority: int, key: Optional[str] = None):
+        """Постановка сообщения в очередь (без фоновой отправки - отправка сразу)"""
+        if self._worker is None or self._worker.done():
+            await self._send_telegram_message(message)
+            return
+        self.queue.put(message, priority, key)
+    
+    async def _worker_loop(self):
+        """Фоновая отправка: пачки накопившихся сообщений не чаще min_interval"""
+        while True:
+            await self.queue.wait()
+            
+            # Пауза по лимиту Telegram; за это время накапливаются сообщения для объединения
+            delay = self._next_send_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            
+            batch = self.queue.take_batch()
+            if not batch:
+                continue
+            
+            self._sending = True
+            sent = False
+            try:
+                for _ in range(max(1, self.max_retries)):
+                    started = time.perf_counter()
+                    sent = await self._send_telegram_message(MESSAGE_SEPARATOR.join(item.text for item in batch))
+                    if self.latency is not None:
+                        self.latency.observe('telegram_send', (time.perf_counter() - started) * 1000)
+                    self._next_send_at = max(self._next_send_at, time.monotonic() + self.min_interval)
+                    if sent:
+                        break
+                    await asyncio.sleep(max(0.0, self._next_send_at - time.monotonic()))
+            finally:
+                self._sending = False
+            
+            if sent:
+                self._failed_batches = 0
+                self.sent_messages += len(batch)
+                if len(batch) > 1:
+                    logger.debug(f"Объединено уведомлений в одно сообщение: {len(batch)}")
+            else:
+                self._requeue_failed(batch)
+    
+    def _requeue_failed(self, batch: List[QueuedMessage]):
+        """Возврат неотправленной пачки в очередь с нарастающей паузой (при недоступности Telegram)"""
+        self._failed_batches += 1
+        retry = [item for item in batch if item.requeues < self.max_requeues]
+        for item in retry:
+            item.requeues += 1
+        restored = self.queue.requeue(retry)
+        
+        backoff = min(self.min_interval * 2 ** self._failed_batches, self.max_backoff)
+        self._next_send_at = max(self._next_send_at, time.monotonic() + backoff)
+        
+        lost = len(batch) - restored
+        logger.error(f"Уведомления не отправлены после {self.max_retries} попыток: {len(batch)}, "
+                     f"возвращено в очередь {restored}, отброшено {lost}, повтор через {backoff:.1f} с")
+    
+    async def _send_telegram_message(self, message: str) -> bool:
         """Отправка сообщения в Telegram"""
         if not self.telegram_url or not self.telegram_chat_id:
-            return
+            return False
         
         try:
             payload = {
@@ -231,16 +483,54 @@ class NotificationManager:
                 'disable_web_page_preview': True
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(self.telegram_url, json=payload) as response:
-                    if response.status == 200:
-                        logger.debug("Telegram сообщение отправлено успешно")
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Ошибка отправки Telegram сообщения: {response.status} - {error_text}")
+            # Сессия открывается при первом сообщении, если initialize не вызывался
+            if self._session is None or self._session.closed:
+                await self.initialize()
+            
+            async with self._session.post(self.telegram_url, json=payload) as response:
+                if response.status == 200:
+                    logger.debug("Telegram сообщение отправлено успешно")
+                    return True
+                
+                if response.status == 429:
+                    # Превышен лимит: Telegram сообщает, сколько ждать
+                    data = await response.json(content_type=None)
+                    retry_after = data.get('parameters', {}).get('retry_after', self.min_interval)
+                    self._next_send_at = time.monotonic() + retry_after
+                    logger.warning(f"Лимит Telegram, повтор через {retry_after} с")
+                    return False
+                
+                error_text = await response.text()
+                logger.error(f"Ошибка отправки Telegram сообщения: {response.status} - {error_text}")
+                return False
                         
         except Exception as e:
             logger.error(f"Ошибка отправки Telegram сообщения: {e}")
+            return False
+    
+    async def check_telegram_connection(self) -> bool:
+        """Асинхронная проверка подключения к Telegram (через общую HTTP сессию)"""
+        if not self.telegram_enabled or not self.telegram_token or not self.telegram_chat_id:
+            return False
+        
+        try:
+            if self._session is None or self._session.closed:
+                await self.initialize()
+            
+            test_url = f"https://api.telegram.org/bot{self.telegram_token}/getMe"
+            async with self._session.get(test_url) as response:
+                if response.status == 200:
+                    bot_info = await response.json()
+                    if bot_info.get('ok'):
+                        logger.info(f"Telegram подключение успешно: @{bot_info['result']['username']}")
+                        return True
+                
+                logger.error(f"Ошибка подключения к Telegram: {response.status}")
+                return False
+            
+        except Exception as e:
+            logger.error(f"Ошибка тестирования Telegram: {e}")
+            return False
     
     def test_telegram_connection(self) -> bool:
         """Тестирование подключения к Telegram"""
@@ -0,0 +1,189 @@
+"""
+Перебор параметров стратегии на пуле процессов
+Ценовые массивы передаются воркерам через разделяемую память
+"""
+
+import copy
+import heapq
+import itertools
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from .backtester import Backtester
+
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Параметры верхнего уровня секции strategy, остальные - из strategy.indicators
+STRATEGY_PARAMS = ('ema_fast', 'ema_slow')
+
+# Данные воркера: задаются один раз в инициализаторе процесса
+_worker_config: Optional[Dict] = None
+_worker_data: Optional[pd.DataFrame] = None
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+
+
+def apply_params(config: Dict, params: Dict) -> Dict:
+    """
+    Копия конфигурации с подставленными параметрами стратегии
+
+    Args:
+        config: Конфигурация из config.yaml
+        params: Параметры ('ema_fast', 'adx_min', 'use_rsi', ...)
+
+    Returns:
+        Новая конфигурация
+    """
+    config = copy.deepcopy(config)
+    strategy_config = config.setdefault('strategy', {})
+    indicators_config = strategy_config.setdefault('indicators', {})
+    for name, value in params.items():
+        if name in STRATEGY_PARAMS:
+            strategy_config[name] = value
+        else:
+            indicators_config[name] = value
+    return config
+
+
+def grid(space: Dict[str, Sequence]) -> List[Dict]:
+    """Все комбинации параметров"""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_sample(space: Dict[str, Sequence], count: int, seed: Optional[int] = None) -> List[Dict]:
+    """Случайные комбинации параметров (без повторов)"""
+    combos = grid(space)
+    rng = random.Random(seed)
+    return rng.sample(combos, min(count, len(combos)))
+
+
+def _init_worker(config: Dict, shm_name: str, shape: tuple, index: np.ndarray):
+    """Инициализация воркера: подключение к разделяемой памяти с ценами"""
+    global _worker_config, _worker_data, _worker_shm
+
+    # Информационные логи каждого бэктеста в воркерах не нужны
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    arrays = np.ndarray(shape, dtype=np.float64, buffer=_worker_shm.buf)
+    _worker_data = pd.DataFrame({name: arrays[i] for i, name in enumerate(OHLCV_COLUMNS)},
+                                index=pd.DatetimeIndex(index, name='timestamp'), copy=False)
+    _worker_config = config
+
+
+def _run_batch(batch: List[Dict]) -> List[Dict]:
+    """Бэктест пачки комбинаций в воркере"""
+    results = []
+    for params in batch:
+        try:
+            backtester = Backtester(apply_params(_worker_config, params))
+            stats = backtester.run(_worker_data).stats
+            results.append({**params, **stats})
+        except Exception as e:
+            logger.error(f"Ошибка бэктеста {params}: {e}")
+    return results
+
+
+class ParameterSweep:
+    """
+    Перебор параметров стратегии
+
+    OHLCV копируется в разделяемую память один раз, воркеры подключаются
+    к ней при старте и получают только словари параметров; обратно
+    возвращается статистика бэктеста. Комбинации отправляются пачками,
+    чтобы накладные расходы на межпроцессный обмен не зависели от числа
+    комбинаций.
+    """
+
+    def __init__(self, config: Dict, df: pd.DataFrame, max_workers: Optional[int] = None):
+        """
+        Инициализация перебора
+
+        Args:
+            config: Базовая конфигурация из config.yaml
+            df: DataFrame с OHLCV данными
+            max_workers: Количество процессов (по умолчанию - число ядер)
+        """
+        self.config = config
+        self.df = df
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def iter_results(self, combos: List[Dict], batch_size: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Запуск перебора с выдачей результатов по мере готовности
+
+        Args:
+            combos: Список комбинаций параметров
+            batch_size: Комбинаций в одной задаче (по умолчанию ~4 задачи на процесс)
+
+        Yields:
+            Словарь параметров и статистики бэктеста
+        """
+        if not combos:
+            return
+
+        batch_size = batch_size or max(1, len(combos) // (self.max_workers * 4))
+        batches = [combos[i:i + batch_size] for i in range(0, len(combos), batch_size)]
+
+        arrays = self.df[OHLCV_COLUMNS].to_numpy(dtype=np.float64).T
+        shm = shared_memory.SharedMemory(create=True, size=arrays.nbytes)
+        try:
+            np.ndarray(arrays.shape, dtype=np.float64, buffer=shm.buf)[:] = arrays
+            index = self.df.index.to_numpy()
+
+            logger.info(f"Перебор параметров: {len(combos)} комбинаций, "
+                        f"{len(batches)} задач, {self.max_workers} процессов")
+
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(self.config, shm.name, arrays.shape, index)) as executor:
+                futures = [executor.submit(_run_batch, batch) for batch in batches]
+                for future in as_completed(futures):
+                    yield from future.result()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def run(self, combos: List[Dict], metric: str = 'total_pnl',
+            on_result: Optional[Callable[[pd.DataFrame], None]] = None,
+            top: int = 10) -> pd.DataFrame:
+        """
+        Перебор с ранжированием результатов
+
+        Args:
+            combos: Список комбинаций параметров
+            metric: Метрика для сортировки (колонка статистики бэктеста)
+            on_result: Вызывается с текущей таблицей лучших top результатов по мере поступления
+            top: Размер промежуточной таблицы для on_result
+
+        Returns:
+            DataFrame всех результатов, отсортированный по metric
+        """
+        rows = []
+        leaders = []  # куча (metric, номер, строка) лучших top результатов
+        for row in self.iter_results(combos):
+            rows.append(row)
+            if on_result is None:
+                continue
+
+            entry = (row[metric], len(rows), row)
+            if len(leaders) < top:
+                heapq.heappush(leaders, entry)
+            elif entry > leaders[0]:
+                heapq.heapreplace(leaders, entry)
+            else:
+                continue
+            on_result(pd.DataFrame([item[2] for item in sorted(leaders, reverse=True)]))
+
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame(rows).sort_values(metric, ascending=False).reset_index(drop=True)
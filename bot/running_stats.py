@@ -0,0 +1,113 @@
+"""
+Накопительная статистика торговли и сигналов
+Агрегаты обновляются при каждой сделке/сигнале, чтение статистики - O(1)
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+@dataclass
+class TradeStats:
+    """Статистика закрытых сделок (по PnL продаж)"""
+    initial_capital: float = 0.0
+    total_trades: int = 0
+    total_pnl: float = 0.0
+    sum_sq_pnl: float = 0.0
+    winning_trades: int = 0
+    gross_profit: float = 0.0
+    gross_loss: float = 0.0
+    best_trade: float = -math.inf
+    worst_trade: float = math.inf
+    peak_equity: float = 0.0
+    max_drawdown: float = 0.0  # в валюте котировки
+    max_drawdown_percent: float = 0.0
+
+    def __post_init__(self):
+        self.peak_equity = max(self.peak_equity, self.initial_capital)
+
+    def add(self, pnl: float):
+        """Учет закрытой сделки"""
+        self.total_trades += 1
+        self.total_pnl += pnl
+        self.sum_sq_pnl += pnl * pnl
+        if pnl > 0:
+            self.winning_trades += 1
+            self.gross_profit += pnl
+        else:
+            self.gross_loss -= pnl
+        self.best_trade = max(self.best_trade, pnl)
+        self.worst_trade = min(self.worst_trade, pnl)
+
+        # Просадка по реализованному капиталу
+        equity = self.equity
+        self.peak_equity = max(self.peak_equity, equity)
+        drawdown = self.peak_equity - equity
+        if drawdown > self.max_drawdown:
+            self.max_drawdown = drawdown
+            if self.peak_equity > 0:
+                self.max_drawdown_percent = drawdown / self.peak_equity * 100
+
+    @property
+    def equity(self) -> float:
+        return self.initial_capital + self.total_pnl
+
+    @property
+    def win_rate(self) -> float:
+        return (self.winning_trades / self.total_trades * 100) if self.total_trades > 0 else 0
+
+    @property
+    def avg_trade(self) -> float:
+        return self.total_pnl / self.total_trades if self.total_trades > 0 else 0
+
+    @property
+    def pnl_std(self) -> float:
+        """Выборочное стандартное отклонение PnL сделки"""
+        if self.total_trades < 2:
+            return 0.0
+        variance = (self.sum_sq_pnl - self.total_pnl * self.total_pnl / self.total_trades) / (self.total_trades - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    @property
+    def profit_factor(self) -> float:
+        if self.gross_loss == 0:
+            return math.inf if self.gross_profit > 0 else 0.0
+        return self.gross_profit / self.gross_loss
+
+    def to_dict(self) -> Dict[str, float]:
+        """Статистика для отчетов"""
+        return {
+            'total_trades': self.total_trades,
+            'total_pnl': self.total_pnl,
+            'win_rate': self.win_rate,
+            'avg_trade': self.avg_trade,
+            'pnl_std': self.pnl_std,
+            'profit_factor': self.profit_factor,
+            'best_trade': self.best_trade if self.total_trades else 0.0,
+            'worst_trade': self.worst_trade if self.total_trades else 0.0,
+            'peak_equity': self.peak_equity,
+            'max_drawdown': self.max_drawdown,
+            'max_drawdown_percent': self.max_drawdown_percent,
+        }
+
+
+@dataclass
+class SignalStats:
+    """Статистика торговых сигналов"""
+    total_signals: int = 0
+    sum_confidence: float = 0.0
+    by_type: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, signal_type: str, confidence: float):
+        """Учет сигнала"""
+        self.total_signals += 1
+        self.sum_confidence += confidence
+        self.by_type[signal_type] = self.by_type.get(signal_type, 0) + 1
+
+    @property
+    def avg_confidence(self) -> float:
+        return self.sum_confidence / self.total_signals if self.total_signals else 0.0
+
+    def count(self, signal_type: str) -> int:
+        return self.by_type.get(signal_type, 0)
@@ -0,0 +1,112 @@
+"""
+Планировщик торгового цикла по закрытию свечей
+Цикл запускается через заданную задержку после границы таймфрейма по времени биржи
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import ccxt
+from loguru import logger
+
+
+class CandleScheduler:
+    """
+    Планировщик по границам таймфреймов
+
+    Для набора таймфреймов вычисляется ближайшая граница свечи (кратная
+    длительности таймфрейма от эпохи), планировщик просыпается через delay
+    после нее и сообщает, какие таймфреймы закрылись. Время биржи
+    учитывается через смещение часов, которое периодически уточняется
+    запросом серверного времени.
+    """
+
+    def __init__(self, timeframes: List[str], delay: float = 0.3,
+                 server_time: Optional[Callable[[], Awaitable[int]]] = None,
+                 sync_interval: float = 3600):
+        """
+        Инициализация планировщика
+
+        Args:
+            timeframes: Таймфреймы ccxt ('1m', '15m', '1h', ...)
+            delay: Задержка после закрытия свечи, секунды
+            server_time: Корутина, возвращающая время биржи в миллисекундах (необязательно)
+            sync_interval: Интервал синхронизации часов с биржей, секунды
+        """
+        if not timeframes:
+            raise ValueError("Не задан ни один таймфрейм")
+
+        self.timeframes = list(dict.fromkeys(timeframes))
+        self.periods_ms = {tf: ccxt.Exchange.parse_timeframe(tf) * 1000 for tf in self.timeframes}
+        self.delay = delay
+        self.server_time = server_time
+        self.sync_interval = sync_interval
+
+        self.offset_ms = 0.0  # время биржи минус локальное время
+        self._last_sync: Optional[float] = None
+
+    @staticmethod
+    def _local_ms() -> float:
+        return time.time() * 1000
+
+    def now_ms(self) -> float:
+        """Текущее время биржи в миллисекундах"""
+        return self._local_ms() + self.offset_ms
+
+    async def sync_clock(self):
+        """Уточнение смещения часов по серверному времени биржи"""
+        if self.server_time is None:
+            return
+
+        try:
+            before = self._local_ms()
+            server_ms = await self.server_time()
+            after = self._local_ms()
+            # Серверное время соответствует середине запроса
+            self.offset_ms = server_ms - (before + after) / 2
+            self._last_sync = time.monotonic()
+            logger.debug(f"Смещение часов относительно биржи: {self.offset_ms:.0f} мс")
+        except Exception as e:
+            logger.warning(f"Не удалось получить время биржи: {e}")
+
+    def next_close(self, now_ms: Optional[float] = None) -> Tuple[int, List[str]]:
+        """
+        Ближайшая граница свечей
+
+        Args:
+            now_ms: Время биржи в миллисекундах (по умолчанию - текущее)
+
+        Returns:
+            (граница в мс, таймфреймы, свечи которых закрываются на этой границе)
+        """
+        if now_ms is None:
+            now_ms = self.now_ms()
+
+        boundary = min((int(now_ms) // period + 1) * period for period in self.periods_ms.values())
+        closing = [tf for tf, period in self.periods_ms.items() if boundary % period == 0]
+        return boundary, closing
+
+    async def wait(self) -> Tuple[int, List[str]]:
+        """
+        Ожидание закрытия ближайшей свечи
+
+        Returns:
+            (граница в мс по времени биржи, закрывшиеся таймфреймы)
+        """
+        if self.server_time is not None and (
+                self._last_sync is None or time.monotonic() - self._last_sync >= self.sync_interval):
+            await self.sync_clock()
+
+        boundary, closing = self.next_close()
+
+        # Просыпаемся, когда граница прошла и по времени биржи, и по локальным часам
+        # (по локальным часам отбрасывается формирующаяся свеча)
+        wake_ms = boundary + self.delay * 1000 + max(0.0, self.offset_ms)
+        sleep = (wake_ms - self.now_ms()) / 1000
+        if sleep > 0:
+            await asyncio.sleep(sleep)
+
+        lateness = self.now_ms() - boundary
+        logger.debug(f"Закрытие свечей {', '.join(closing)}: пробуждение через {lateness:.0f} мс")
+        return boundary, closing
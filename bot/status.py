@@ -0,0 +1,69 @@
+"""
+Снимок состояния бота для /status
+Бот публикует неизменяемый снимок после каждого цикла, health server отдает его из памяти
+"""
+
+import json
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+def _json_safe(value: Any) -> Any:
+    """Замена нечисловых float (inf, nan) на None для корректного JSON"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {str(key): _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class StatusSnapshot:
+    """
+    Неизменяемый снимок состояния
+
+    Хранится уже сериализованным в JSON: отдача /status - запись готовых
+    байтов без обращения к объектам бота.
+    """
+    body: bytes
+    published_at: float  # time.time() публикации
+
+    @classmethod
+    def create(cls, data: Dict[str, Any]) -> 'StatusSnapshot':
+        body = json.dumps(_json_safe(data), ensure_ascii=False, default=str).encode('utf-8')
+        return cls(body=body, published_at=time.time())
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """Копия данных снимка"""
+        return json.loads(self.body)
+
+    @property
+    def age(self) -> float:
+        """Возраст снимка, секунды"""
+        return time.time() - self.published_at
+
+
+class StatusBoard:
+    """Последний опубликованный снимок (замена ссылки атомарна, блокировки не нужны)"""
+
+    def __init__(self):
+        self._snapshot: Optional[StatusSnapshot] = None
+
+    @property
+    def current(self) -> Optional[StatusSnapshot]:
+        return self._snapshot
+
+    def publish(self, data: Dict[str, Any]) -> StatusSnapshot:
+        """Публикация нового снимка"""
+        snapshot = StatusSnapshot.create(data)
+        self._snapshot = snapshot
+        return snapshot
+
+
+# Общая доска состояния процесса
+STATUS_BOARD = StatusBoard()
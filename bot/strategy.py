@@ -5,12 +5,126 @@
 
 import pandas as pd
 from loguru import logger
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 from dataclasses import dataclass
+from collections import deque
+from collections.abc import Mapping as MappingABC
+from itertools import islice
 from enum import Enum
 from datetime import datetime
 
-from .indicators import TechnicalIndicators
+from .indicators import IndicatorConfig, TechnicalIndicators
+from .running_stats import SignalStats
+
+
+# Минимум свечей для анализа
+MIN_BARS = 50
+
+# Минимальная уверенность для входа и выхода
+MIN_BUY_CONFIDENCE = 0.6
+MIN_SELL_CONFIDENCE = 0.4
+
+
+def buy_confidence(passed_filters, total_filters: int):
+    """
+    Уверенность сигнала покупки
+    
+    Args:
+        passed_filters: Количество пройденных фильтров (число или массив по барам)
+        total_filters: Количество включенных фильтров
+        
+    Returns:
+        Уверенность (0-1) того же вида, что passed_filters
+    """
+    if total_filters == 0:
+        return 0.8  # Если нет фильтров, базовая уверенность
+    return 0.5 + (passed_filters / total_filters) * 0.4
+
+
+def sell_confidence(passed_filters, total_filters: int):
+    """Уверенность сигнала продажи (для продажи требования ниже)"""
+    if total_filters == 0:
+        return 0.7
+    return 0.4 + (passed_filters / total_filters) * 0.4
+
+
+# Колонки индикаторов, попадающие в indicators_data (ключ - имя в нижнем регистре)
+INDICATOR_COLUMNS = ['ADX', 'MACD', 'MACD_SIGNAL', 'RSI', 'TSI',
+                     'KDJ_K', 'KDJ_D', 'KDJ_J', 'VWAP', 'ATR']
+
+
+def indicators_snapshot(df: pd.DataFrame, ema_config: IndicatorConfig,
+                        position: int = -1) -> Dict[str, float]:
+    """
+    Значения индикаторов на одном баре
+    
+    Args:
+        df: DataFrame с индикаторами
+        ema_config: Настройки EMA (имена колонок быстрой и медленной EMA)
+        position: Позиция бара
+        
+    Returns:
+        Словарь {индикатор: значение}
+    """
+    data = {}
+    
+    # EMA данные
+    fast_col = f"EMA_{ema_config.params['fast']}"
+    slow_col = f"EMA_{ema_config.params['slow']}"
+    
+    if fast_col in df.columns:
+        data['ema_fast'] = float(df[fast_col].iloc[position])
+    if slow_col in df.columns:
+        data['ema_slow'] = float(df[slow_col].iloc[position])
+    
+    # Данные других индикаторов
+    for col in INDICATOR_COLUMNS:
+        if col in df.columns:
+            try:
+                data[col.lower()] = float(df[col].iloc[position])
+            except (ValueError, IndexError):
+                pass
+    
+    return data
+
+
+class LazyIndicatorsData(MappingABC):
+    """
+    Отложенный снимок индикаторов последнего бара
+    
+    Словарь строится при первом обращении (чтение ключа, итерация,
+    len, bool), после чего ссылка на DataFrame освобождается.
+    """
+    
+    __slots__ = ('_df', '_ema_config', '_position', '_data')
+    
+    def __init__(self, df: pd.DataFrame, ema_config: IndicatorConfig):
+        self._df = df
+        self._ema_config = ema_config
+        self._position = len(df) - 1  # бар на момент создания сигнала
+        self._data: Optional[Dict[str, float]] = None
+    
+    def _materialize(self) -> Dict[str, float]:
+        if self._data is None:
+            self._data = indicators_snapshot(self._df, self._ema_config, self._position)
+            self._df = None
+        return self._data
+    
+    @property
+    def materialized(self) -> bool:
+        return self._data is not None
+    
+    def __getitem__(self, key: str) -> float:
+        return self._materialize()[key]
+    
+    def __iter__(self):
+        return iter(self._materialize())
+    
+    def __len__(self) -> int:
+        return len(self._materialize())
+    
+    def __repr__(self) -> str:
+        return repr(self._materialize())
 
 
 class SignalType(Enum):
@@ -29,10 +143,153 @@ class TradingSignal:
     timestamp: datetime
     confidence: float  # Уверенность в сигнале (0-1)
     filters_passed: Dict[str, bool]  # Какие фильтры прошли
-    indicators_data: Dict[str, float]  # Данные индикаторов
+    indicators_data: Mapping[str, float]  # Данные индикаторов (dict или LazyIndicatorsData)
     reason: str  # Причина сигнала
 
 
+@dataclass
+class SignalRecord:
+    """
+    Компактная запись сигнала для истории
+    
+    Без __dict__ у экземпляра, словари фильтров и индикаторов хранятся
+    кортежами пар и превращаются обратно в TradingSignal только при чтении.
+    """
+    __slots__ = ('signal_type', 'symbol', 'price', 'timestamp', 'confidence',
+                 'reason', 'filters_passed', 'indicators_data')
+    
+    signal_type: str
+    symbol: str
+    price: float
+    timestamp: datetime
+    confidence: float
+    reason: str
+    filters_passed: Tuple[Tuple[str, bool], ...]
+    indicators_data: Tuple[Tuple[str, float], ...]
+    
+    @classmethod
+    def from_signal(cls, signal: TradingSignal, with_indicators: bool = True) -> 'SignalRecord':
+        """
+        Запись из сигнала
+        
+        Args:
+            signal: Торговый сигнал
+            with_indicators: Копировать данные индикаторов (без них отложенный
+                снимок LazyIndicatorsData не строится)
+        """
+        return cls(
+            signal_type=signal.signal_type.value,
+            symbol=signal.symbol,
+            price=float(signal.price),
+            timestamp=signal.timestamp,
+            confidence=signal.confidence,
+            reason=signal.reason,
+            filters_passed=tuple((name, bool(value)) for name, value in signal.filters_passed.items()),
+            indicators_data=tuple(signal.indicators_data.items()) if with_indicators else ()
+        )
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SignalRecord':
+        """Запись из сохраненного словаря (формат to_dict)"""
+        return cls(
+            signal_type=data['signal_type'],
+            symbol=data['symbol'],
+            price=float(data['price']),
+            timestamp=datetime.fromisoformat(data['timestamp']),
+            confidence=data['confidence'],
+            reason=data.get('reason') or '',
+            filters_passed=tuple((data.get('filters_passed') or {}).items()),
+            indicators_data=tuple((data.get('indicators_data') or {}).items())
+        )
+    
+    def to_signal(self) -> TradingSignal:
+        return TradingSignal(
+            signal_type=SignalType(self.signal_type),
+            symbol=self.symbol,
+            price=self.price,
+            timestamp=self.timestamp,
+            confidence=self.confidence,
+            filters_passed=dict(self.filters_passed),
+            indicators_data=dict(self.indicators_data),
+            reason=self.reason
+        )
+    
+    def to_dict(self) -> Dict:
+        """Сигнал в виде словаря для сохранения"""
+        return {
+            'symbol': self.symbol,
+            'signal_type': self.signal_type,
+            'price': self.price,
+            'timestamp': self.timestamp.isoformat(),
+            'confidence': self.confidence,
+            'reason': self.reason,
+            'filters_passed': dict(self.filters_passed),
+            'indicators_data': dict(self.indicators_data)
+        }
+
+
+class SignalHistory:
+    """
+    Ограниченная история сигналов (кольцевой буфер)
+    
+    Хранит последние maxlen записей, самая старая вытесняется при
+    заполнении. Сигналы сохраняет торговый движок при исполнении
+    (TradingEngine._record_signal), после перезапуска история
+    восстанавливается из его хранилища через restore.
+    """
+    
+    def __init__(self, maxlen: int = 500):
+        """
+        Инициализация истории
+        
+        Args:
+            maxlen: Максимум сигналов в памяти
+        """
+        self._records = deque(maxlen=maxlen)
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def __iter__(self) -> Iterator[TradingSignal]:
+        return (record.to_signal() for record in self._records)
+    
+    @property
+    def maxlen(self) -> int:
+        return self._records.maxlen
+    
+    def append(self, signal: TradingSignal):
+        """Добавление сигнала (самый старый вытесняется при заполнении)"""
+        self._records.append(SignalRecord.from_signal(signal))
+    
+    def restore(self, signals: Iterable[Dict]):
+        """
+        Заполнение истории сохраненными сигналами (при запуске)
+        
+        Args:
+            signals: Сигналы в формате SignalRecord.to_dict в хронологическом порядке
+        """
+        for data in signals:
+            try:
+                self._records.append(SignalRecord.from_dict(data))
+            except Exception as e:
+                logger.warning(f"Пропущен поврежденный сигнал истории: {e}")
+    
+    def tail(self, limit: Optional[int] = None) -> List[TradingSignal]:
+        """
+        Последние сигналы за O(limit)
+        
+        Args:
+            limit: Количество сигналов (None или 0 - все в памяти)
+            
+        Returns:
+            Список сигналов в хронологическом порядке
+        """
+        records = reversed(self._records)
+        if limit:
+            records = islice(records, limit)
+        return [record.to_signal() for record in records][::-1]
+
+
 class TradingStrategy:
     """Основной класс торговой стратегии"""
     
@@ -53,7 +310,9 @@ class TradingStrategy:
         self.timeframe = self.strategy_config.get('timeframe', '15m')
         
         # История сигналов
-        self.signal_history: List[TradingSignal] = []
+        self.signal_history = SignalHistory(
+            maxlen=self.strategy_config.get('signal_history_size', 500))
+        self.signal_stats = SignalStats()
         
         # Состояние позиции
         self.current_position = None  # 'long', 'short', None
@@ -73,7 +332,7 @@ class TradingStrategy:
             TradingSignal объект
         """
         try:
-            if len(df) < 50:  # Минимум данных для анализа
+            if len(df) < MIN_BARS:  # Минимум данных для анализа
                 return self._create_hold_signal(df, "Недостаточно данных для анализа")
             
             # Получаем последние данные
@@ -118,13 +377,10 @@ class TradingStrategy:
                     passed_filters += 1
             
             # Рассчитываем уверенность
-            if total_filters == 0:
-                confidence = 0.8  # Если нет фильтров, базовая уверенность
-            else:
-                confidence = 0.5 + (passed_filters / total_filters) * 0.4
+            confidence = buy_confidence(passed_filters, total_filters)
             
             # Минимальная уверенность для входа
-            min_confidence = 0.6
+            min_confidence = MIN_BUY_CONFIDENCE
             
             if confidence >= min_confidence:
                 # Получаем данные индикаторов
@@ -171,13 +427,10 @@ class TradingStrategy:
                     passed_filters += 1
             
             # Рассчитываем уверенность (для продажи требования ниже)
-            if total_filters == 0:
-                confidence = 0.7
-            else:
-                confidence = 0.4 + (passed_filters / total_filters) * 0.4
+            confidence = sell_confidence(passed_filters, total_filters)
             
             # Минимальная уверенность для выхода
-            min_confidence = 0.4
+            min_confidence = MIN_SELL_CONFIDENCE
             
             if confidence >= min_confidence:
                 # Получаем данные индикаторов
@@ -208,7 +461,9 @@ class TradingStrategy:
         """Создание сигнала HOLD"""
         current_price = df['close'].iloc[-1]
         current_time = df.index[-1]
-        indicators_data = self._get_indicators_data(df)
+        
+        # HOLD почти никогда не читается - данные индикаторов собираются по требованию
+        indicators_data = LazyIndicatorsData(df, self.indicators.indicators_config['ema'])
         
         return TradingSignal(
             signal_type=SignalType.HOLD,
@@ -223,30 +478,7 @@ class TradingStrategy:
     
     def _get_indicators_data(self, df: pd.DataFrame) -> Dict[str, float]:
         """Получение данных всех индикаторов"""
-        data = {}
-        
-        # EMA данные
-        ema_config = self.indicators.indicators_config['ema']
-        fast_col = f"EMA_{ema_config.params['fast']}"
-        slow_col = f"EMA_{ema_config.params['slow']}"
-        
-        if fast_col in df.columns:
-            data['ema_fast'] = float(df[fast_col].iloc[-1])
-        if slow_col in df.columns:
-            data['ema_slow'] = float(df[slow_col].iloc[-1])
-        
-        # Данные других индикаторов
-        indicator_columns = ['ADX', 'MACD', 'MACD_SIGNAL', 'RSI', 'TSI', 
-                           'KDJ_K', 'KDJ_D', 'KDJ_J', 'VWAP', 'ATR']
-        
-        for col in indicator_columns:
-            if col in df.columns:
-                try:
-                    data[col.lower()] = float(df[col].iloc[-1])
-                except (ValueError, IndexError):
-                    pass
-        
-        return data
+        return indicators_snapshot(df, self.indicators.indicators_config['ema'])
     
     def execute_signal(self, signal: TradingSignal) -> bool:
         """
@@ -283,7 +515,7 @@ class TradingStrategy:
             self.entry_time = signal.timestamp
             
             # Добавляем в историю
-            self.signal_history.append(signal)
+            self.record_signal(signal)
             
             logger.info(f"Открыта длинная позиция: {signal.symbol} по цене {signal.price}")
             return True
@@ -311,7 +543,7 @@ class TradingStrategy:
             self.entry_time = None
             
             # Добавляем в историю
-            self.signal_history.append(signal)
+            self.record_signal(signal)
             
             logger.info(f"Закрыта длинная позиция: {signal.symbol} по цене {signal.price}")
             return True
@@ -330,12 +562,32 @@ class TradingStrategy:
         }
     
     def get_signal_history(self, limit: int = 10) -> List[TradingSignal]:
-        """Получение истории сигналов"""
-        return self.signal_history[-limit:] if limit > 0 else self.signal_history
+        """Получение истории сигналов (только хранящихся в памяти)"""
+        return self.signal_history.tail(limit if limit > 0 else None)
+    
+    def record_signal(self, signal: TradingSignal):
+        """Добавление исполняемого сигнала в историю и статистику"""
+        self.signal_history.append(signal)
+        self.signal_stats.add(signal.signal_type.value, signal.confidence)
+    
+    def restore_signal_stats(self, rows: Iterable[Tuple[str, float]]):
+        """
+        Восстановление статистики сигналов из хранилища (при запуске)
+        
+        Args:
+            rows: Пары (тип сигнала, уверенность) сохраненных сигналов
+        """
+        stats = SignalStats()
+        for signal_type, confidence in rows:
+            stats.add(signal_type, confidence)
+        self.signal_stats = stats
+        if stats.total_signals:
+            logger.info(f"Восстановлена статистика сигналов: {stats.total_signals}")
     
     def get_strategy_stats(self) -> Dict:
         """Получение статистики стратегии"""
-        if not self.signal_history:
+        stats = self.signal_stats
+        if stats.total_signals == 0:
             return {
                 'total_signals': 0,
                 'buy_signals': 0,
@@ -343,16 +595,11 @@ class TradingStrategy:
                 'avg_confidence': 0.0
             }
         
-        buy_signals = [s for s in self.signal_history if s.signal_type == SignalType.BUY]
-        sell_signals = [s for s in self.signal_history if s.signal_type == SignalType.SELL]
-        
-        avg_confidence = sum(s.confidence for s in self.signal_history) / len(self.signal_history)
-        
         return {
-            'total_signals': len(self.signal_history),
-            'buy_signals': len(buy_signals),
-            'sell_signals': len(sell_signals),
-            'avg_confidence': avg_confidence,
+            'total_signals': stats.total_signals,
+            'buy_signals': stats.count(SignalType.BUY.value),
+            'sell_signals': stats.count(SignalType.SELL.value),
+            'avg_confidence': stats.avg_confidence,
             'current_position': self.current_position
         }
     
@@ -0,0 +1,524 @@
+"""
+Потоковый (инкрементальный) расчет технических индикаторов
+Каждая новая свеча обрабатывается за O(1) с сохранением рекуррентного состояния
+"""
+
+import math
+import sys
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import pandas as pd
+from loguru import logger
+
+from .indicators import IndicatorConfig
+
+
+NAN = float('nan')
+
+
+def _is_nan(value: float) -> bool:
+    """Проверка на NaN"""
+    return value != value
+
+
+def _div(a: float, b: float) -> float:
+    """Деление с семантикой IEEE 754 (как в pandas/numpy)"""
+    if b == 0:
+        if a == 0 or _is_nan(a) or _is_nan(b):
+            return NAN
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+def _nan_max(a: float, b: float) -> float:
+    """Максимум с распространением NaN (как np.maximum)"""
+    if _is_nan(a) or _is_nan(b):
+        return NAN
+    return a if a >= b else b
+
+
+class _EwmState:
+    """Состояние EWM (аналог Series.ewm(span=...).mean() с adjust=True)"""
+
+    def __init__(self, span: int):
+        com = (span - 1) / 2.0
+        alpha = 1.0 / (1.0 + com)
+        self._old_wt_factor = 1.0 - alpha
+        self._old_wt = 1.0
+        self._weighted = NAN
+
+    def update(self, value: float) -> float:
+        """Добавление значения и получение текущего EWM"""
+        if _is_nan(self._weighted):
+            # Первое наблюдение инициализирует среднее
+            if not _is_nan(value):
+                self._weighted = value
+                self._old_wt = 1.0
+            return self._weighted
+
+        # Вес старых данных затухает и на пропусках (ignore_na=False)
+        self._old_wt *= self._old_wt_factor
+        if not _is_nan(value):
+            if self._weighted != value:
+                self._weighted = (self._old_wt * self._weighted + value) / (self._old_wt + 1.0)
+            self._old_wt += 1.0
+        return self._weighted
+
+
+class _RollingSumState:
+    """Скользящая сумма/среднее с компенсацией Кэхэна (как rolling().sum()/mean())"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._values: Deque[float] = deque()
+        self._nobs = 0
+        self._neg_ct = 0
+        self._sum = 0.0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._same_count = 0
+        self._prev_value = NAN
+
+    def _add(self, value: float):
+        if _is_nan(value):
+            return
+        self._nobs += 1
+        y = value - self._comp_add
+        t = self._sum + y
+        self._comp_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, value) < 0:
+            self._neg_ct += 1
+        if value == self._prev_value:
+            self._same_count += 1
+        else:
+            self._same_count = 1
+        self._prev_value = value
+
+    def _remove(self, value: float):
+        if _is_nan(value):
+            return
+        self._nobs -= 1
+        y = -value - self._comp_remove
+        t = self._sum + y
+        self._comp_remove = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, value) < 0:
+            self._neg_ct -= 1
+
+    def update(self, value: float):
+        """Сдвиг окна на одно значение"""
+        if len(self._values) == self.window:
+            self._remove(self._values.popleft())
+        self._values.append(value)
+        self._add(value)
+
+    def sum(self) -> float:
+        """Текущая сумма окна"""
+        if self._nobs < self.window:
+            return NAN
+        if self._same_count >= self._nobs:
+            return self._prev_value * self._nobs
+        return self._sum
+
+    def mean(self) -> float:
+        """Текущее среднее окна"""
+        if self._nobs < self.window or self._nobs == 0:
+            return NAN
+        result = self._sum / self._nobs
+        if self._same_count >= self._nobs:
+            result = self._prev_value
+        elif self._neg_ct == 0 and result < 0:
+            result = 0.0
+        elif self._neg_ct == self._nobs and result > 0:
+            result = 0.0
+        return result
+
+
+class _RollingStdState:
+    """Скользящее стандартное отклонение по Уэлфорду (как rolling().std())"""
+
+    # Порог потери точности: остается не более 3 значащих цифр
+    INV_COND_TOL = sys.float_info.epsilon * 1e3
+
+    def __init__(self, window: int, ddof: int = 1):
+        self.window = window
+        self.ddof = ddof
+        self._values: Deque[float] = deque()
+        self._nobs = 0
+        self._mean = 0.0
+        self._ssqdm = 0.0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._unstable = False
+
+    def _add(self, value: float):
+        if _is_nan(value):
+            return
+        prev_m2 = self._ssqdm
+        self._nobs += 1
+        prev_mean = self._mean - self._comp_add
+        y = value - self._comp_add
+        t = y - self._mean
+        self._comp_add = t + self._mean - y
+        self._mean = self._mean + t / self._nobs
+        self._ssqdm = self._ssqdm + (value - prev_mean) * (value - self._mean)
+        if prev_m2 * self.INV_COND_TOL > self._ssqdm:
+            self._unstable = True
+
+    def _remove(self, value: float):
+        if _is_nan(value):
+            return
+        prev_m2 = self._ssqdm
+        self._nobs -= 1
+        if self._nobs:
+            prev_mean = self._mean - self._comp_remove
+            y = value - self._comp_remove
+            t = y - self._mean
+            self._comp_remove = t + self._mean - y
+            self._mean = self._mean - t / self._nobs
+            self._ssqdm = self._ssqdm - (value - prev_mean) * (value - self._mean)
+            if prev_m2 * self.INV_COND_TOL > self._ssqdm:
+                self._unstable = True
+        else:
+            self._mean = 0.0
+            self._ssqdm = 0.0
+            self._unstable = False
+
+    def update(self, value: float):
+        """Сдвиг окна на одно значение"""
+        if len(self._values) == self.window:
+            self._remove(self._values.popleft())
+        self._values.append(value)
+        self._add(value)
+
+        # При катастрофическом сокращении пересчитываем окно с нуля (как pandas)
+        if self._unstable:
+            self._nobs = 0
+            self._mean = self._ssqdm = self._comp_add = self._comp_remove = 0.0
+            for item in self._values:
+                self._add(item)
+            self._unstable = False
+
+    def std(self) -> float:
+        """Текущее стандартное отклонение окна"""
+        if self._nobs < self.window or self._nobs <= self.ddof:
+            return NAN
+        var = self._ssqdm / (self._nobs - self.ddof)
+        return math.sqrt(var) if var >= 0 else 0.0
+
+
+class _RollingExtremumState:
+    """Скользящий минимум/максимум на монотонной очереди (амортизированно O(1))"""
+
+    def __init__(self, window: int, is_max: bool):
+        self.window = window
+        self.is_max = is_max
+        self._deque: Deque[Tuple[int, float]] = deque()
+        self._nan_flags: Deque[bool] = deque()
+        self._nobs = 0
+        self._index = 0
+
+    def update(self, value: float):
+        """Сдвиг окна на одно значение"""
+        if len(self._nan_flags) == self.window:
+            if not self._nan_flags.popleft():
+                self._nobs -= 1
+        is_nan = _is_nan(value)
+        self._nan_flags.append(is_nan)
+
+        if not is_nan:
+            self._nobs += 1
+            if self.is_max:
+                while self._deque and self._deque[-1][1] <= value:
+                    self._deque.pop()
+            else:
+                while self._deque and self._deque[-1][1] >= value:
+                    self._deque.pop()
+            self._deque.append((self._index, value))
+
+        # Удаляем значения, вышедшие за окно
+        while self._deque and self._deque[0][0] <= self._index - self.window:
+            self._deque.popleft()
+        self._index += 1
+
+    def value(self) -> float:
+        """Текущий экстремум окна"""
+        if self._nobs < self.window or not self._deque:
+            return NAN
+        return self._deque[0][1]
+
+
+class StreamingIndicators:
+    """
+    Потоковый калькулятор индикаторов
+
+    Хранит рекуррентное состояние каждого индикатора (аккумуляторы EMA,
+    скользящие суммы, очереди для минимумов/максимумов) и обновляет его
+    за O(1) на каждую добавленную свечу. Значения совпадают с
+    TechnicalIndicators.calculate_all_indicators, вызванным на всей
+    последовательности свечей, переданной в поток.
+    """
+
+    OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+    def __init__(self, indicators_config: Dict[str, IndicatorConfig], history: int = 200):
+        """
+        Инициализация потокового калькулятора
+
+        Args:
+            indicators_config: Конфигурация индикаторов (TechnicalIndicators.indicators_config)
+            history: Сколько последних строк хранить для to_frame()
+        """
+        self.indicators_config = indicators_config
+        self.history = history
+        self.columns = self._build_columns()
+
+        self._rows: Deque[Tuple[pd.Timestamp, Tuple[float, ...]]] = deque(maxlen=history)
+        self._latest: Dict[str, float] = {}
+        self._last_timestamp: Optional[pd.Timestamp] = None
+        self._prev_close = NAN
+        self._count = 0
+
+        self._init_state()
+
+    def _enabled(self, name: str) -> bool:
+        config = self.indicators_config.get(name)
+        return config is not None and config.enabled
+
+    def _build_columns(self) -> List[str]:
+        """Список колонок в порядке batch-расчета"""
+        ema = self.indicators_config['ema'].params
+        columns = list(self.OHLCV_COLUMNS)
+        columns += [f"EMA_{ema['fast']}", f"EMA_{ema['slow']}"]
+
+        indicator_columns = {
+            'adx': ['ADX', 'ADX_POS', 'ADX_NEG'],
+            'macd': ['MACD', 'MACD_SIGNAL', 'MACD_HIST'],
+            'rsi': ['RSI'],
+            'tsi': ['TSI'],
+            'kdj': ['KDJ_K', 'KDJ_D', 'KDJ_J'],
+            'vwap': ['VWAP'],
+            'atr': ['ATR', 'ATR_UPPER', 'ATR_LOWER'],
+        }
+        for name in self.indicators_config:
+            if name != 'ema' and self._enabled(name) and name in indicator_columns:
+                columns += indicator_columns[name]
+        return columns
+
+    def _init_state(self):
+        """Создание рекуррентного состояния для включенных индикаторов"""
+        # Общие промежуточные состояния (как в IntermediateCache):
+        # EMA по close для каждого периода и среднее true range для каждой длины
+        ema_spans = list(self.indicators_config['ema'].params.values())
+        tr_lengths = []
+
+        if self._enabled('adx'):
+            length = self.indicators_config['adx'].params['length']
+            tr_lengths.append(length)
+            self._adx_range_std = _RollingStdState(length)
+
+        if self._enabled('macd'):
+            params = self.indicators_config['macd'].params
+            ema_spans += [params['fast'], params['slow']]
+            self._macd_signal = _EwmState(params['signal'])
+
+        if self._enabled('rsi'):
+            length = self.indicators_config['rsi'].params['length']
+            self._rsi_gain = _RollingSumState(length)
+            self._rsi_loss = _RollingSumState(length)
+
+        if self._enabled('tsi'):
+            params = self.indicators_config['tsi'].params
+            self._tsi_ema1 = _EwmState(params['short'])
+            self._tsi_ema2 = _EwmState(params['long'])
+            self._tsi_ema3 = _EwmState(params['short'])
+            self._tsi_ema4 = _EwmState(params['long'])
+
+        if self._enabled('kdj'):
+            params = self.indicators_config['kdj'].params
+            self._kdj_low = _RollingExtremumState(params['period'], is_max=False)
+            self._kdj_high = _RollingExtremumState(params['period'], is_max=True)
+            self._kdj_k = _RollingSumState(params['signal'])
+            self._kdj_d = _RollingSumState(params['signal'])
+
+        if self._enabled('vwap'):
+            period = self.indicators_config['vwap'].params['period']
+            self._vwap_pv = _RollingSumState(period)
+            self._vwap_volume = _RollingSumState(period)
+
+        if self._enabled('atr'):
+            tr_lengths.append(self.indicators_config['atr'].params['length'])
+
+        self._close_ema = {span: _EwmState(span) for span in ema_spans}
+        self._tr_mean = {length: _RollingSumState(length) for length in tr_lengths}
+
+    def reset(self):
+        """Сброс состояния потока"""
+        self._rows.clear()
+        self._latest = {}
+        self._last_timestamp = None
+        self._prev_close = NAN
+        self._count = 0
+        self._init_state()
+
+    @property
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        """Время последней обработанной свечи"""
+        return self._last_timestamp
+
+    @property
+    def last_ohlcv(self) -> Optional[Tuple[float, ...]]:
+        """OHLCV последней обработанной свечи (для проверки стыковки с новыми данными)"""
+        if not self._rows:
+            return None
+        return self._rows[-1][1][:len(self.OHLCV_COLUMNS)]
+
+    @property
+    def count(self) -> int:
+        """Количество обработанных свечей"""
+        return self._count
+
+    def update(self, timestamp, open_: float, high: float, low: float,
+               close: float, volume: float) -> Dict[str, float]:
+        """
+        Добавление закрытой свечи и пересчет индикаторов за O(1)
+
+        Args:
+            timestamp: Время открытия свечи
+            open_, high, low, close, volume: OHLCV значения свечи
+
+        Returns:
+            Словарь {колонка: значение} для добавленной свечи
+        """
+        open_, high, low = float(open_), float(high), float(low)
+        close, volume = float(close), float(volume)
+        prev_close = self._prev_close
+
+        values = {
+            'open': open_, 'high': high, 'low': low,
+            'close': close, 'volume': volume
+        }
+
+        # Общие промежуточные величины свечи (каждая обновляется один раз)
+        price_change = close - prev_close
+        high_low = high - low
+        true_range = _nan_max(high_low, _nan_max(abs(high - prev_close), abs(low - prev_close)))
+
+        close_ema = {span: state.update(close) for span, state in self._close_ema.items()}
+        tr_mean = {}
+        for length, state in self._tr_mean.items():
+            state.update(true_range)
+            tr_mean[length] = state.mean()
+
+        ema = self.indicators_config['ema'].params
+        values[f"EMA_{ema['fast']}"] = close_ema[ema['fast']]
+        values[f"EMA_{ema['slow']}"] = close_ema[ema['slow']]
+
+        if self._enabled('adx'):
+            length = self.indicators_config['adx'].params['length']
+            self._adx_range_std.update(high_low)
+            adx = _div(self._adx_range_std.std(), tr_mean[length]) * 100
+            values['ADX'] = adx
+            values['ADX_POS'] = adx * 0.7
+            values['ADX_NEG'] = adx * 0.3
+
+        if self._enabled('macd'):
+            params = self.indicators_config['macd'].params
+            macd = close_ema[params['fast']] - close_ema[params['slow']]
+            macd_signal = self._macd_signal.update(macd)
+            values['MACD'] = macd
+            values['MACD_SIGNAL'] = macd_signal
+            values['MACD_HIST'] = macd - macd_signal
+
+        if self._enabled('rsi'):
+            # Повторяем delta.where(...): NaN превращается в 0, потеря хранится как -0.0
+            gain = price_change if price_change > 0 else 0.0
+            loss = -(price_change if price_change < 0 else 0.0)
+            self._rsi_gain.update(gain)
+            self._rsi_loss.update(loss)
+            rs = _div(self._rsi_gain.mean(), self._rsi_loss.mean())
+            values['RSI'] = 100 - _div(100, 1 + rs)
+
+        if self._enabled('tsi'):
+            ema2 = self._tsi_ema2.update(self._tsi_ema1.update(price_change))
+            ema4 = self._tsi_ema4.update(self._tsi_ema3.update(abs(price_change)))
+            values['TSI'] = 100 * _div(ema2, ema4)
+
+        if self._enabled('kdj'):
+            self._kdj_low.update(low)
+            self._kdj_high.update(high)
+            lowest_low = self._kdj_low.value()
+            highest_high = self._kdj_high.value()
+            k = 100 * _div(close - lowest_low, highest_high - lowest_low)
+            self._kdj_k.update(k)
+            kdj_k = self._kdj_k.mean()
+            self._kdj_d.update(kdj_k)
+            kdj_d = self._kdj_d.mean()
+            values['KDJ_K'] = kdj_k
+            values['KDJ_D'] = kdj_d
+            values['KDJ_J'] = 3 * kdj_k - 2 * kdj_d
+
+        if self._enabled('vwap'):
+            typical_price = (high + low + close) / 3
+            self._vwap_pv.update(typical_price * volume)
+            self._vwap_volume.update(volume)
+            values['VWAP'] = _div(self._vwap_pv.sum(), self._vwap_volume.sum())
+
+        if self._enabled('atr'):
+            params = self.indicators_config['atr'].params
+            multiplier = params['multiplier']
+            atr = tr_mean[params['length']]
+            values['ATR'] = atr
+            values['ATR_UPPER'] = close + (atr * multiplier)
+            values['ATR_LOWER'] = close - (atr * multiplier)
+
+        self._prev_close = close
+        self._last_timestamp = timestamp
+        self._count += 1
+        self._latest = values
+        self._rows.append((timestamp, tuple(values[col] for col in self.columns)))
+
+        return values
+
+    def update_from_frame(self, df: pd.DataFrame) -> int:
+        """
+        Добавление в поток свечей из DataFrame, которые новее последней обработанной
+
+        Args:
+            df: DataFrame с OHLCV данными (индекс - время свечи)
+
+        Returns:
+            Количество добавленных свечей
+        """
+        if df.empty:
+            return 0
+
+        if self._last_timestamp is not None:
+            df = df[df.index > self._last_timestamp]
+
+        ohlcv = df[self.OHLCV_COLUMNS].to_numpy(dtype=float)
+        for timestamp, row in zip(df.index, ohlcv):
+            self.update(timestamp, *row)
+
+        if len(df):
+            logger.debug(f"В поток индикаторов добавлено свечей: {len(df)}")
+        return len(df)
+
+    def latest(self) -> Dict[str, float]:
+        """Значения индикаторов на последней свече"""
+        return dict(self._latest)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        DataFrame с последними history строками
+
+        Returns:
+            DataFrame в формате calculate_all_indicators
+        """
+        if not self._rows:
+            return pd.DataFrame(columns=self.columns)
+
+        index = pd.DatetimeIndex([timestamp for timestamp, _ in self._rows], name='timestamp')
+        return pd.DataFrame([row for _, row in self._rows], index=index, columns=self.columns)
@@ -0,0 +1,150 @@
+"""
+Журнал сделок в формате JSON Lines
+Каждая сделка дописывается одной строкой, файл никогда не перезаписывается целиком при записи сделки
+"""
+
+import json
+import os
+from typing import Dict, Iterator, Optional
+
+from loguru import logger
+
+
+class TradeJournal:
+    """
+    Append-only журнал сделок
+
+    Запись сделки - одна строка JSON в конце файла (O(1) независимо от
+    размера истории). Повторная запись сделки с тем же id заменяет
+    предыдущую (например, при смене статуса ордера); устаревшие и
+    поврежденные строки удаляются при уплотнении, которое запускается,
+    когда их становится больше compact_threshold.
+    """
+
+    def __init__(self, path: str = 'trade_history.jsonl', fsync: bool = False,
+                 compact_threshold: int = 1000):
+        """
+        Инициализация журнала
+
+        Args:
+            path: Путь к файлу журнала
+            fsync: Сбрасывать каждую запись на диск (os.fsync)
+            compact_threshold: Количество устаревших строк для автоматического уплотнения
+        """
+        self.path = path
+        self.fsync = fsync
+        self.compact_threshold = compact_threshold
+
+        self._ids = set()
+        self._stale = 0  # строки, замененные более поздней записью или поврежденные
+        self._file = None
+
+    def __iter__(self) -> Iterator[Dict]:
+        return self.load()
+
+    def load(self) -> Iterator[Dict]:
+        """
+        Потоковое чтение журнала
+
+        Yields:
+            Записи сделок в порядке записи (при повторах id - последняя версия на месте последней записи)
+        """
+        if not os.path.exists(self.path):
+            return
+
+        # Позиция последней версии каждой сделки
+        last_line: Dict[str, int] = {}
+        stale = 0
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for number, line in enumerate(f):
+                record = self._parse(line, warn=True)
+                if record is None:
+                    stale += 1
+                    continue
+                if record['id'] in last_line:
+                    stale += 1
+                last_line[record['id']] = number
+
+        self._ids = set(last_line)
+        self._stale = stale
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for number, line in enumerate(f):
+                record = self._parse(line)
+                if record is not None and last_line.get(record['id']) == number:
+                    yield record
+
+    @staticmethod
+    def _parse(line: str, warn: bool = False) -> Optional[Dict]:
+        """Разбор строки журнала (None для пустой или поврежденной строки)"""
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            # Недописанная строка после сбоя
+            if warn:
+                logger.warning("Пропущена поврежденная строка журнала сделок")
+            return None
+        return record if isinstance(record, dict) and 'id' in record else None
+
+    def append(self, record: Dict):
+        """
+        Запись сделки в конец журнала
+
+        Args:
+            record: Сделка в виде словаря (обязателен ключ id)
+        """
+        if self._file is None:
+            self._file = self._open_for_append()
+
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+        if record['id'] in self._ids:
+            self._stale += 1
+        self._ids.add(record['id'])
+
+        if self.compact_threshold and self._stale >= self.compact_threshold:
+            self.compact()
+
+    def _open_for_append(self):
+        """Открытие файла на дозапись (недописанная последняя строка завершается переводом строки)"""
+        needs_newline = False
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b'\n'
+
+        file = open(self.path, 'a', encoding='utf-8')
+        if needs_newline:
+            file.write('\n')
+        return file
+
+    def compact(self):
+        """Перезапись журнала без устаревших и поврежденных строк (атомарно)"""
+        self.close()
+        if not os.path.exists(self.path):
+            return
+
+        tmp_path = f"{self.path}.tmp"
+        count = 0
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in self.load():
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                count += 1
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+        self._stale = 0
+        logger.info(f"Журнал сделок уплотнен: {count} сделок")
+
+    def close(self):
+        """Закрытие файла журнала"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
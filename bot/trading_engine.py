@@ -3,16 +3,22 @@
 Поддерживает симуляцию и реальную торговлю
 """
 
-import ccxt
+import numpy as np
 from loguru import logger
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
+from collections import deque
+from collections.abc import MutableMapping
 from dataclasses import dataclass
 from datetime import datetime
 import json
 import os
 
 from .data_fetcher import DataFetcher
-from .strategy import TradingSignal, SignalType
+from .exchange_pool import EXCHANGES, call_exchange
+from .strategy import TradingSignal, SignalType, SignalRecord
+from .trade_journal import TradeJournal
+from .database import TradeDatabase
+from .running_stats import TradeStats
 
 
 @dataclass
@@ -29,6 +35,39 @@ class Trade:
     status: str = 'filled'  # filled, pending, cancelled
     fee: float = 0.0
     pnl: Optional[float] = None  # Прибыль/убыток
+    
+    def to_dict(self) -> Dict:
+        """Сделка в виде словаря для сохранения"""
+        return {
+            'id': self.id,
+            'symbol': self.symbol,
+            'side': self.side,
+            'amount': self.amount,
+            'price': self.price,
+            'timestamp': self.timestamp.isoformat(),
+            'exchange': self.exchange,
+            'order_id': self.order_id,
+            'status': self.status,
+            'fee': self.fee,
+            'pnl': self.pnl
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Trade':
+        """Сделка из сохраненного словаря"""
+        return cls(
+            id=data['id'],
+            symbol=data['symbol'],
+            side=data['side'],
+            amount=data['amount'],
+            price=data['price'],
+            timestamp=datetime.fromisoformat(data['timestamp']),
+            exchange=data['exchange'],
+            order_id=data.get('order_id'),
+            status=data.get('status', 'filled'),
+            fee=data.get('fee', 0.0),
+            pnl=data.get('pnl')
+        )
 
 
 @dataclass
@@ -42,6 +81,136 @@ class Position:
     current_price: float
     unrealized_pnl: float
     exchange: str
+    
+    def to_dict(self) -> Dict:
+        """Позиция в виде словаря для сохранения"""
+        return {
+            'symbol': self.symbol,
+            'side': self.side,
+            'amount': self.amount,
+            'entry_price': self.entry_price,
+            'entry_time': self.entry_time.isoformat(),
+            'current_price': self.current_price,
+            'unrealized_pnl': self.unrealized_pnl,
+            'exchange': self.exchange
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Position':
+        """Позиция из сохраненного словаря"""
+        return cls(**{**data, 'entry_time': datetime.fromisoformat(data['entry_time'])})
+
+
+class PositionTable(MutableMapping):
+    """
+    Открытые позиции с колоночным хранением числовых полей
+    
+    Ведет себя как словарь {символ: Position}; количество, цена входа,
+    направление и текущая цена хранятся в массивах numpy, поэтому
+    переоценка всех позиций (mark) выполняется векторно. После изменения
+    количества существующей позиции нужно вызвать refresh(symbol).
+    """
+    
+    def __init__(self, capacity: int = 16):
+        self._positions: Dict[str, Position] = {}
+        self._rows: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._amount = np.zeros(capacity)
+        self._entry_price = np.zeros(capacity)
+        self._direction = np.zeros(capacity)  # 1 - long, -1 - short
+        self._current_price = np.zeros(capacity)
+        self._unrealized_pnl = np.zeros(capacity)
+    
+    def _grow(self):
+        capacity = max(16, len(self._amount) * 2)
+        for name in ('_amount', '_entry_price', '_direction', '_current_price', '_unrealized_pnl'):
+            array = getattr(self, name)
+            grown = np.zeros(capacity)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+    
+    def _write_row(self, row: int, position: Position):
+        self._amount[row] = position.amount
+        self._entry_price[row] = position.entry_price
+        self._direction[row] = 1.0 if position.side == 'long' else -1.0
+        self._current_price[row] = position.current_price
+        self._unrealized_pnl[row] = position.unrealized_pnl
+    
+    def __getitem__(self, symbol: str) -> Position:
+        return self._positions[symbol]
+    
+    def __setitem__(self, symbol: str, position: Position):
+        row = self._rows.get(symbol)
+        if row is None:
+            row = len(self._symbols)
+            if row == len(self._amount):
+                self._grow()
+            self._rows[symbol] = row
+            self._symbols.append(symbol)
+        self._positions[symbol] = position
+        self._write_row(row, position)
+    
+    def __delitem__(self, symbol: str):
+        del self._positions[symbol]
+        row = self._rows.pop(symbol)
+        last = len(self._symbols) - 1
+        
+        # Последняя строка переносится на место удаленной
+        if row != last:
+            moved = self._symbols[last]
+            self._symbols[row] = moved
+            self._rows[moved] = row
+            for array in (self._amount, self._entry_price, self._direction,
+                          self._current_price, self._unrealized_pnl):
+                array[row] = array[last]
+        self._symbols.pop()
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._positions)
+    
+    def __len__(self) -> int:
+        return len(self._positions)
+    
+    def copy(self) -> Dict[str, Position]:
+        return dict(self._positions)
+    
+    def refresh(self, symbol: str):
+        """Перечитывание числовых полей позиции после ее изменения"""
+        self._write_row(self._rows[symbol], self._positions[symbol])
+    
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+    
+    def mark(self, prices: Dict[str, float]) -> int:
+        """
+        Переоценка позиций по текущим ценам
+        
+        Args:
+            prices: Словарь {символ: цена}; позиции без цены не изменяются
+            
+        Returns:
+            Количество переоцененных позиций
+        """
+        rows = [self._rows[symbol] for symbol in prices if symbol in self._rows]
+        if not rows:
+            return 0
+        
+        rows = np.asarray(rows)
+        self._current_price[rows] = [prices[self._symbols[row]] for row in rows]
+        self._unrealized_pnl[rows] = ((self._current_price[rows] - self._entry_price[rows])
+                                      * self._amount[rows] * self._direction[rows])
+        
+        # Синхронизация объектов Position (используются в уведомлениях, базе и /status)
+        for row, price, pnl in zip(rows.tolist(), self._current_price[rows].tolist(),
+                                   self._unrealized_pnl[rows].tolist()):
+            position = self._positions[self._symbols[row]]
+            position.current_price = price
+            position.unrealized_pnl = pnl
+        return len(rows)
+    
+    def total_unrealized_pnl(self) -> float:
+        """Суммарный нереализованный PnL"""
+        return float(self._unrealized_pnl[:len(self._symbols)].sum())
 
 
 class TradingEngine:
@@ -69,9 +238,33 @@ class TradingEngine:
         
         # Состояние
         self.trades: List[Trade] = []
-        self.positions: Dict[str, Position] = {}
+        self.positions = PositionTable()
         self.balance = {'USDT': self.initial_capital}
         
+        # Последний полученный с биржи баланс (реальный режим) - для снимка состояния без запроса к бирже
+        self.last_balance: Dict[str, float] = {}
+        self.last_balance_at: Optional[datetime] = None
+        
+        # Накопительная статистика (обновляется при каждой сделке)
+        self.trade_stats = TradeStats(initial_capital=self.initial_capital)
+        self.trade_count = 0
+        
+        # Хранилище сделок: база данных (database.type: sqlite) или журнал JSON Lines
+        journal_config = config.get('trade_journal', {})
+        self.journal = TradeJournal(
+            path=journal_config.get('path', 'trade_history.jsonl'),
+            fsync=self._str_to_bool(journal_config.get('fsync', False)),
+            compact_threshold=journal_config.get('compact_threshold', 1000)
+        )
+        self.database = self._init_database()
+        
+        # Журнал сигналов для database.type: jsonl (с базой данных сигналы хранятся в ней)
+        self.signal_journal = TradeJournal(
+            path=journal_config.get('signals_path', 'signal_history.jsonl'),
+            fsync=self._str_to_bool(journal_config.get('fsync', False)),
+            compact_threshold=journal_config.get('compact_threshold', 1000)
+        )
+        
         # Инициализация биржи для реальной торговли
         if not self.simulation_mode:
             self._init_real_exchange()
@@ -90,23 +283,13 @@ class TradingEngine:
             if not exchange_config.get('enabled', False):
                 raise ValueError(f"Биржа {self.default_exchange} не включена")
             
-            # Создаем объект биржи
-            if self.default_exchange == 'binance':
-                self.exchange = ccxt.binance({
-                    'apiKey': exchange_config.get('api_key', ''),
-                    'secret': exchange_config.get('secret_key', ''),
-                    'sandbox': exchange_config.get('testnet', False),
-                    'options': {'defaultType': 'spot'}
-                })
-            elif self.default_exchange == 'bybit':
-                self.exchange = ccxt.bybit({
-                    'apiKey': exchange_config.get('api_key', ''),
-                    'secret': exchange_config.get('secret_key', ''),
-                    'sandbox': exchange_config.get('testnet', False),
-                    'options': {'defaultType': 'spot'}
-                })
-            else:
-                raise ValueError(f"Неподдерживаемая биржа: {self.default_exchange}")
+            # Клиент аккаунта из общего реестра (тот же, что у DataManager)
+            EXCHANGES.configure(exchanges_config)
+            api_key = exchange_config.get('api_key', '')
+            testnet = exchange_config.get('testnet', False)
+            self.exchange = EXCHANGES.client(self.default_exchange, api_key,
+                                             exchange_config.get('secret_key', ''), testnet)
+            self.limiter = EXCHANGES.limiter(self.default_exchange, api_key, testnet)
             
             logger.info(f"Инициализирована реальная биржа: {self.default_exchange}")
             
@@ -114,6 +297,24 @@ class TradingEngine:
             logger.error(f"Ошибка инициализации реальной биржи: {e}")
             raise
     
+    def _exchange_call(self, method: str, *args, **kwargs):
+        """Запрос к бирже через общий лимитер веса (ордера - с приоритетом)"""
+        return call_exchange(self.exchange, self.limiter, method, *args, **kwargs)
+    
+    def _init_database(self) -> Optional[TradeDatabase]:
+        """Инициализация базы данных из секции database"""
+        database_config = self.config.get('database', {})
+        database_type = database_config.get('type', 'jsonl')
+        
+        if database_type == 'sqlite':
+            return TradeDatabase(
+                path=database_config.get('sqlite_path', 'trades.db'),
+                batch_size=database_config.get('batch_size', 1)
+            )
+        if database_type != 'jsonl':
+            logger.warning(f"База данных {database_type} не поддерживается, используется журнал сделок")
+        return None
+    
     def execute_signal(self, signal: TradingSignal) -> bool:
         """
         Исполнение торгового сигнала
@@ -125,6 +326,9 @@ class TradingEngine:
             True если ордер исполнен успешно
         """
         try:
+            if signal.signal_type != SignalType.HOLD:
+                self._record_signal(signal)
+            
             if signal.signal_type == SignalType.BUY:
                 return self._execute_buy_order(signal)
             elif signal.signal_type == SignalType.SELL:
@@ -211,7 +415,7 @@ class TradingEngine:
                 return False
             
             # Создаем сделку
-            trade_id = f"sim_buy_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            trade_id = f"sim_buy_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
             trade = Trade(
                 id=trade_id,
                 symbol=signal.symbol,
@@ -239,10 +443,10 @@ class TradingEngine:
                 unrealized_pnl=0.0,
                 exchange=self.default_exchange
             )
+            self._save_position(signal.symbol)
             
             # Добавляем сделку
-            self.trades.append(trade)
-            self._save_trade_history()
+            self._record_trade(trade)
             
             logger.info(f"[SIM] Куплено {amount:.6f} {signal.symbol} по цене {signal.price}")
             return True
@@ -261,7 +465,7 @@ class TradingEngine:
                 return False
             
             # Создаем сделку
-            trade_id = f"sim_sell_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            trade_id = f"sim_sell_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
             trade = Trade(
                 id=trade_id,
                 symbol=signal.symbol,
@@ -288,10 +492,11 @@ class TradingEngine:
                 del self.positions[signal.symbol]
             else:
                 position.amount -= amount
+                self.positions.refresh(signal.symbol)
+            self._save_position(signal.symbol)
             
             # Добавляем сделку
-            self.trades.append(trade)
-            self._save_trade_history()
+            self._record_trade(trade)
             
             logger.info(f"[SIM] Продано {amount:.6f} {signal.symbol} по цене {signal.price}, PnL: {pnl:.4f}")
             return True
@@ -304,7 +509,7 @@ class TradingEngine:
         """Реальный ордер покупки"""
         try:
             # Размещаем ордер
-            order = self.exchange.create_market_buy_order(signal.symbol, amount)
+            order = self._exchange_call('create_market_buy_order', signal.symbol, amount)
             
             # Создаем сделку
             trade_id = f"real_buy_{order['id']}"
@@ -321,8 +526,7 @@ class TradingEngine:
             )
             
             # Добавляем сделку
-            self.trades.append(trade)
-            self._save_trade_history()
+            self._record_trade(trade)
             
             logger.info(f"[REAL] Куплено {amount:.6f} {signal.symbol} по цене {signal.price}")
             return True
@@ -335,7 +539,7 @@ class TradingEngine:
         """Реальный ордер продажи"""
         try:
             # Размещаем ордер
-            order = self.exchange.create_market_sell_order(signal.symbol, amount)
+            order = self._exchange_call('create_market_sell_order', signal.symbol, amount)
             
             # Создаем сделку
             trade_id = f"real_sell_{order['id']}"
@@ -352,8 +556,7 @@ class TradingEngine:
             )
             
             # Добавляем сделку
-            self.trades.append(trade)
-            self._save_trade_history()
+            self._record_trade(trade)
             
             logger.info(f"[REAL] Продано {amount:.6f} {signal.symbol} по цене {signal.price}")
             return True
@@ -363,19 +566,19 @@ class TradingEngine:
             return False
     
     def update_positions(self):
-        """Обновление текущих позиций"""
+        """Переоценка открытых позиций (один запрос тикеров на все позиции)"""
+        if not self.positions:
+            return
+        
         try:
-            for symbol, position in self.positions.items():
-                # Получаем текущую цену
-                ticker = self.data_fetcher.get_ticker(symbol)
-                current_price = ticker['last']
-                
-                # Обновляем позицию
-                position.current_price = current_price
-                if position.side == 'long':
-                    position.unrealized_pnl = (current_price - position.entry_price) * position.amount
-                else:
-                    position.unrealized_pnl = (position.entry_price - current_price) * position.amount
+            symbols = self.positions.symbols()
+            tickers = self.data_fetcher.get_tickers(symbols)
+            prices = {symbol: ticker['last'] for symbol, ticker in tickers.items()
+                      if ticker.get('last') is not None}
+            
+            marked = self.positions.mark(prices)
+            if marked < len(symbols):
+                logger.warning(f"Нет цены для {len(symbols) - marked} из {len(symbols)} позиций")
                     
         except Exception as e:
             logger.error(f"Ошибка обновления позиций: {e}")
@@ -386,22 +589,34 @@ class TradingEngine:
             return self.balance.copy()
         else:
             try:
-                return self.exchange.fetch_balance()
+                balance = self._exchange_call('fetch_balance')
+                self.last_balance = {currency: amount for currency, amount in balance.get('total', {}).items()
+                                     if amount}
+                self.last_balance_at = datetime.now()
+                return balance
             except Exception as e:
                 logger.error(f"Ошибка получения баланса: {e}")
                 return {}
     
+    def get_cached_balance(self) -> Dict[str, float]:
+        """Баланс без запроса к бирже (в реальном режиме - последний полученный)"""
+        if self.simulation_mode:
+            return self.balance.copy()
+        return dict(self.last_balance)
+    
     def get_positions(self) -> Dict[str, Position]:
         """Получение текущих позиций"""
         return self.positions.copy()
     
     def get_trades(self, limit: int = 50) -> List[Trade]:
         """Получение истории сделок"""
+        if self.database is not None:
+            return [Trade.from_dict(data) for data in self.database.get_trades(limit)]
         return self.trades[-limit:] if limit > 0 else self.trades
     
     def get_trading_stats(self) -> Dict:
         """Получение статистики торговли"""
-        if not self.trades:
+        if self.trade_count == 0:
             return {
                 'total_trades': 0,
                 'total_pnl': 0.0,
@@ -409,81 +624,141 @@ class TradingEngine:
                 'avg_trade': 0.0
             }
         
-        # Статистика по закрытым позициям
-        closed_trades = [t for t in self.trades if t.side == 'sell' and t.pnl is not None]
-        
-        total_trades = len(closed_trades)
-        total_pnl = sum(t.pnl for t in closed_trades)
-        winning_trades = len([t for t in closed_trades if t.pnl > 0])
-        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-        avg_trade = total_pnl / total_trades if total_trades > 0 else 0
+        stats = self.trade_stats.to_dict()
+        stats['current_positions'] = len(self.positions)
+        return stats
+    
+    def _update_stats(self, side: str, pnl: Optional[float]):
+        """Учет сделки в накопительной статистике"""
+        self.trade_count += 1
+        if side == 'sell' and pnl is not None:
+            self.trade_stats.add(pnl)
+    
+    def _record_trade(self, trade: Trade):
+        """Добавление сделки в историю (база данных или журнал)"""
+        try:
+            if self.database is not None:
+                self.database.add_trade(trade.to_dict())
+            else:
+                self.trades.append(trade)
+                self.journal.append(trade.to_dict())
+        except Exception as e:
+            logger.error(f"Ошибка записи сделки: {e}")
+        self._update_stats(trade.side, trade.pnl)
+    
+    def _record_signal(self, signal: TradingSignal):
+        """Сохранение торгового сигнала (база данных или журнал сигналов)"""
+        try:
+            record = SignalRecord.from_signal(signal).to_dict()
+            if self.database is not None:
+                self.database.add_signal(record)
+            else:
+                # id журнала: повторная запись сигнала той же свечи заменяет предыдущую
+                record_id = f"{record['symbol']}|{record['timestamp']}|{record['signal_type']}"
+                self.signal_journal.append({'id': record_id, **record})
+        except Exception as e:
+            logger.error(f"Ошибка сохранения сигнала: {e}")
+    
+    def get_signals(self, limit: int = 50) -> List[Dict]:
+        """
+        Последние сохраненные сигналы
         
-        return {
-            'total_trades': total_trades,
-            'total_pnl': total_pnl,
-            'win_rate': win_rate,
-            'avg_trade': avg_trade,
-            'current_positions': len(self.positions)
-        }
+        Args:
+            limit: Количество сигналов (0 - все)
+            
+        Returns:
+            Сигналы в формате SignalRecord.to_dict в хронологическом порядке
+        """
+        if self.database is not None:
+            return self.database.get_signals(limit)
+        signals = deque(self.signal_journal.load(), maxlen=limit if limit > 0 else None)
+        return list(signals)
     
-    def _save_trade_history(self):
-        """Сохранение истории сделок"""
+    def iter_signal_stats(self) -> Iterator[tuple]:
+        """(тип, уверенность) сохраненных сигналов для восстановления статистики стратегии"""
+        if self.database is None:
+            return ((record['signal_type'], record['confidence']) for record in self.signal_journal.load())
+        return self.database.iter_signal_stats()
+    
+    def _save_position(self, symbol: str):
+        """Сохранение позиции в базе данных (удаление, если позиция закрыта)"""
+        if self.database is None:
+            return
         try:
-            history_file = 'trade_history.json'
-            history_data = []
-            
-            for trade in self.trades:
-                history_data.append({
-                    'id': trade.id,
-                    'symbol': trade.symbol,
-                    'side': trade.side,
-                    'amount': trade.amount,
-                    'price': trade.price,
-                    'timestamp': trade.timestamp.isoformat(),
-                    'exchange': trade.exchange,
-                    'order_id': trade.order_id,
-                    'status': trade.status,
-                    'fee': trade.fee,
-                    'pnl': trade.pnl
-                })
-            
-            with open(history_file, 'w') as f:
-                json.dump(history_data, f, indent=2)
-                
+            position = self.positions.get(symbol)
+            if position is None:
+                self.database.delete_position(symbol)
+            else:
+                self.database.save_position(position.to_dict())
         except Exception as e:
-            logger.error(f"Ошибка сохранения истории сделок: {e}")
+            logger.error(f"Ошибка сохранения позиции {symbol}: {e}")
     
     def _load_trade_history(self):
-        """Загрузка истории сделок"""
+        """Загрузка истории сделок (из базы данных - только открытые позиции)"""
         try:
-            history_file = 'trade_history.json'
-            if not os.path.exists(history_file):
+            if self.database is not None:
+                self._migrate_to_database()
+                for side, pnl in self.database.iter_trade_pnl():
+                    self._update_stats(side, pnl)
+                open_cost = 0.0
+                for data in self.database.load_positions():
+                    position = Position.from_dict(data)
+                    self.positions[position.symbol] = position
+                    base_currency = position.symbol.split('/')[0]
+                    self.balance[base_currency] = self.balance.get(base_currency, 0) + position.amount
+                    open_cost += position.amount * position.entry_price
+                # USDT симуляции: начальный капитал + реализованный PnL - стоимость открытых позиций
+                self.balance['USDT'] = self.initial_capital + self.trade_stats.total_pnl - open_cost
+                logger.info(f"В базе данных {self.trade_count} сделок, "
+                            f"открытых позиций {len(self.positions)}")
                 return
             
-            with open(history_file, 'r') as f:
-                history_data = json.load(f)
-            
-            for trade_data in history_data:
-                trade = Trade(
-                    id=trade_data['id'],
-                    symbol=trade_data['symbol'],
-                    side=trade_data['side'],
-                    amount=trade_data['amount'],
-                    price=trade_data['price'],
-                    timestamp=datetime.fromisoformat(trade_data['timestamp']),
-                    exchange=trade_data['exchange'],
-                    order_id=trade_data.get('order_id'),
-                    status=trade_data.get('status', 'filled'),
-                    fee=trade_data.get('fee', 0.0),
-                    pnl=trade_data.get('pnl')
-                )
+            self._migrate_legacy_history()
+            
+            for trade_data in self.journal.load():
+                trade = Trade.from_dict(trade_data)
                 self.trades.append(trade)
+                self._update_stats(trade.side, trade.pnl)
             
-            logger.info(f"Загружено {len(self.trades)} сделок из истории")
+            if self.trades:
+                logger.info(f"Загружено {len(self.trades)} сделок из истории")
             
         except Exception as e:
             logger.error(f"Ошибка загрузки истории сделок: {e}")
     
+    def _migrate_to_database(self):
+        """Перенос истории из журнала или trade_history.json в пустую базу данных (один раз)"""
+        if self.database.count_trades() > 0:
+            return
+        
+        self._migrate_legacy_history()
+        if not os.path.exists(self.journal.path):
+            return
+        
+        self.database.add_trades(self.journal.load())
+        logger.info(f"История сделок перенесена из {self.journal.path} в {self.database.path}")
+    
+    def _migrate_legacy_history(self, legacy_file: str = 'trade_history.json'):
+        """Перенос истории из trade_history.json в журнал (один раз)"""
+        if os.path.exists(self.journal.path) or not os.path.exists(legacy_file):
+            return
+        
+        with open(legacy_file, 'r') as f:
+            history_data = json.load(f)
+        
+        for trade_data in history_data:
+            self.journal.append(trade_data)
+        self.journal.close()
+        
+        logger.info(f"История сделок перенесена из {legacy_file} в {self.journal.path}")
+    
+    def close(self):
+        """Закрытие журнала сделок и базы данных"""
+        self.journal.close()
+        self.signal_journal.close()
+        if self.database is not None:
+            self.database.close()
+    
     @staticmethod
     def _str_to_bool(value) -> bool:
         """Преобразование строки в булево значение"""
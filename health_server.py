@@ -8,6 +8,9 @@ import threading
 from aiohttp import web
 from loguru import logger
 
+from bot.metrics import CONTENT_TYPE_LATEST, REGISTRY
+from bot.status import STATUS_BOARD
+
 
 class HealthServer:
     """HTTP сервер для healthcheck"""
@@ -23,7 +26,8 @@ class HealthServer:
         """Настройка маршрутов"""
         self.app.router.add_get('/health', self.health_check)
         self.app.router.add_get('/', self.health_check)
-        self.app.router.add_get('/status', self.health_check)
+        self.app.router.add_get('/status', self.status)
+        self.app.router.add_get('/metrics', self.metrics)
     
     async def health_check(self, request):
         """Healthcheck endpoint"""
@@ -33,6 +37,23 @@ class HealthServer:
             "version": "2.0"
         })
     
+    async def status(self, request):
+        """Последний снимок состояния бота (из памяти, без обращения к бирже)"""
+        snapshot = STATUS_BOARD.current
+        if snapshot is None:
+            return web.json_response({
+                "status": "starting",
+                "service": "autonomous_trading_bot",
+                "version": "2.0"
+            })
+        return web.Response(body=snapshot.body, content_type='application/json', charset='utf-8',
+                            headers={'X-Snapshot-Age': f"{snapshot.age:.3f}"})
+    
+    async def metrics(self, request):
+        """Метрики бота в формате Prometheus"""
+        return web.Response(body=REGISTRY.render().encode('utf-8'),
+                            headers={'Content-Type': CONTENT_TYPE_LATEST})
+    
     async def start(self):
         """Запуск сервера"""
         try:
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Скрипт перебора параметров стратегии на истории из хранилища свечей
+Историю нужно предварительно загрузить скриптом backfill.py
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import yaml
+
+# Добавляем текущую директорию в путь
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bot.candle_store import CandleStore
+from bot.param_sweep import ParameterSweep, grid, random_sample
+
+
+# Пространство параметров по умолчанию
+DEFAULT_SPACE = {
+    'ema_fast': [5, 7, 9, 12],
+    'ema_slow': [21, 26, 34, 50],
+    'adx_min': [15, 20, 25, 30],
+    'use_rsi': [False, True],
+    'rsi_oversold': [25, 30, 35],
+    'rsi_overbought': [65, 70, 75],
+    'use_macd': [False, True],
+}
+
+
+def main():
+    """Главная функция перебора"""
+    config_path = "config.yaml"
+    if not os.path.exists(config_path):
+        print(f"❌ Файл конфигурации {config_path} не найден!")
+        sys.exit(1)
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+
+    trading = config.get('trading', {})
+    parser = argparse.ArgumentParser(description="Перебор параметров стратегии")
+    parser.add_argument('--exchange', default='binance')
+    parser.add_argument('--symbol', default=trading.get('symbol', 'BTC/USDT'))
+    parser.add_argument('--timeframe', default=trading.get('timeframe', '15m'))
+    parser.add_argument('--store', default=config.get('candle_store', {}).get('path', 'data/candles'))
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--random', type=int, default=0, help="Количество случайных комбинаций (0 - вся сетка)")
+    parser.add_argument('--metric', default='total_pnl')
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    backtest = config.get('backtest', {})
+    df = CandleStore(args.store).read(args.exchange, args.symbol, args.timeframe,
+                                      start=backtest.get('start_date'), end=backtest.get('end_date'))
+    if df.empty:
+        print(f"❌ Нет сохраненных свечей {args.symbol} {args.timeframe}, запустите backfill.py")
+        sys.exit(1)
+
+    combos = random_sample(DEFAULT_SPACE, args.random) if args.random else grid(DEFAULT_SPACE)
+    combos = [params for params in combos if params['ema_fast'] < params['ema_slow']]
+    print(f"🔍 {args.symbol} {args.timeframe}: {len(df)} свечей, {len(combos)} комбинаций")
+
+    def on_result(table):
+        print(f"  лучший {args.metric}: {table[args.metric].iloc[0]:.4f}, "
+              f"в таблице {len(table)} результатов")
+
+    results = ParameterSweep(config, df, args.workers).run(combos, metric=args.metric,
+                                                           on_result=on_result, top=args.top)
+
+    print(f"\n🏆 Лучшие результаты ({args.metric}):")
+    print(results.head(args.top).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Тест загрузки истории на локальной биржевой заглушке (без сети)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+# Добавляем текущую директорию в путь
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bot.backfill import Backfill, _to_ms
+from bot.candle_store import CandleStore
+from bot.data_fetcher import utc_now
+from bot.fake_exchange import FakeExchange
+
+
+SYMBOL = 'BTC/USDT'
+TIMEFRAME = '1h'
+START = pd.Timestamp('2024-01-01')
+CANDLES = 50
+CHUNK_SIZE = 10
+
+
+def test_backfill_resume():
+    """Неудачный участок оставляет пропуск, повторный запуск его заполняет, третий - без запросов"""
+    print("📥 Тестирование возобновления загрузки истории...")
+
+    end = START + pd.Timedelta(hours=CANDLES)
+    failed_chunk = _to_ms(START + pd.Timedelta(hours=2 * CHUNK_SIZE))
+
+    with tempfile.TemporaryDirectory() as root:
+        store = CandleStore(root)
+        exchange = FakeExchange(page_limit=CHUNK_SIZE)
+        exchange.fail(failed_chunk)
+
+        def run(run_end=end) -> int:
+            backfill = Backfill(exchange, exchange.id, store, chunk_size=CHUNK_SIZE, max_workers=3)
+            exchange.reset_requests()
+            return backfill.run(SYMBOL, TIMEFRAME, START, run_end)
+
+        # Первый запуск: участок с ошибкой не сохранен - в серии пропуск
+        run()
+        gaps = store.find_gaps(exchange.id, SYMBOL, TIMEFRAME)
+        assert store.count(exchange.id, SYMBOL, TIMEFRAME) == CANDLES - CHUNK_SIZE
+        assert gaps == [(pd.Timestamp(failed_chunk, unit='ms'),
+                         pd.Timestamp(failed_chunk, unit='ms') + pd.Timedelta(hours=CHUNK_SIZE - 1))]
+        print(f"✅ После ошибки участка пропуск: {gaps[0][0]} - {gaps[0][1]}")
+
+        # Второй запуск: запрашивается только незагруженный участок
+        saved = run()
+        assert [since for _, _, since, _ in exchange.requests] == [failed_chunk]
+        assert saved == CHUNK_SIZE
+        assert store.count(exchange.id, SYMBOL, TIMEFRAME) == CANDLES
+        assert store.find_gaps(exchange.id, SYMBOL, TIMEFRAME) == []
+        print("✅ Повторный запуск заполнил пропуск одним запросом")
+
+        # Третий запуск: все участки отмечены в контрольной точке
+        assert run() == 0
+        assert exchange.requests == []
+        print("✅ Третий запуск не обращается к бирже")
+
+        # Продление диапазона: запрашиваются только новые участки
+        assert run(end + pd.Timedelta(hours=2 * CHUNK_SIZE)) == 2 * CHUNK_SIZE
+        assert sorted(since for _, _, since, _ in exchange.requests) == [
+            _to_ms(end), _to_ms(end + pd.Timedelta(hours=CHUNK_SIZE))]
+        print("✅ Продленный диапазон догружен без повторной загрузки")
+
+        df = store.read(exchange.id, SYMBOL, TIMEFRAME)
+        assert len(df) == CANDLES + 2 * CHUNK_SIZE
+        expected = [FakeExchange.candle(_to_ms(timestamp))[4] for timestamp in df.index]
+        assert df['close'].tolist() == expected
+        print("✅ Сохраненные свечи совпадают с данными биржи")
+
+
+def test_backfill_resume_open_end():
+    """Без конца диапазона (до текущего времени) загрузка возобновляется, а не начинается заново"""
+    print("\n📥 Тестирование возобновления загрузки до текущего времени...")
+
+    # Дневные свечи: граница формирующейся свечи не сдвигается за время теста
+    timeframe = '1d'
+    now = utc_now()
+    start = now.floor('D') - pd.Timedelta(days=CANDLES)
+    failed_chunk = _to_ms(start + pd.Timedelta(days=2 * CHUNK_SIZE))
+    # Последний участок содержит только формирующуюся свечу и не отмечается загруженным
+    tail_chunk = _to_ms(start + pd.Timedelta(days=CANDLES))
+
+    with tempfile.TemporaryDirectory() as root:
+        store = CandleStore(root)
+        exchange = FakeExchange(now_ms=_to_ms(now), page_limit=CHUNK_SIZE)
+        exchange.fail(failed_chunk)
+
+        def run() -> int:
+            backfill = Backfill(exchange, exchange.id, store, chunk_size=CHUNK_SIZE, max_workers=3)
+            exchange.reset_requests()
+            return backfill.run(SYMBOL, timeframe, start)
+
+        run()
+        assert store.count(exchange.id, SYMBOL, timeframe) == CANDLES - CHUNK_SIZE
+
+        # Второй запуск: неудачный участок и участок с незакрытой свечой
+        assert run() == CHUNK_SIZE
+        assert sorted(since for _, _, since, _ in exchange.requests) == [failed_chunk, tail_chunk]
+        assert store.count(exchange.id, SYMBOL, timeframe) == CANDLES
+        assert store.find_gaps(exchange.id, SYMBOL, timeframe) == []
+        print("✅ Повторный запуск загрузил только пропуск и хвост")
+
+        assert run() == 0
+        assert [since for _, _, since, _ in exchange.requests] == [tail_chunk]
+        print("✅ Третий запуск запрашивает только последний участок")
+
+
+def main():
+    """Главная функция"""
+    print("🧪 Тест загрузки истории")
+    print("=" * 50)
+
+    try:
+        test_backfill_resume()
+        test_backfill_resume_open_end()
+    except AssertionError as e:
+        print(f"❌ Тест не пройден: {e!r}")
+        sys.exit(1)
+
+    print("\n" + "=" * 50)
+    print("✅ Все тесты пройдены!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Тест векторизованного бэктестера: совпадение с пошаговым analyze_market
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Добавляем текущую директорию в путь
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bot.backtester import Backtester
+from bot.indicators import TechnicalIndicators
+from bot.strategy import MIN_BARS, SignalType, TradingStrategy
+
+
+BARS = 3000
+
+# Наборы фильтров; пороги ADX и RSI повышены, чтобы часть пересечений EMA отсеивалась
+FILTER_SETS = {
+    'no_filters': {},
+    'adx': {'use_adx': True, 'adx_min': 35},
+    'rsi_macd': {'use_rsi': True, 'use_macd': True, 'rsi_oversold': 50, 'rsi_overbought': 58},
+    'all': {'use_adx': True, 'use_macd': True, 'use_rsi': True, 'use_tsi': True,
+            'use_kdj': True, 'use_vwap': True, 'use_atr': True},
+}
+
+
+def synthetic_candles(bars: int = BARS, seed: int = 7) -> pd.DataFrame:
+    """Случайное блуждание со сменой тренда (много пересечений EMA)"""
+    rng = np.random.default_rng(seed)
+    trend = np.repeat(rng.normal(0, 0.002, bars // 100 + 1), 100)[:bars]
+    close = 100 * np.exp(np.cumsum(trend + rng.normal(0, 0.01, bars)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = close * rng.uniform(0.001, 0.01, bars)
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.uniform(100, 1000, bars),
+    }, index=pd.date_range('2024-01-01', periods=bars, freq='15min', name='timestamp'))
+
+
+def make_config(filters: dict) -> dict:
+    return {
+        'strategy': {'symbol': 'BTC/USDT', 'ema_fast': 9, 'ema_slow': 21, 'indicators': filters},
+        'trading': {'trade_amount': 5, 'trade_amount_type': 'fixed', 'initial_capital': 1000},
+    }
+
+
+def replay(config: dict, data: pd.DataFrame) -> list:
+    """Сделки при пошаговом вызове analyze_market на каждом префиксе истории"""
+    strategy = TradingStrategy(config, TechnicalIndicators(config))
+    trades = []
+    for end in range(MIN_BARS, len(data) + 1):
+        signal = strategy.analyze_market(data.iloc[:end])
+        if signal.signal_type != SignalType.HOLD and strategy.execute_signal(signal):
+            side = 'buy' if signal.signal_type == SignalType.BUY else 'sell'
+            trades.append((side, signal.timestamp, float(signal.price)))
+    return trades
+
+
+def test_backtester_matches_analyze_market():
+    """Сделки бэктестера совпадают с пошаговым анализом рынка стратегией"""
+    print("🔁 Тестирование совпадения бэктестера с analyze_market...")
+
+    candles = synthetic_candles()
+    for name, filters in FILTER_SETS.items():
+        config = make_config(filters)
+        backtester = Backtester(config)
+        data = backtester.indicators.calculate_all_indicators(candles)
+
+        result = backtester.run(data, with_indicators=True)
+        expected = replay(config, data)
+        actual = [(t.side, t.timestamp, t.price) for t in result.trades]
+
+        assert len(expected) > 10, (name, len(expected))
+        assert actual == expected, (name, len(actual), len(expected))
+        print(f"✅ {name}: {len(actual)} сделок совпадают")
+
+
+def main():
+    """Главная функция"""
+    print("🧪 Тест бэктестера")
+    print("=" * 50)
+
+    try:
+        test_backtester_matches_analyze_market()
+    except AssertionError as e:
+        print(f"❌ Тест не пройден: {e!r}")
+        sys.exit(1)
+
+    print("\n" + "=" * 50)
+    print("✅ Все тесты пройдены!")
+
+
+if __name__ == "__main__":
+    main()
@@ -169,6 +169,7 @@ async def test_notifications(config):
                 print("✅ Тестовое сообщение отправлено")
             else:
                 print("❌ Не удалось отправить тестовое сообщение")
+            await notifications.close()
         else:
             print("❌ Не удалось подключиться к Telegram")
             
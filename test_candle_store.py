@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Тест хранилища свечей: сбой при перезаписи серии, список серий
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Добавляем текущую директорию в путь
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bot.candle_store import CandleStore
+from bot.fake_exchange import FakeExchange
+
+
+EXCHANGE = 'fake'
+SYMBOL = 'BTC/USDT'
+TIMEFRAME = '1h'
+START = pd.Timestamp('2024-01-01')
+
+# Процесс объединяет серию и завершается без очистки после записи двух колонок
+KILLED_MERGE = """
+import os, sys
+import pandas as pd
+sys.path.insert(0, {root!r})
+from bot.candle_store import CandleStore
+from test_candle_store import candles
+
+written = []
+write_column = CandleStore._write_column
+
+def crash(self, path, values, dtype):
+    if len(written) == 2:
+        os._exit(1)
+    write_column(self, path, values, dtype)
+    written.append(path)
+
+CandleStore._write_column = crash
+CandleStore({store!r}).write('fake', 'BTC/USDT', '1h', candles(pd.Timestamp({start!r}), 10))
+"""
+
+
+def candles(start: pd.Timestamp, count: int) -> pd.DataFrame:
+    """Свечи FakeExchange с заданного времени"""
+    step = 3_600_000
+    first = int((start - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1))
+    rows = [FakeExchange.candle(first + i * step) for i in range(count)]
+    df = pd.DataFrame(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df.index = pd.to_datetime(df.pop('timestamp'), unit='ms')
+    return df
+
+
+def assert_consistent(store: CandleStore, expected_count: int):
+    """Каждая строка серии совпадает со свечой FakeExchange для своего времени"""
+    df = store.read(EXCHANGE, SYMBOL, TIMEFRAME)
+    assert len(df) == expected_count, (len(df), expected_count)
+    expected = candles(df.index[0], len(df))
+    assert (df.index == expected.index).all()
+    assert np.array_equal(df.to_numpy(), expected.to_numpy())
+
+
+def test_merge_crash_keeps_series_consistent():
+    """Сбой между записью колонок при объединении не смешивает старые и новые данные"""
+    print("💾 Тестирование сбоя при перезаписи серии...")
+
+    with tempfile.TemporaryDirectory() as root:
+        store = CandleStore(root)
+        # Серия с 10:00, объединение добавляет более ранние свечи с 00:00
+        store.write(EXCHANGE, SYMBOL, TIMEFRAME, candles(START + pd.Timedelta(hours=10), 20))
+
+        script = KILLED_MERGE.format(root=str(Path(__file__).parent), store=root, start=str(START))
+        result = subprocess.run([sys.executable, '-c', script], capture_output=True)
+        assert result.returncode == 1, result.stderr.decode()
+
+        assert_consistent(store, 20)
+        assert store.first_timestamp(EXCHANGE, SYMBOL, TIMEFRAME) == START + pd.Timedelta(hours=10)
+        print("✅ После сбоя серия осталась в прежнем состоянии")
+
+        # Повторное объединение после сбоя
+        assert store.write(EXCHANGE, SYMBOL, TIMEFRAME, candles(START, 10)) == 10
+        assert_consistent(store, 30)
+        series_dir = store._series_dir(EXCHANGE, SYMBOL, TIMEFRAME)
+        files = sorted(name for name in os.listdir(series_dir) if name.endswith('.bin'))
+        assert len(files) == 6, files
+        print("✅ Повторное объединение записало серию, лишних файлов нет")
+
+        # Дописывание после объединения идет в файлы текущего поколения
+        store.write(EXCHANGE, SYMBOL, TIMEFRAME, candles(START + pd.Timedelta(hours=30), 5))
+        assert_consistent(store, 35)
+        print("✅ Новые свечи дописаны после объединения")
+
+
+def test_series_keeps_original_symbols():
+    """Список серий возвращает исходные символы, по ним читаются те же данные"""
+    print("\n📂 Тестирование списка серий...")
+
+    symbols = ['BTC/USDT', 'BTC/USDT:USDT', 'ETH_BTC/USDT']
+    with tempfile.TemporaryDirectory() as root:
+        store = CandleStore(root)
+        for count, symbol in enumerate(symbols, start=1):
+            store.write(EXCHANGE, symbol, TIMEFRAME, candles(START, count))
+
+        listed = store.series()
+        assert sorted(symbol for _, symbol, _ in listed) == sorted(symbols), listed
+        for exchange, symbol, timeframe in listed:
+            assert store.count(exchange, symbol, timeframe) == symbols.index(symbol) + 1
+        print(f"✅ Серии: {', '.join(symbol for _, symbol, _ in listed)}")
+
+
+def main():
+    """Главная функция"""
+    print("🧪 Тест хранилища свечей")
+    print("=" * 50)
+
+    try:
+        test_merge_crash_keeps_series_consistent()
+        test_series_keeps_original_symbols()
+    except AssertionError as e:
+        print(f"❌ Тест не пройден: {e!r}")
+        sys.exit(1)
+
+    print("\n" + "=" * 50)
+    print("✅ Все тесты пройдены!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Тест потоковых индикаторов: совпадение с полным пересчетом calculate_all_indicators
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Добавляем текущую директорию в путь
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bot.indicators import TechnicalIndicators
+from test_backtester import synthetic_candles
+
+
+BARS = 400
+WINDOW = 100  # окно свечей, как в цикле бота
+STREAM_KEY = 'fake:BTC/USDT:15m'
+
+CONFIG = {
+    'strategy': {
+        'ema_fast': 9,
+        'ema_slow': 21,
+        'indicators': {'use_adx': True, 'use_macd': True, 'use_rsi': True, 'use_tsi': True,
+                       'use_kdj': True, 'use_vwap': True, 'use_atr': True},
+    },
+}
+
+
+def assert_same(result: pd.DataFrame, expected: pd.DataFrame, step: str):
+    """Все колонки потока побитово совпадают с полным пересчетом на тех же свечах"""
+    assert list(result.columns) == list(expected.columns), step
+    expected = expected.loc[result.index]
+    for column in expected.columns:
+        actual = result[column].to_numpy(dtype=float)
+        reference = expected[column].to_numpy(dtype=float)
+        assert np.array_equal(actual, reference, equal_nan=True), (step, column)
+
+
+def test_streaming_matches_batch():
+    """Свечи по одной: каждый индикатор совпадает с calculate_all_indicators"""
+    print("📈 Тестирование потоковых индикаторов...")
+
+    indicators = TechnicalIndicators(CONFIG)
+    candles = synthetic_candles(BARS)
+    batch = indicators.calculate_all_indicators(candles)
+
+    stream = None
+    for end in range(1, BARS + 1):
+        window = candles.iloc[max(0, end - WINDOW):end]
+        result = indicators.calculate_incremental(window, STREAM_KEY)
+        # При ошибке потока calculate_incremental молча пересчитывает окно целиком
+        if stream is None:
+            stream = indicators._streams[STREAM_KEY]
+        assert indicators._streams.get(STREAM_KEY) is stream, f"свеча {end}"
+        assert_same(result, batch, f"свеча {end}")
+    print(f"✅ {BARS} свечей по одной: {len(batch.columns)} колонок совпадают")
+
+
+def test_streaming_rebuilds_on_restated_candle():
+    """Биржа изменила последнюю обработанную свечу: поток строится заново по окну"""
+    print("\n🔄 Тестирование пересчитанной биржей свечи...")
+
+    indicators = TechnicalIndicators(CONFIG)
+    candles = synthetic_candles(BARS)
+    restated_at = 250
+
+    for end in range(1, restated_at + 1):
+        indicators.calculate_incremental(candles.iloc[max(0, end - WINDOW):end], STREAM_KEY)
+    stream = indicators._streams[STREAM_KEY]
+
+    # Последняя обработанная свеча пришла с другой ценой закрытия
+    candles = candles.copy()
+    candles.iloc[restated_at - 1, candles.columns.get_loc('close')] *= 1.01
+    start = restated_at - WINDOW
+    result = indicators.calculate_incremental(candles.iloc[start:restated_at], STREAM_KEY)
+    rebuilt = indicators._streams[STREAM_KEY]
+    assert rebuilt is not stream
+    batch = indicators.calculate_all_indicators(candles.iloc[start:])
+    assert_same(result, batch, "пересчитанная свеча")
+    print("✅ Поток построен заново, значения совпадают с пересчетом окна")
+
+    # Дальше поток снова обновляется по одной свече
+    for end in range(restated_at + 1, BARS + 1):
+        result = indicators.calculate_incremental(candles.iloc[end - WINDOW:end], STREAM_KEY)
+        assert indicators._streams.get(STREAM_KEY) is rebuilt, f"свеча {end}"
+        assert_same(result, batch, f"свеча {end}")
+    print(f"✅ Следующие {BARS - restated_at} свечей совпадают")
+
+
+def main():
+    """Главная функция"""
+    print("🧪 Тест потоковых индикаторов")
+    print("=" * 50)
+
+    try:
+        test_streaming_matches_batch()
+        test_streaming_rebuilds_on_restated_candle()
+    except AssertionError as e:
+        print(f"❌ Тест не пройден: {e!r}")
+        sys.exit(1)
+
+    print("\n" + "=" * 50)
+    print("✅ Все тесты пройдены!")
+
+
+if __name__ == "__main__":
+    main()